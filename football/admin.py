@@ -3,25 +3,72 @@ from django.contrib import admin
 from . import models
 
 
+class ListDeferMixin:
+    """Difiere en el admin las columnas pesadas (textos libres, JSON) que el listado no pinta.
+
+    La ficha de un registro las carga al abrirla (una consulta por campo y objeto, no por fila).
+    """
+
+    list_defer = ()
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return queryset.defer(*self.list_defer) if self.list_defer else queryset
+
+
+class LabelJoinChoicesMixin:
+    """Los desplegables de FK y el autocompletado pintan __str__ de cada opción, y el de temporadas,
+    grupos y partidos lee otra relación: se trae en la misma consulta en lugar de una por opción."""
+
+    label_select_related = {
+        models.Season: ('competition',),
+        models.Group: ('season',),
+        models.Match: ('home_team', 'away_team'),
+    }
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        related = self.label_select_related.get(self.model)
+        return queryset.select_related(*related) if related else queryset
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        related = self.label_select_related.get(db_field.related_model)
+        if (
+            related
+            and 'queryset' not in kwargs
+            and db_field.name not in self.get_autocomplete_fields(request)
+            and db_field.name not in self.raw_id_fields
+        ):
+            queryset = self.get_field_queryset(kwargs.get('using'), db_field, request)
+            if queryset is None:
+                queryset = db_field.remote_field.model._default_manager.using(kwargs.get('using'))
+            kwargs['queryset'] = queryset.select_related(*related)
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
 @admin.register(models.DataSource)
-class DataSourceAdmin(admin.ModelAdmin):
+class DataSourceAdmin(ListDeferMixin, admin.ModelAdmin):
     list_display = ('name', 'base_url')
+    list_defer = ('notes',)
 
 
 @admin.register(models.Competition)
-class CompetitionAdmin(admin.ModelAdmin):
+class CompetitionAdmin(ListDeferMixin, admin.ModelAdmin):
     list_display = ('name', 'region', 'level')
+    list_defer = ('description',)
     prepopulated_fields = {'slug': ('name',)}
 
 
 @admin.register(models.Season)
 class SeasonAdmin(admin.ModelAdmin):
     list_display = ('name', 'competition', 'is_current')
+    list_select_related = ('competition',)
 
 
 @admin.register(models.Group)
-class GroupAdmin(admin.ModelAdmin):
+class GroupAdmin(LabelJoinChoicesMixin, admin.ModelAdmin):
     list_display = ('name', 'season', 'external_id', 'possible_duplicate_groups')
+    list_select_related = ('season__competition',)
     search_fields = ('name', 'slug', 'external_id')
     actions = ('merge_selected_groups',)
 
@@ -177,9 +224,10 @@ class TeamNameAliasAdmin(admin.ModelAdmin):
 
 
 @admin.register(models.Team)
-class TeamAdmin(admin.ModelAdmin):
+class TeamAdmin(LabelJoinChoicesMixin, admin.ModelAdmin):
     list_display = ('name', 'que_es', 'club', 'category', 'category_ref', 'name_key', 'external_id', 'possible_duplicates', 'possible_duplicates_fuzzy', 'group', 'is_primary')
     list_filter = ('game_format', 'group', 'is_primary')
+    list_select_related = ('club', 'category_ref', 'group__season')
     search_fields = ('name', 'short_name', 'slug', 'category', 'name_key', 'external_id', 'preferente_url')
     prepopulated_fields = {'slug': ('name',)}
     autocomplete_fields = ('club', 'category_ref')
@@ -334,11 +382,13 @@ class PlayerIdentityAdmin(admin.ModelAdmin):
 
 
 @admin.register(models.Player)
-class PlayerAdmin(admin.ModelAdmin):
+class PlayerAdmin(ListDeferMixin, admin.ModelAdmin):
     list_display = ('name', 'team', 'is_active', 'transferred_to_club', 'transferred_to_category', 'number', 'position', 'identity')
+    list_defer = ('notes',)
     list_filter = ('is_active', 'team')
+    list_select_related = ('team', 'transferred_to_club', 'identity')
     search_fields = ('name', 'full_name', 'nickname', 'team__name', 'transferred_to_club__name')
-    autocomplete_fields = ('identity', 'transferred_to_club', 'transferred_to_category_ref')
+    autocomplete_fields = ('team', 'identity', 'transferred_to_club', 'transferred_to_category_ref')
 
 
 @admin.register(models.PlayerAsset)
@@ -383,19 +433,23 @@ class PlayerPhysicalMetricAdmin(admin.ModelAdmin):
 
 
 @admin.register(models.PlayerCommunication)
-class PlayerCommunicationAdmin(admin.ModelAdmin):
+class PlayerCommunicationAdmin(LabelJoinChoicesMixin, admin.ModelAdmin):
     list_display = ('player', 'category', 'match', 'scheduled_for', 'created_at')
     list_filter = ('category', 'created_at')
 
 
 @admin.register(models.Match)
-class MatchAdmin(admin.ModelAdmin):
+class MatchAdmin(LabelJoinChoicesMixin, ListDeferMixin, admin.ModelAdmin):
     list_display = ('round', 'home_team', 'away_team', 'date', 'home_score', 'away_score')
+    list_defer = ('notes', 'source')
     list_filter = ('round', 'date')
+    list_select_related = ('home_team', 'away_team')
+    search_fields = ('round', 'home_team__name', 'away_team__name')
+    autocomplete_fields = ('home_team', 'away_team', 'group', 'staff_captain', 'staff_mvp')
 
 
 @admin.register(models.PlayerMatchReportArchive)
-class PlayerMatchReportArchiveAdmin(admin.ModelAdmin):
+class PlayerMatchReportArchiveAdmin(LabelJoinChoicesMixin, admin.ModelAdmin):
     list_display = ('player', 'match', 'version', 'status', 'rating', 'minutes', 'generated_at')
     list_filter = ('status', 'reason', 'generated_at')
     search_fields = ('player__name', 'match__home_team__name', 'match__away_team__name')
@@ -403,23 +457,64 @@ class PlayerMatchReportArchiveAdmin(admin.ModelAdmin):
 
 
 @admin.register(models.TeamStanding)
-class TeamStandingAdmin(admin.ModelAdmin):
+class TeamStandingAdmin(LabelJoinChoicesMixin, admin.ModelAdmin):
     list_display = ('team', 'season', 'points', 'position')
     list_filter = ('season', 'group')
+    list_select_related = ('team', 'season__competition')
+    autocomplete_fields = ('team', 'group')
 
 
 @admin.register(models.CustomMetric)
-class CustomMetricAdmin(admin.ModelAdmin):
+class CustomMetricAdmin(LabelJoinChoicesMixin, ListDeferMixin, admin.ModelAdmin):
     list_display = ('team', 'season', 'name', 'value', 'recorded_at')
+    list_defer = ('source_notes',)
+    list_select_related = ('team', 'season__competition')
+    autocomplete_fields = ('team',)
+
+
+@admin.register(models.MatchEvent)
+class MatchEventAdmin(ListDeferMixin, admin.ModelAdmin):
+    list_display = ('match', 'minute', 'player', 'event_type', 'result', 'source_file')
+    # Tablas grandes: con un filtro activo, el "(N en total)" costaría un COUNT(*) completo más.
+    show_full_result_count = False
+    list_select_related = ('match__home_team', 'match__away_team', 'player')
+    search_fields = ('event_type', 'player__name', 'source_file')
+    autocomplete_fields = ('match', 'player')
+    list_defer = ('raw_data',)
+
+
+@admin.register(models.MatchReport)
+class MatchReportAdmin(LabelJoinChoicesMixin, ListDeferMixin, admin.ModelAdmin):
+    list_display = ('source_file', 'match', 'imported_at')
+    list_select_related = ('match__home_team', 'match__away_team')
+    search_fields = ('source_file',)
+    show_full_result_count = False
+    list_defer = ('raw_data',)
+
+
+@admin.register(models.TeamStatistic)
+class TeamStatisticAdmin(LabelJoinChoicesMixin, admin.ModelAdmin):
+    list_select_related = ('team',)
+    show_full_result_count = False
+
+
+@admin.register(models.PlayerStatistic)
+class PlayerStatisticAdmin(LabelJoinChoicesMixin, admin.ModelAdmin):
+    list_select_related = ('player',)
+    show_full_result_count = False
+
+
+@admin.register(models.DataImportLog)
+class DataImportLogAdmin(ListDeferMixin, admin.ModelAdmin):
+    list_defer = ('notes',)
 
 
-admin.site.register(models.TeamStatistic)
-admin.site.register(models.PlayerStatistic)
-admin.site.register(models.MatchReport)
-admin.site.register(models.DataImportLog)
-admin.site.register(models.MatchEvent)
 admin.site.register(models.ScrapeSource)
-admin.site.register(models.ScrapeRun)
+
+
+@admin.register(models.ScrapeRun)
+class ScrapeRunAdmin(admin.ModelAdmin):
+    list_select_related = ('source',)
 
 
 @admin.register(models.AiTrainerEvent)
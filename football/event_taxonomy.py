@@ -1,5 +1,7 @@
 import re
 import unicodedata
+from collections import Counter
+from functools import lru_cache
 
 
 SUCCESS_RESULTS = {"ok", "ganado", "g", "ganó", "goles", "anotado", "marcado"}
@@ -283,37 +285,100 @@ FIELD_ZONE_KEYS = [zone['key'] for zone in FIELD_ZONES]
 def normalize_label(value):
     if not value:
         return ""
-    normalized = unicodedata.normalize("NFKD", str(value))
+    return _normalize_label_text(str(value))
+
+
+@lru_cache(maxsize=8192)
+def _normalize_label_text(text):
+    # Las etiquetas de acciones se repiten muchísimo ("Pase", "OK"...): se normalizan una vez.
+    normalized = unicodedata.normalize("NFKD", text)
     filtered = "".join(ch for ch in normalized if ch.isalnum() or ch.isspace())
     return filtered.lower().strip()
 
 
+def _keyword_pattern(keywords):
+    # Las palabras clave se normalizan igual que el texto: las variantes con tilde
+    # ("conducción") nunca podían coincidir y solo alargaban la alternancia.
+    normalized = sorted({_normalize_label_text(keyword) for keyword in keywords} - {""})
+    return re.compile("|".join(re.escape(keyword) for keyword in normalized))
+
+
+# Un patrón compilado por conjunto de palabras clave: el motor de regex recorre el texto una
+# vez en lugar de un `in` por palabra. Un conjunto nuevo necesita aquí su patrón.
+_DUEL_EVENT_RE = _keyword_pattern(DUEL_EVENT_KEYWORDS)
+_DUEL_OFFENSIVE_RE = _keyword_pattern(DUEL_OFFENSIVE_KEYWORDS)
+_DUEL_DEFENSIVE_RE = _keyword_pattern(DUEL_DEFENSIVE_KEYWORDS)
+_DUEL_SECOND_BALL_RE = _keyword_pattern(DUEL_SECOND_BALL_KEYWORDS)
+_DUEL_SUCCESS_RE = _keyword_pattern(DUEL_SUCCESS_KEYWORDS)
+_DUEL_FAIL_RE = _keyword_pattern(DUEL_FAIL_KEYWORDS)
+_DUEL_AERIAL_RE = _keyword_pattern(DUEL_AERIAL_KEYWORDS)
+_SHOT_RE = _keyword_pattern(SHOT_KEYWORDS)
+_PASS_RE = _keyword_pattern(PASS_KEYWORDS)
+_KEY_PASS_RE = _keyword_pattern(KEY_PASS_KEYWORDS)
+_DRIBBLE_RE = _keyword_pattern(DRIBBLE_KEYWORDS)
+_GOALKEEPER_SAVE_RE = _keyword_pattern(GOALKEEPER_SAVE_KEYWORDS)
+_GOAL_RE = _keyword_pattern(GOAL_KEYWORDS)
+_ASSIST_RE = _keyword_pattern(ASSIST_KEYWORDS)
+_YELLOW_CARD_RE = _keyword_pattern(YELLOW_CARD_KEYWORDS)
+_RED_CARD_RE = _keyword_pattern(RED_CARD_KEYWORDS)
+_SUBSTITUTION_RE = _keyword_pattern(SUBSTITUTION_KEYWORDS)
+_SUB_ENTRY_RE = _keyword_pattern(SUB_ENTRY_KEYWORDS)
+_SUB_EXIT_RE = _keyword_pattern(SUB_EXIT_KEYWORDS)
+
+
+def _ranked_lookup(keys):
+    # Alternativas en orden de prioridad dentro de un lookahead: en cada posición del texto
+    # la regex devuelve la clave preferida que empieza ahí, sin un `in` por clave.
+    keys = list(keys)
+    pattern = re.compile("(?=(%s))" % "|".join(re.escape(key) for key in keys))
+    return pattern, {key: rank for rank, key in enumerate(keys)}
+
+
+def _best_ranked_key(lookup, *texts):
+    pattern, ranks = lookup
+    best = None
+    for text in texts:
+        for match in pattern.finditer(text):
+            key = match.group(1)
+            if best is None or ranks[key] < ranks[best]:
+                best = key
+    return best
+
+
+# Mismo criterio que los bucles originales: zonas y posiciones priorizan la clave más larga
+# (empates en orden del dict); los tercios, el orden del dict.
+_ZONE_LOOKUP = _ranked_lookup(sorted(ZONE_MAP, key=len, reverse=True))
+_POSITION_LOOKUP = _ranked_lookup(sorted(POSITION_MAP, key=len, reverse=True))
+_TERCIO_LOOKUP = _ranked_lookup(TERCIO_MAP)
+
+
+def _has_keyword(normalized, pattern):
+    # `normalized` ya viene de normalize_label; `pattern`, de _keyword_pattern.
+    return pattern.search(normalized) is not None
+
+
 def contains_keyword(value, keywords):
     normalized = normalize_label(value)
     return any(keyword in normalized for keyword in keywords)
 
 
+def _contains_keyword_in_any(pattern, *values):
+    # Varios campos en una sola búsqueda: se unen con salto de línea, que ninguna palabra
+    # clave contiene, así que una coincidencia nunca puede saltar de un campo a otro.
+    return pattern.search("\n".join(normalize_label(value) for value in values)) is not None
+
+
 def is_goal_event(event_type, result=None, observation=None):
-    return (
-        contains_keyword(event_type, GOAL_KEYWORDS)
-        or contains_keyword(result, GOAL_KEYWORDS)
-        or contains_keyword(observation, GOAL_KEYWORDS)
-    )
+    return _contains_keyword_in_any(_GOAL_RE, event_type, result, observation)
 
 
 def is_goalkeeper_save_event(event_type, result=None, observation=None):
-    return (
-        contains_keyword(event_type, GOALKEEPER_SAVE_KEYWORDS)
-        or contains_keyword(result, GOALKEEPER_SAVE_KEYWORDS)
-        or contains_keyword(observation, GOALKEEPER_SAVE_KEYWORDS)
-    )
+    return _contains_keyword_in_any(_GOALKEEPER_SAVE_RE, event_type, result, observation)
 
 
 def is_shot_attempt_event(event_type, result=None, observation=None):
-    return (
-        contains_keyword(event_type, SHOT_KEYWORDS)
-        or is_goal_event(event_type, result=result, observation=observation)
-        or contains_keyword(observation, SHOT_KEYWORDS)
+    return _contains_keyword_in_any(_SHOT_RE, event_type, observation) or is_goal_event(
+        event_type, result=result, observation=observation
     )
 
 
@@ -330,51 +395,46 @@ def is_shot_on_target_event(event_type, result=None, observation=None):
 
 
 def is_assist_event(event_type, result=None, observation=None):
-    return (
-        contains_keyword(event_type, ASSIST_KEYWORDS)
-        or contains_keyword(result, ASSIST_KEYWORDS)
-        or contains_keyword(observation, ASSIST_KEYWORDS)
-    )
+    return _contains_keyword_in_any(_ASSIST_RE, event_type, result, observation)
 
 
 def is_key_pass_event(event_type, result=None, observation=None):
-    return (
-        contains_keyword(event_type, KEY_PASS_KEYWORDS)
-        or contains_keyword(result, KEY_PASS_KEYWORDS)
-        or contains_keyword(observation, KEY_PASS_KEYWORDS)
-    )
+    return _contains_keyword_in_any(_KEY_PASS_RE, event_type, result, observation)
 
 
 def is_yellow_card_event(event_type, result=None, zone=None):
-    return (
-        contains_keyword(event_type, YELLOW_CARD_KEYWORDS)
-        or contains_keyword(result, YELLOW_CARD_KEYWORDS)
-        or contains_keyword(zone, YELLOW_CARD_KEYWORDS)
-    )
+    return _contains_keyword_in_any(_YELLOW_CARD_RE, event_type, result, zone)
 
 
 def is_red_card_event(event_type, result=None, zone=None):
-    return (
-        contains_keyword(event_type, RED_CARD_KEYWORDS)
-        or contains_keyword(result, RED_CARD_KEYWORDS)
-        or contains_keyword(zone, RED_CARD_KEYWORDS)
-    )
+    return _contains_keyword_in_any(_RED_CARD_RE, event_type, result, zone)
 
 
 def is_substitution_event(event_type, zone=None):
-    return contains_keyword(event_type, SUBSTITUTION_KEYWORDS) or contains_keyword(zone, SUBSTITUTION_KEYWORDS)
+    return _contains_keyword_in_any(_SUBSTITUTION_RE, event_type, zone)
+
+
+def classify_substitution(event_type, result=None, zone=None):
+    """(es_entrada, es_salida) normalizando cada campo una sola vez."""
+    zone_text = normalize_label(zone)
+    if not (
+        _has_keyword(normalize_label(event_type), _SUBSTITUTION_RE)
+        or _has_keyword(zone_text, _SUBSTITUTION_RE)
+    ):
+        return False, False
+    result_text = normalize_label(result)
+    return (
+        _has_keyword(result_text, _SUB_ENTRY_RE) or _has_keyword(zone_text, _SUB_ENTRY_RE),
+        _has_keyword(result_text, _SUB_EXIT_RE) or _has_keyword(zone_text, _SUB_EXIT_RE),
+    )
 
 
 def is_substitution_entry(event_type, result=None, zone=None):
-    if not is_substitution_event(event_type, zone):
-        return False
-    return contains_keyword(result, SUB_ENTRY_KEYWORDS) or contains_keyword(zone, SUB_ENTRY_KEYWORDS)
+    return classify_substitution(event_type, result, zone)[0]
 
 
 def is_substitution_exit(event_type, result=None, zone=None):
-    if not is_substitution_event(event_type, zone):
-        return False
-    return contains_keyword(result, SUB_EXIT_KEYWORDS) or contains_keyword(zone, SUB_EXIT_KEYWORDS)
+    return classify_substitution(event_type, result, zone)[1]
 
 
 def is_duel_event(event_type, observation=None):
@@ -385,8 +445,7 @@ def is_duel_event(event_type, observation=None):
 def duel_result_is_success(result):
     if not result:
         return False
-    normalized = normalize_label(result)
-    return any(keyword in normalized for keyword in DUEL_SUCCESS_KEYWORD)
+    return _has_keyword(normalize_label(result), _DUEL_SUCCESS_RE)
 
 
 def classify_duel_event(event_type, result=None, observation=None, zone=None):
@@ -397,26 +456,26 @@ def classify_duel_event(event_type, result=None, observation=None, zone=None):
     subtype = ""
     # La naturaleza del evento procede del tipo registrado. Una observación como
     # "provocado por presión" no debe convertir un pase o un error en duelo.
-    if any(keyword in event_normalized for keyword in DUEL_OFFENSIVE_KEYWORDS):
+    if _has_keyword(event_normalized, _DUEL_OFFENSIVE_RE):
         subtype = "offensive"
-    elif any(keyword in event_normalized for keyword in DUEL_DEFENSIVE_KEYWORDS):
+    elif _has_keyword(event_normalized, _DUEL_DEFENSIVE_RE):
         subtype = "defensive"
-    elif any(keyword in event_normalized for keyword in DUEL_SECOND_BALL_KEYWORDS):
+    elif _has_keyword(event_normalized, _DUEL_SECOND_BALL_RE):
         subtype = "second_ball"
-    elif any(keyword in event_normalized for keyword in DUEL_EVENT_KEYWORDS):
+    elif _has_keyword(event_normalized, _DUEL_EVENT_RE):
         subtype = "generic"
 
     is_duel = bool(subtype)
     aerial_text = " ".join(part for part in [event_normalized, observation_normalized, zone_normalized] if part)
-    is_aerial = is_duel and any(keyword in aerial_text for keyword in DUEL_AERIAL_KEYWORDS)
+    is_aerial = is_duel and _has_keyword(aerial_text, _DUEL_AERIAL_RE)
 
     outcome = ""
     if is_duel:
         result_normalized = normalize_label(result)
         outcome_text = result_normalized or observation_normalized
-        if any(keyword in outcome_text for keyword in DUEL_FAIL_KEYWORDS):
+        if _has_keyword(outcome_text, _DUEL_FAIL_RE):
             outcome = "lost"
-        elif any(keyword in outcome_text for keyword in DUEL_SUCCESS_KEYWORDS) or result_is_success(result):
+        elif _has_keyword(outcome_text, _DUEL_SUCCESS_RE) or result_is_success(result):
             outcome = "won"
 
     counted = is_duel and outcome in {"won", "lost"}
@@ -490,9 +549,10 @@ def canonical_event_kind(event_type, result=None, zone=None, observation=None):
         return "red_card"
     if is_yellow_card_event(et, res, zn):
         return "yellow_card"
-    if is_substitution_entry(et, res, zn):
+    sub_entry, sub_exit = classify_substitution(et, res, zn)
+    if sub_entry:
         return "substitution_in"
-    if is_substitution_exit(et, res, zn):
+    if sub_exit:
         return "substitution_out"
     if is_substitution_event(et, zn):
         return "substitution"
@@ -508,22 +568,25 @@ def canonical_event_kind(event_type, result=None, zone=None, observation=None):
         return "shot_on_target"
     if is_shot_attempt_event(et, res, obs):
         return "shot"
-    if contains_keyword(et, DRIBBLE_KEYWORDS) or contains_keyword(res, DRIBBLE_KEYWORDS):
+    if _contains_keyword_in_any(_DRIBBLE_RE, et, res):
         return "dribble"
     if is_duel_event(et, obs):
         return "duel"
-    if contains_keyword(et, PASS_KEYWORDS) or contains_keyword(res, PASS_KEYWORDS):
+    if _contains_keyword_in_any(_PASS_RE, et, res):
         return "pass"
     return "other"
 
 
 def categorize_position(player_position, zone):
-    normalized_position = normalize_label(player_position)
-    normalized_zone = normalize_label(zone)
-    for key, label in sorted(POSITION_MAP.items(), key=lambda item: -len(item[0])):
-        if key in normalized_position or key in normalized_zone:
-            return label
-    return None
+    return _categorize_normalized_position(normalize_label(player_position), normalize_label(zone))
+
+
+# Las tres búsquedas de abajo se memorizan por texto ya normalizado, igual que normalize_label:
+# un partido o una temporada repiten unas pocas zonas, tercios y demarcaciones miles de veces.
+@lru_cache(maxsize=4096)
+def _categorize_normalized_position(normalized_position, normalized_zone):
+    key = _best_ranked_key(_POSITION_LOOKUP, normalized_position, normalized_zone)
+    return POSITION_MAP[key] if key else None
 
 
 def zone_to_tercio(zone_label):
@@ -542,19 +605,23 @@ def zone_to_tercio(zone_label):
 
 
 def map_tercio(raw):
-    normalized = normalize_label(raw)
-    for key, label in TERCIO_MAP.items():
-        if key in normalized:
-            return label
-    return None
+    return _map_normalized_tercio(normalize_label(raw))
+
+
+@lru_cache(maxsize=4096)
+def _map_normalized_tercio(normalized):
+    key = _best_ranked_key(_TERCIO_LOOKUP, normalized)
+    return TERCIO_MAP[key] if key else None
 
 
 def map_zone_label(zone):
-    normalized = normalize_label(zone)
-    for key, label in sorted(ZONE_MAP.items(), key=lambda item: -len(item[0])):
-        if key in normalized:
-            return label
-    return None
+    return _map_normalized_zone(normalize_label(zone))
+
+
+@lru_cache(maxsize=4096)
+def _map_normalized_zone(normalized):
+    key = _best_ranked_key(_ZONE_LOOKUP, normalized)
+    return ZONE_MAP[key] if key else None
 
 
 def result_is_success(result):
@@ -579,6 +646,114 @@ def event_result_is_success(event_type, result):
     return result_is_success(result) and not negative_execution
 
 
+@lru_cache(maxsize=8192)
+def classify_event_text(event_type, result, observation, zone, detailed=False):
+    """Lo que se cuenta de una acción a partir solo de su texto (tipo, resultado, observación, zona).
+
+    Devuelve ((clave, incremento), ...) con duelos, tiros, paradas, pases y regates, y los flags
+    (éxito, gol, asistencia, amarilla, roja) para que quien llama los sume con sus propias reglas.
+    El dashboard usa la versión básica. El informe de partido pide detailed=True: el éxito sale
+    de event_result_is_success, los goles encajados no cuentan ni como tiro ni como gol y se
+    añaden sus contadores propios (duelos explícitos, pérdidas, centros, faltas...)."""
+    counters = Counter()
+    event_label = normalize_label(event_type)
+    success = event_result_is_success(event_type, result) if detailed else result_is_success(result)
+    # "EN CONTRA" a secas NO es un gol encajado: una falta cometida, un córner en contra o
+    # un duelo perdido también se guardan así. Contarlos como gol le quitaba 0,30 de nota a
+    # cualquiera que hiciera una falta (Reno perdía 0,90 por tres faltas).
+    is_conceded_goal = detailed and (
+        "gol encajado" in event_label
+        or (_has_keyword(event_label, _GOAL_RE) and normalize_label(result) == "en contra")
+    )
+    is_assist = is_assist_event(event_type, result, observation)
+
+    duel_event = classify_duel_event(event_type, result, observation, zone)
+    if duel_event.get("counted"):
+        counters["duels_total"] += 1
+        if duel_event.get("won"):
+            counters["duels_won"] += 1
+        if detailed and (event_label == "duelo" or event_label.startswith("duelo ")):
+            counters["explicit_duels_total"] += 1
+            if duel_event.get("won"):
+                counters["explicit_duels_won"] += 1
+        if duel_event.get("aerial"):
+            counters["aerial_duels_total"] += 1
+            if duel_event.get("won"):
+                counters["aerial_duels_won"] += 1
+    if is_shot_attempt_event(event_type, result, observation) and not is_conceded_goal:
+        counters["shot_attempts"] += 1
+        if is_shot_on_target_event(event_type, result, observation):
+            counters["shots_on_target"] += 1
+    if is_goalkeeper_save_event(event_type, result, observation):
+        counters["goalkeeper_saves"] += 1
+    if _contains_keyword_in_any(_PASS_RE, event_type, observation) or is_assist:
+        counters["pass_attempts"] += 1
+        if success or is_assist:
+            counters["passes_completed"] += 1
+            if is_key_pass_event(event_type, result, observation):
+                counters["key_passes_completed"] += 1
+    if _contains_keyword_in_any(_DRIBBLE_RE, event_type, observation):
+        counters["dribbles_attempted"] += 1
+        if success:
+            counters["dribbles_completed"] += 1
+    if detailed:
+        _count_match_report_event(counters, event_label, result, success, is_conceded_goal)
+    return (
+        tuple(counters.items()),
+        success,
+        bool(is_goal_event(event_type, result, observation) and not is_conceded_goal),
+        is_assist,
+        is_yellow_card_event(event_type, result, zone),
+        is_red_card_event(event_type, result, zone),
+    )
+
+
+def _count_match_report_event(counters, event_label, result, success, is_conceded_goal):
+    # Contadores que solo enseña el informe de partido del jugador.
+    if is_conceded_goal:
+        counters["goals_conceded"] += 1
+    if event_label.startswith("robo") or "recuperacion" in event_label:
+        if success:
+            counters["recoveries"] += 1
+    if "perdida forzada" in event_label or "error forzado" in event_label:
+        counters["forced_turnovers"] += 1
+    if "perdida no forzada" in event_label or "error no forzado" in event_label:
+        counters["unforced_turnovers"] += 1
+    if event_label == "centro" or event_label.startswith("centro "):
+        counters["crosses_attempted"] += 1
+        if success:
+            counters["crosses_completed"] += 1
+    if "pase en largo" in event_label:
+        counters["long_passes_attempted"] += 1
+        if success:
+            counters["long_passes_completed"] += 1
+    if event_label == "caida" or event_label.startswith("caida "):
+        if success:
+            counters["retentions_won"] += 1
+        else:
+            counters["retentions_lost"] += 1
+    if "presion" in event_label:
+        counters["high_press_total"] += 1
+        counters["high_press_won"] += int(success)
+    if "juego de espaldas" in event_label:
+        counters["back_to_goal_total"] += 1
+        counters["back_to_goal_won"] += int(success)
+    if "desmarque" in event_label and success:
+        counters["off_ball_runs"] += 1
+    if ("saque de esquina" in event_label or "falta lanzada" in event_label
+            or "penalti" in event_label or "saque de banda" in event_label):
+        counters["set_pieces_taken"] += 1
+        counters["set_pieces_ok"] += int(success)
+    # La falta se registra como acción "Falta" con el sentido en el resultado (así sale de la
+    # captura). Buscando sólo el texto "falta cometida" no se contaba ninguna.
+    if "falta" in event_label:
+        resultado = normalize_label(result)
+        if "falta cometida" in event_label or resultado in {"en contra", "cometida"}:
+            counters["fouls_committed"] += 1
+        elif "falta recibida" in event_label or resultado in {"a favor", "recibida"}:
+            counters["fouls_received"] += 1
+
+
 def shots_needed_per_goal(shots, goals):
     shots_value = max(0, int(shots or 0))
     goals_value = max(0, int(goals or 0))
@@ -67,7 +67,7 @@ class Command(BaseCommand):
                     match=partido, source_file=FUENTE, raw_data__hoja=hoja.get("id") or "hoja"
                 ).delete()
                 self.stdout.write(f"Borrados de una carga anterior: {borrados[0]}")
-            MatchEvent.objects.bulk_create(acciones["eventos"])
+            MatchEvent.bulk_ingest(acciones["eventos"])
             # Los minutos jugados NO son un adorno del informe: de ellos salen los minutos de la
             # ficha, y la nota los usa para no encumbrar a quien entró cinco minutos. Se guardan
             # donde la app los lee (PlayerStatistic manual_minutes).
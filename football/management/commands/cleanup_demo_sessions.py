@@ -91,7 +91,8 @@ class Command(BaseCommand):
         total_moved = 0
 
         for team in teams:
-            qs = (
+            # Una sola consulta por equipo: se materializa y se reutiliza en el bucle, sin .exists() previo.
+            sessions = list(
                 TrainingSession.objects.select_related("microcycle")
                 .filter(
                     microcycle__team=team,
@@ -99,14 +100,14 @@ class Command(BaseCommand):
                 )
                 .order_by("session_date", "order", "id")[:limit]
             )
-            if not qs.exists():
+            if not sessions:
                 continue
 
             trash_microcycle = None
             scanned = 0
             moved = 0
 
-            for session in qs:
+            for session in sessions:
                 scanned += 1
                 total_scanned += 1
                 if _is_trash_microcycle(getattr(session, "microcycle", None)):
@@ -1,8 +1,12 @@
 from datetime import datetime, date
+from functools import lru_cache
 from pathlib import Path
+import re
 import unicodedata
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
 from django.utils.text import slugify
 from openpyxl import load_workbook
 
@@ -16,9 +20,26 @@ from football.models import (
     Player,
     Season,
     Team,
+    normalize_team_name_key,
+    resolve_or_create_team,
 )
 
 
+EVENT_BATCH_SIZE = 1000
+# Todo lo que no sea letra o dígito (Unicode, como str.isalnum): el filtrado va en C.
+NON_ALNUM_RE = re.compile(r'[\W_]+')
+# Formatos de fecha que aparecen en las hojas: 2025-09-14, 14/09/2025 y 14-09-2025.
+ISO_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+DMY_DATE_RE = re.compile(r'(\d{1,2})([-/])(\d{1,2})\2(\d{4})')
+DATE_TYPES = frozenset((datetime, date))
+# Columnas de BD_EVENTOS que ya quedan en campos del evento o de su partido. raw_data guarda
+# solo el resto (partidoid incluido, que no se guarda en ningún otro sitio).
+TYPED_COLUMNS = frozenset((
+    'rival', 'jornada', 'fecha', 'campo',
+    'jugador', 'minuto', 'evento', 'resultadoaccion', 'zona', 'tercio', 'observacion', 'sistema',
+))
+
+
 class Command(BaseCommand):
     help = 'Importa estadísticas de Benagalbón desde los archivos Excel que se colocan en data/excel/.'
 
@@ -59,31 +80,34 @@ class Command(BaseCommand):
             workbook = load_workbook(filename=path, read_only=True, data_only=True)
             sheets_report = self.describe_sheets(workbook)
             total_rows = sum(sheet['rows'] for sheet in sheets_report)
-            log = DataImportLog.objects.create(
-                file_name=path.name,
-                row_count=total_rows,
-                notes=f'Importado con import_benagalbon_excel desde {path}',
-            )
-
-            report_payload = {'sheets': sheets_report, 'log_id': log.id}
             self.stdout.write(self.style.NOTICE(f'Procesando {path.name} ({len(sheets_report)} hojas)...'))
 
-            events = self.extract_bd_eventos(workbook)
-            imported_events = 0
-            if events:
+            # Un archivo, una transacción: sin ella cada INSERT/get_or_create confirmaba por
+            # separado, y un fallo a mitad dejaba el archivo importado a medias.
+            with transaction.atomic():
+                log = DataImportLog.objects.create(
+                    file_name=path.name,
+                    row_count=total_rows,
+                    notes=f'Importado con import_benagalbon_excel desde {path}',
+                )
+                report_payload = {'sheets': sheets_report, 'log_id': log.id}
+
                 imported_events = self.ingest_events(
-                    events,
+                    self.extract_bd_eventos(workbook),
                     season,
                     group,
                     primary_team,
                     path.name,
                 )
 
-            MatchReport.objects.create(
-                match=None,
-                source_file=path.name,
-                raw_data={**report_payload, 'events': len(events)},
-            )
+                MatchReport.objects.create(
+                    match=None,
+                    source_file=path.name,
+                    raw_data={**report_payload, 'events': imported_events},
+                )
+            # En modo read_only openpyxl deja el archivo abierto hasta close(): con varios
+            # ficheros por ejecución se iban acumulando descriptores.
+            workbook.close()
 
             self.stdout.write(
                 self.style.SUCCESS(
@@ -139,22 +163,26 @@ class Command(BaseCommand):
         sheets = []
         for name in workbook.sheetnames:
             sheet = workbook[name]
-            rows = sum(1 for _ in sheet.iter_rows(values_only=True))
+            # La dimensión declarada en la hoja da el número de filas sin recorrerla; solo se
+            # cuenta fila a fila si el archivo no la trae.
+            rows = sheet.max_row
+            if rows is None:
+                rows = sum(1 for _ in sheet.values)
             sheets.append({'sheet': name, 'rows': rows})
         return sheets
 
     def extract_bd_eventos(self, workbook):
+        """Genera un dict por fila de BD_EVENTOS sin cargar la hoja entera en memoria."""
         sheet_name = 'BD_EVENTOS'
         if sheet_name not in workbook.sheetnames:
-            return []
-        sheet = workbook[sheet_name]
-        rows = list(sheet.iter_rows(values_only=True))
-        if len(rows) <= 1:
-            return []
-
-        headers = [self.normalize_header(value) for value in rows[0]]
-        events = []
-        for row in rows[1:]:
+            return
+        rows = iter(workbook[sheet_name].values)
+        header_row = next(rows, None)
+        if header_row is None:
+            return
+
+        headers = [self.normalize_header(value) for value in header_row]
+        for row in rows:
             if all(cell is None for cell in row):
                 continue
             payload = {}
@@ -162,15 +190,26 @@ class Command(BaseCommand):
                 if index >= len(headers) or not headers[index]:
                     continue
                 payload[headers[index]] = value
-            events.append(payload)
-        return events
+            yield payload
 
     def ingest_events(self, events, season, group, primary_team, source_file):
         matches = {}
+        # Equipos del grupo y jugadores de la plantilla se cargan de una vez: antes cada rival
+        # y cada jugador nuevo en la hoja costaba sus propias consultas get_or_create.
+        group_teams = {}
+        for team in Team.objects.filter(group=group).order_by('id'):
+            if team.name_key:
+                group_teams.setdefault(team.name_key, team)
         opponents = {}
         players = {}
+        for player in Player.objects.filter(team=primary_team).order_by('id'):
+            players.setdefault(player.name, player)
+        new_events = []
+        # Los eventos de una importación anterior son los que ya existían antes de esta: se
+        # borran al final, con un solo DELETE para todo el archivo, acotando por id para no
+        # llevarse los que se acaban de insertar en lotes.
+        previous_last_id = MatchEvent.objects.aggregate(last_id=Max('id'))['last_id']
         created_events = 0
-        cleansed_matches = set()
         rename_players = {
             'antonio vilches': 'Antonio Ruiz',
         }
@@ -187,8 +226,9 @@ class Command(BaseCommand):
             if not match:
                 opponent = opponents.get(rival_name)
                 if not opponent:
-                    from football.models import resolve_or_create_team
-                    opponent, _ = resolve_or_create_team(name=rival_name, group=group)
+                    opponent = group_teams.get(normalize_team_name_key(rival_name))
+                    if opponent is None:
+                        opponent, _ = resolve_or_create_team(name=rival_name, group=group)
                     opponents[rival_name] = opponent
 
                 round_label = self.safe_text(row.get('jornada'), default=f'Partido {partido_id}')
@@ -207,10 +247,6 @@ class Command(BaseCommand):
                 )
                 matches[match_key] = match
 
-            if match.id not in cleansed_matches:
-                MatchEvent.objects.filter(match=match, source_file=source_file).delete()
-                cleansed_matches.add(match.id)
-
             player_name = self.safe_text(row.get('jugador'))
             if player_name:
                 normalized = player_name.strip().lower()
@@ -220,16 +256,15 @@ class Command(BaseCommand):
             if player_name:
                 player = players.get(player_name)
                 if not player:
-                    player, _ = Player.objects.get_or_create(
-                        team=primary_team,
-                        name=player_name,
-                    )
+                    # create() y no bulk_create: Player.save() normaliza la ficha y le resuelve
+                    # la identidad global, y eso no debe saltarse.
+                    player = Player.objects.create(team=primary_team, name=player_name)
                     players[player_name] = player
 
             minute = self.safe_int(row.get('minuto'))
             if minute is not None:
                 minute = max(0, min(minute, 200))
-            event = MatchEvent.objects.create(
+            new_events.append(MatchEvent(
                 match=match,
                 player=player,
                 minute=minute,
@@ -241,12 +276,33 @@ class Command(BaseCommand):
                 system=self.safe_text(row.get('sistema')),
                 source_file=source_file,
                 raw_data=self.clean_payload(row),
-            )
-            created_events += 1
+            ))
 
+            if len(new_events) >= EVENT_BATCH_SIZE:
+                created_events += self.flush_events(new_events)
+
+        created_events += self.flush_events(new_events)
+
+        match_ids = {match.id for match in matches.values()}
+        if match_ids and previous_last_id is not None:
+            MatchEvent.objects.filter(
+                match_id__in=match_ids,
+                source_file=source_file,
+                id__lte=previous_last_id,
+            ).delete()
         return created_events
 
     @staticmethod
+    def flush_events(new_events):
+        """Inserta el lote de eventos acumulado y vacía el buffer."""
+        # Un INSERT por evento era lo que hacía lenta la importación de hojas largas.
+        MatchEvent.bulk_ingest(new_events, batch_size=EVENT_BATCH_SIZE)
+        created = len(new_events)
+        new_events.clear()
+        return created
+
+    @staticmethod
+    @lru_cache(maxsize=512)
     def normalize_rival_name(value):
         name = str(value or '').strip()
         if not name:
@@ -263,10 +319,11 @@ class Command(BaseCommand):
         return aliases.get(folded, name)
 
     @staticmethod
+    @lru_cache(maxsize=512)
     def normalize_header(value):
         if not value:
             return ''
-        return ''.join(ch.lower() for ch in str(value).strip() if ch.isalnum())
+        return NON_ALNUM_RE.sub('', str(value).lower())
 
     @staticmethod
     def safe_text(value, default=''):
@@ -289,19 +346,28 @@ class Command(BaseCommand):
         if isinstance(value, (datetime, date)):
             return value.date() if isinstance(value, datetime) else value
         if isinstance(value, str):
-            for fmt in ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y'):
-                try:
-                    return datetime.strptime(value, fmt).date()
-                except ValueError:
-                    continue
+            # Una regex decide el formato; probar strptime formato a formato lanzaba
+            # ValueError por cada intento fallido.
+            match = ISO_DATE_RE.fullmatch(value)
+            if match:
+                year, month, day = match.groups()
+            else:
+                match = DMY_DATE_RE.fullmatch(value)
+                if not match:
+                    return None
+                day, _sep, month, year = match.groups()
+            try:
+                return date(int(year), int(month), int(day))
+            except ValueError:
+                return None
         return None
 
     @staticmethod
     def clean_payload(row):
-        cleaned = {}
-        for key, value in row.items():
-            if isinstance(value, (datetime, date)):
-                cleaned[key] = value.isoformat()
-            else:
-                cleaned[key] = value
-        return cleaned
+        # openpyxl devuelve exactamente datetime/date (sin subclases): basta comparar el tipo,
+        # más barato que isinstance() en cada celda de cada fila.
+        return {
+            key: value.isoformat() if type(value) in DATE_TYPES else value
+            for key, value in row.items()
+            if key not in TYPED_COLUMNS
+        }
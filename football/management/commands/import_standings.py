@@ -2,6 +2,7 @@ import csv
 from pathlib import Path
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 
 from football.models import ScrapeRun, ScrapeSource
@@ -54,6 +55,10 @@ class Command(BaseCommand):
 
         with path.open(newline='', encoding='utf-8') as handle:
             rows = list(csv.DictReader(handle))
+
+        # Clasificación y registro del run en una sola transacción: o queda todo o nada, y
+        # las escrituras por fila de update_team_standings se confirman de una vez.
+        with transaction.atomic():
             update_team_standings(
                 rows,
                 source.name,
@@ -62,13 +67,12 @@ class Command(BaseCommand):
                 season_name=options['season'],
                 group_name=options['group'],
             )
-
-        run = ScrapeRun.objects.create(
-            source=source,
-            status=ScrapeRun.Status.SUCCESS,
-            message=f'Manual · {path.name}',
-            completed_at=timezone.now(),
-        )
+            run = ScrapeRun.objects.create(
+                source=source,
+                status=ScrapeRun.Status.SUCCESS,
+                message=f'Manual · {path.name}',
+                completed_at=timezone.now(),
+            )
 
         self.stdout.write(
             self.style.SUCCESS(
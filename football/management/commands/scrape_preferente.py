@@ -1,8 +1,11 @@
+from functools import lru_cache
+import re
 from typing import Any, Dict, Optional
 
 import requests
 from bs4 import BeautifulSoup
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from django.utils import timezone
 from django.utils.text import slugify
 
@@ -13,26 +16,61 @@ from football.models import (
     Season,
     Team,
     TeamStanding,
+    normalize_team_name_key,
     resolve_or_create_team,
 )
+from football.services import HTML_PARSER, USER_AGENT
 
+_SESSION: Optional[requests.Session] = None
+# Todo lo que no sea letra o dígito (Unicode, como str.isalnum): el filtrado va en C.
+NON_ALNUM_RE = re.compile(r'[\W_]+')
+NUMBER_RE = re.compile(r'([-+]?\d+)(?:[.,]\d*)?')
 
+
+def _get_session() -> requests.Session:
+    # Sesión de módulo: reutiliza la conexión (keep-alive) entre descargas del mismo proceso.
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+        _SESSION.headers.update({'User-Agent': USER_AGENT})
+    return _SESSION
+
+
+@lru_cache(maxsize=512)
 def normalize_key(value: str) -> str:
     if not value:
         return ''
-    return ''.join(ch.lower() for ch in value if ch.isalnum())
+    return NON_ALNUM_RE.sub('', value.lower())
 
 
 def parse_number(value: Any) -> Optional[int]:
     if value is None:
         return None
-    text = str(value).strip().replace(',', '.')
-    if not text:
-        return None
-    try:
-        return int(float(text))
-    except (ValueError, TypeError):
+    match = NUMBER_RE.fullmatch(str(value).strip())
+    if not match:
         return None
+    # Parte entera tal cual: int(float(x)) también truncaba hacia cero.
+    return int(match.group(1))
+
+
+TEAM_NAME_KEYS = ('equipo', 'team', 'club', 'clubes')
+STANDING_COLUMN_ALIASES = {
+    'position': ('pos', 'posición', 'position', 'puesto', 'clasificacion'),
+    'played': ('pj', 'jugados', 'played'),
+    'wins': ('pg', 'victorias', 'wins'),
+    'draws': ('pe', 'empates', 'draws'),
+    'losses': ('pp', 'derrotas', 'losses'),
+    'goals_for': ('gf', 'golsfavor', 'favor'),
+    'goals_against': ('gc', 'golscontra', 'contra'),
+    'goal_difference': ('dg', 'dif', 'goal_difference'),
+    'points': ('pts', 'points', 'puntos'),
+}
+STANDING_FIELDS = tuple(STANDING_COLUMN_ALIASES)
+# Las claves candidatas se normalizan una vez al importar, no en cada fila.
+_TEAM_NAME_KEYS = tuple(normalize_key(key) for key in TEAM_NAME_KEYS)
+_STANDING_KEYS = {
+    field: tuple(normalize_key(key) for key in keys) for field, keys in STANDING_COLUMN_ALIASES.items()
+}
 
 
 class Command(BaseCommand):
@@ -86,68 +124,65 @@ class Command(BaseCommand):
         )
 
         try:
-            response = requests.get(
-                url,
-                headers={'User-Agent': 'webstats-crm/1.0'},
-                timeout=30,
-            )
+            response = _get_session().get(url, timeout=30)
             response.raise_for_status()
         except requests.RequestException as exc:
             raise CommandError(f'No se pudo descargar la URL: {exc}') from exc
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # Bytes y no texto: el parser detecta la codificación por su cuenta.
+        soup = BeautifulSoup(response.content, HTML_PARSER)
         standings_table = self.find_standings_table(soup)
         if standings_table is None:
             raise CommandError('No se encontró la tabla de clasificación en la página.')
 
-        header_cells = [
-            cell.get_text(strip=True) for cell in standings_table.find('tr').find_all(['th', 'td'])
-        ]
+        header_cells = self.row_texts(standings_table.tr)
         normalized_headers = [normalize_key(cell) or f'column_{idx}' for idx, cell in enumerate(header_cells)]
 
+        # Equipos y clasificación del grupo en dos consultas; luego se escribe en bloque en vez
+        # de un update_or_create (SELECT + INSERT/UPDATE) por equipo y por tabla.
+        group_teams = {}
+        for team in Team.objects.filter(group=group).order_by('id'):
+            if team.name_key:
+                group_teams.setdefault(team.name_key, team)
+        standings = {
+            standing.team_id: standing
+            for standing in TeamStanding.objects.filter(season=season, group=group)
+        }
+        teams_to_update = {}
+        touched_standings = {}
+        now = timezone.now()
+
         updated = []
         for row in standings_table.find_all('tr')[1:]:
-            cells = [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
+            cells = self.row_texts(row)
             if not cells or len(cells) < 2:
                 continue
 
             row_data = {normalized_headers[idx]: cells[idx] for idx in range(min(len(cells), len(normalized_headers)))}
 
-            team_name = self.get_value(row_data, ('equipo', 'team', 'club', 'clubes'))
+            team_name = self.get_value(row_data, _TEAM_NAME_KEYS)
             if not team_name:
                 continue
 
-            team, _team_created = resolve_or_create_team(
-                name=team_name,
-                group=group,
-                defaults={'is_primary': 'benagalbon' in team_name.lower()},
-            )
+            name_key = normalize_team_name_key(team_name)
+            team = group_teams.get(name_key) if name_key else None
+            if team is None:
+                team, _team_created = resolve_or_create_team(
+                    name=team_name,
+                    group=group,
+                    defaults={'is_primary': 'benagalbon' in team_name.lower()},
+                )
+                if name_key:
+                    group_teams[name_key] = team
             # Mantener grupo/primary al día en equipos ya existentes (sin renombrar el canónico).
-            _sp_changed = []
-            if group and team.group_id != getattr(group, 'id', None):
-                team.group = group
-                _sp_changed.append('group')
             _sp_is_primary = 'benagalbon' in team_name.lower()
-            if team.is_primary != _sp_is_primary:
+            if team.group_id != group.id or team.is_primary != _sp_is_primary:
+                team.group = group
                 team.is_primary = _sp_is_primary
-                _sp_changed.append('is_primary')
-            if _sp_changed:
-                team.save(update_fields=_sp_changed)
+                teams_to_update[team.id] = team
 
             standing_values = {
-                'position': parse_number(
-                    self.get_value(row_data, ('pos', 'posición', 'position', 'puesto', 'clasificacion'))
-                ),
-                'played': parse_number(self.get_value(row_data, ('pj', 'jugados', 'played'))),
-                'wins': parse_number(self.get_value(row_data, ('pg', 'victorias', 'wins'))),
-                'draws': parse_number(self.get_value(row_data, ('pe', 'empates', 'draws'))),
-                'losses': parse_number(self.get_value(row_data, ('pp', 'derrotas', 'losses'))),
-                'goals_for': parse_number(self.get_value(row_data, ('gf', 'golsfavor', 'favor'))),
-                'goals_against': parse_number(
-                    self.get_value(row_data, ('gc', 'golscontra', 'contra'))
-                ),
-                'goal_difference': parse_number(self.get_value(row_data, ('dg', 'dif', 'goal_difference'))),
-                'points': parse_number(self.get_value(row_data, ('pts', 'points', 'puntos'))),
+                field: parse_number(self.get_value(row_data, keys)) for field, keys in _STANDING_KEYS.items()
             }
 
             position_value = standing_values.get('position')
@@ -167,14 +202,23 @@ class Command(BaseCommand):
             if standing_values.get('goal_difference') is None and gf is not None and ga is not None:
                 standing_values['goal_difference'] = gf - ga
 
-            TeamStanding.objects.update_or_create(
-                season=season,
-                group=group,
-                team=team,
-                defaults={**{k: v for k, v in standing_values.items() if v is not None}, 'last_updated': timezone.now()},
-            )
+            standing = standings.get(team.id)
+            if standing is None:
+                standing = TeamStanding(season=season, group=group, team=team)
+                standings[team.id] = standing
+            touched_standings[team.id] = standing
+            for field, value in standing_values.items():
+                if value is not None:
+                    setattr(standing, field, value)
+            standing.last_updated = now
             updated.append(team.name)
 
+        with transaction.atomic():
+            if teams_to_update:
+                Team.objects.bulk_update(teams_to_update.values(), ['group', 'is_primary'])
+            if touched_standings:
+                TeamStanding.bulk_refresh(list(touched_standings.values()), [*STANDING_FIELDS, 'last_updated'])
+
         self.stdout.write(
             self.style.SUCCESS(
                 f'Actualizada clasificación ({len(updated)} equipos) para {group_name} {season_name}'
@@ -183,23 +227,28 @@ class Command(BaseCommand):
 
     @staticmethod
     def find_standings_table(soup: BeautifulSoup) -> Optional[Any]:
-        candidates = []
-        for table in soup.find_all('table'):
-            header = table.find('tr')
-            if not header:
+        # Solo interesa la primera candidata: se devuelve en cuanto aparece, y la cabecera se
+        # lee de una pasada con stripped_strings en vez de recorrer celda a celda.
+        for table in soup.select('table'):
+            header = table.tr
+            if header is None:
                 continue
-            header_texts = ' '.join(
-                cell.get_text(strip=True).lower() for cell in header.find_all(['th', 'td'])
-            )
+            header_texts = ' '.join(header.stripped_strings).lower()
             if 'equipo' in header_texts or ('pts' in header_texts and 'pj' in header_texts):
-                candidates.append(table)
+                return table
+        return None
 
-        return candidates[0] if candidates else None
+    @staticmethod
+    def row_texts(row) -> list:
+        # Solo las celdas hijas directas: no hace falta descender por el contenido de cada celda
+        # (enlaces, escudos...) para encontrarlas.
+        return [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'], recursive=False)]
 
     @staticmethod
     def get_value(data: Dict[str, str], keys: tuple) -> Optional[str]:
+        """Primer valor no vacío entre las claves `keys`, ya normalizadas con normalize_key."""
         for key in keys:
-            normalized = normalize_key(key)
-            if normalized in data and data[normalized]:
-                return data[normalized]
+            value = data.get(key)
+            if value:
+                return value
         return None
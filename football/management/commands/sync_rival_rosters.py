@@ -9,7 +9,7 @@ from django.utils import timezone
 from django.utils.text import slugify
 
 from football.models import Team, TeamRosterSnapshot, TeamStanding, Group, Season, Competition, normalize_team_name_key
-from football.services import fetch_preferente_team_roster, find_preferente_team_url
+from football.services import fetch_preferente_team_roster, fetch_preferente_team_rosters, find_preferente_team_url
 
 
 def _unique_team_slug(base_name: str) -> str:
@@ -536,6 +536,7 @@ class Command(BaseCommand):
             if not group:
                 raise CommandError('No hay equipo principal con grupo asignado para iterar rivales.')
             rivals = list(Team.objects.filter(group=group).order_by('name', 'id'))
+            pending = []
             for team in rivals:
                 if limit and processed >= limit:
                     break
@@ -571,8 +572,14 @@ class Command(BaseCommand):
                             }
                         )
                     continue
+                pending.append((team, url))
+            # Las descargas se solapan (son esperas de red); las escrituras siguen en este hilo.
+            fetched = fetch_preferente_team_rosters([url for _team, url in pending])
+            for team, url in pending:
                 try:
-                    roster = fetch_preferente_team_roster(url)
+                    roster = fetched.get(url)
+                    if isinstance(roster, Exception):
+                        raise roster
                     TeamRosterSnapshot.objects.update_or_create(
                         team=team,
                         provider=provider,
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.27 on 2026-10-15 08:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football', '0251_cola_fotos_pizarra'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['season', 'round'], name='match_season_round_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matchevent',
+            index=models.Index(fields=['match', 'source_file'], name='me_match_src_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['group', 'is_primary'], name='team_group_primary_idx'),
+        ),
+    ]
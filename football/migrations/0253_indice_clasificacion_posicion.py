@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-15 08:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football', '0252_indices_filtros_admin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='teamstanding',
+            index=models.Index(fields=['group', 'position'], name='standing_group_pos_idx'),
+        ),
+    ]
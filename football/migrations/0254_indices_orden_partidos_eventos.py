@@ -0,0 +1,21 @@
+# Generated by Django 4.2.27 on 2026-10-15 08:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football', '0253_indice_clasificacion_posicion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['-date', 'round'], name='match_date_round_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matchevent',
+            index=models.Index(fields=['match', 'minute'], name='me_match_minute_idx'),
+        ),
+    ]
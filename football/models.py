@@ -1,5 +1,5 @@
-from django.db import models
-from django.db.models import Q
+from django.db import connection, models
+from django.db.models import Prefetch, Q
 from django.db.models.functions import Lower
 from django.contrib.auth.hashers import check_password, make_password
 from django.utils import timezone
@@ -236,6 +236,12 @@ class Team(models.Model):
         help_text='Formato de juego (afecta a convocatorias, 11/7 inicial y registro en vivo).',
     )
 
+    class Meta:
+        indexes = [
+            # Scrapers e importadores buscan el equipo principal dentro del grupo.
+            models.Index(fields=['group', 'is_primary'], name='team_group_primary_idx'),
+        ]
+
     @property
     def display_name(self):
         return (self.short_name or self.name or '').strip()
@@ -2346,6 +2352,19 @@ class ConvocationRecord(models.Model):
             models.Index(fields=['team', 'is_current', 'created_at'], name='conv_team_curr_idx'),
         ]
 
+    @classmethod
+    def current_for(cls, team):
+        # Quien pide la convocatoria vigente casi siempre recorre sus jugadores: se traen en una
+        # sola consulta IN (ya ordenados por nombre) en vez de una por convocatoria.
+        return cls.objects.filter(team=team, is_current=True).prefetch_related(
+            Prefetch('players', queryset=Player.objects.order_by('name'))
+        )
+
+    @classmethod
+    def retire_current(cls, team_ids):
+        """Deja sin convocatoria vigente a los equipos dados: un solo UPDATE para todos."""
+        return cls.objects.filter(team_id__in=team_ids, is_current=True).update(is_current=False)
+
     def mark_replaced(self):
         if self.is_current:
             self.is_current = False
@@ -2694,6 +2713,9 @@ class Match(models.Model):
             models.Index(fields=['away_team', 'date'], name='match_away_date_idx'),
             models.Index(fields=['season', 'date'], name='match_season_date_idx'),
             models.Index(fields=['club_season', 'date'], name='match_club_season_date_idx'),
+            models.Index(fields=['season', 'round'], name='match_season_round_idx'),
+            # Orden por defecto (listados sin filtro, admin): se lee el índice en vez de ordenar.
+            models.Index(fields=['-date', 'round'], name='match_date_round_idx'),
         ]
 
     def __str__(self):
@@ -2711,6 +2733,8 @@ class Match(models.Model):
 
 
 class TeamStanding(models.Model):
+    BULK_BATCH_SIZE = 500
+
     season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name='standings')
     group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name='standings')
     team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='standings')
@@ -2728,10 +2752,38 @@ class TeamStanding(models.Model):
     class Meta:
         unique_together = ('season', 'group', 'team')
         ordering = ['position']
+        indexes = [
+            # La tabla se pinta con filter(group=...).order_by('position'): índice sin ordenación.
+            models.Index(fields=['group', 'position'], name='standing_group_pos_idx'),
+        ]
 
     def __str__(self):
         return f'{self.team.name} ({self.season.name}) - {self.points} pts'
 
+    @classmethod
+    def bulk_refresh(cls, standings, fields):
+        """Guarda de golpe filas de clasificación ya rellenas en memoria.
+
+        Las que tienen pk se actualizan con un UPDATE por lote (solo `fields`); las nuevas se
+        insertan por lotes y, si el motor lo permite, como upsert sobre (season, group, team)
+        para no chocar con un scrape concurrente que haya creado la misma fila.
+        """
+        existing = [standing for standing in standings if standing.pk]
+        new = [standing for standing in standings if not standing.pk]
+        if existing:
+            cls.objects.bulk_update(existing, fields, batch_size=cls.BULK_BATCH_SIZE)
+        if new:
+            if connection.features.supports_update_conflicts_with_target:
+                cls.objects.bulk_create(
+                    new,
+                    batch_size=cls.BULK_BATCH_SIZE,
+                    update_conflicts=True,
+                    unique_fields=['season', 'group', 'team'],
+                    update_fields=fields,
+                )
+            else:
+                cls.objects.bulk_create(new, batch_size=cls.BULK_BATCH_SIZE)
+
 
 class TeamStatistic(models.Model):
     team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='statistics')
@@ -2887,6 +2939,8 @@ class MatchReport(models.Model):
 
 
 class MatchEvent(models.Model):
+    INGEST_BATCH_SIZE = 1000
+
     match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name='events')
     period = models.PositiveSmallIntegerField(null=True, blank=True, help_text='Parte del partido o periodo (1, 2, etc.)')
     player = models.ForeignKey(Player, on_delete=models.SET_NULL, null=True, blank=True, related_name='events')
@@ -2911,8 +2965,21 @@ class MatchEvent(models.Model):
         indexes = [
             models.Index(fields=['match', 'player'], name='me_match_player_idx'),
             models.Index(fields=['match', 'system', 'source_file', 'created_at'], name='me_m_sys_src_ca_idx'),
+            # Reimportación del Excel: borra por (partido, fichero) sin filtrar por sistema.
+            models.Index(fields=['match', 'source_file'], name='me_match_src_idx'),
+            # Cronología de un partido: filter(match=...) con el orden por defecto (match, minute).
+            models.Index(fields=['match', 'minute'], name='me_match_minute_idx'),
         ]
 
+    @classmethod
+    def bulk_ingest(cls, events, batch_size=INGEST_BATCH_SIZE):
+        """Vía de alta masiva de eventos (importaciones, cargas de hojas, recuperación manual).
+
+        INSERTs por lotes en vez de uno por evento: save() de MatchEvent no tiene lógica propia,
+        así que no se pierde nada al saltárselo.
+        """
+        return cls.objects.bulk_create(events, batch_size=batch_size)
+
     def __str__(self):
         player_label = self.player.name if self.player else 'Jugador desconocido'
         return f'{self.match} - {player_label} - {self.event_type}'
@@ -1,3 +1,4 @@
+import copy
 import json
 import logging
 import os
@@ -410,32 +411,51 @@ def load_preferred_next_match_payload(
     return None
 
 
-def load_cached_next_match(cache_path=None):
-    cache_path = Path(cache_path) if cache_path else NEXT_MATCH_CACHE
-    if not cache_path.exists():
-        return None
+# Último JSON leído por ruta, con la firma (mtime_ns, tamaño) del fichero: el dashboard lo
+# consulta en cada carga y el fichero sólo cambia cuando se refresca el próximo partido.
+_NEXT_MATCH_FILE_CACHE = {}
+
+
+def _read_next_match_file(cache_path):
     try:
+        stat = cache_path.stat()
+    except OSError:
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _NEXT_MATCH_FILE_CACHE.get(cache_path)
+    if cached is None or cached[0] != signature:
         with cache_path.open(encoding='utf-8') as handle:
             payload = json.load(handle)
-            if isinstance(payload, dict):
-                payload = normalize_next_match_payload(payload)
-                payload.setdefault('status', 'next')
-                status = (payload.get('status') or '').lower()
-                source = str(payload.get('source') or '').strip().lower()
-                date_raw = payload.get('date')
-                if date_raw:
-                    payload_date = parse_payload_date(date_raw)
-                    today = timezone.localdate()
-                    if payload_date:
-                        if status == 'next' and payload_date < today:
-                            return None
-                        if status == 'latest' and payload_date < (today - timedelta(days=3)):
-                            return None
-                    elif status == 'next':
+        if isinstance(payload, dict):
+            payload = normalize_next_match_payload(payload)
+        cached = (signature, payload)
+        _NEXT_MATCH_FILE_CACHE[cache_path] = cached
+    # Copia: quien llama puede completar el payload (escudos, estado) sin tocar la caché.
+    return copy.deepcopy(cached[1])
+
+
+def load_cached_next_match(cache_path=None):
+    cache_path = Path(cache_path) if cache_path else NEXT_MATCH_CACHE
+    try:
+        payload = _read_next_match_file(cache_path)
+        if isinstance(payload, dict):
+            payload.setdefault('status', 'next')
+            status = (payload.get('status') or '').lower()
+            source = str(payload.get('source') or '').strip().lower()
+            date_raw = payload.get('date')
+            if date_raw:
+                payload_date = parse_payload_date(date_raw)
+                today = timezone.localdate()
+                if payload_date:
+                    if status == 'next' and payload_date < today:
+                        return None
+                    if status == 'latest' and payload_date < (today - timedelta(days=3)):
                         return None
-                elif status == 'next' and source in {'', 'local-match'}:
+                elif status == 'next':
                     return None
-                return payload
+            elif status == 'next' and source in {'', 'local-match'}:
+                return None
+            return payload
     except Exception:
         return None
     return None
@@ -1,9 +1,15 @@
 import base64
 import inspect
 import logging
+import mimetypes
 import os
 import re
+from functools import partial
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
 
+from django.conf import settings
+from django.contrib.staticfiles import finders
 from django.http import HttpResponse
 
 logger = logging.getLogger(__name__)
@@ -45,7 +51,48 @@ def pydyf_compat_status():
         return False, 'not installed'
 
 
-def _safe_url_fetcher(url, timeout=4, ssl_context=None):
+def _path_within(base, relative):
+    try:
+        root = Path(base).resolve()
+        candidate = (root / relative).resolve()
+    except Exception:
+        return None
+    if candidate != root and root not in candidate.parents:
+        return None
+    return candidate if candidate.is_file() else None
+
+
+def _local_asset_path(url, local_host):
+    """Fichero en disco de un /static/ o /media/ de este mismo servidor (None si no lo es)."""
+    parts = urlsplit(str(url or ''))
+    if parts.scheme not in {'http', 'https'} or not local_host or parts.netloc != local_host:
+        return None
+    path = unquote(parts.path)
+    static_url = str(getattr(settings, 'STATIC_URL', '') or '')
+    if static_url.startswith('/') and path.startswith(static_url):
+        relative = path[len(static_url):]
+        static_root = getattr(settings, 'STATIC_ROOT', None)
+        found = _path_within(static_root, relative) if static_root else None
+        if not found:
+            found = finders.find(relative)
+        return Path(found) if found else None
+    media_url = str(getattr(settings, 'MEDIA_URL', '') or '')
+    media_root = getattr(settings, 'MEDIA_ROOT', None)
+    if media_root and media_url.startswith('/') and path.startswith(media_url):
+        return _path_within(media_root, path[len(media_url):])
+    return None
+
+
+def _safe_url_fetcher(url, timeout=4, ssl_context=None, local_host=None):
+    # Estáticos y media propios se leen de disco: pedirlos por HTTP al mismo servidor ocupa
+    # otro worker mientras este espera (hasta `timeout` por imagen) y alarga el render.
+    try:
+        local_path = _local_asset_path(url, local_host)
+        if local_path:
+            mime = mimetypes.guess_type(local_path.name)[0] or 'application/octet-stream'
+            return {'string': local_path.read_bytes(), 'mime_type': mime}
+    except Exception:
+        logger.debug('No se pudo leer de disco el recurso local del PDF.', exc_info=True)
     try:
         raw_url = str(url or '').strip()
         if raw_url.startswith('data:') and ',' in raw_url:
@@ -70,10 +117,11 @@ def _safe_url_fetcher(url, timeout=4, ssl_context=None):
 
 
 def _write_pdf_bytes(request, html: str):
+    base_url = request.build_absolute_uri('/')
     return weasyprint.HTML(
         string=html,
-        base_url=request.build_absolute_uri('/'),
-        url_fetcher=_safe_url_fetcher,
+        base_url=base_url,
+        url_fetcher=partial(_safe_url_fetcher, local_host=urlsplit(base_url).netloc),
     ).write_pdf()
 
 
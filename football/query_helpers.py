@@ -6,7 +6,7 @@ from datetime import datetime
 
 from . import media_estable
 from django.core.cache import cache
-from django.db.models import Max, Q
+from django.db.models import Case, F, IntegerField, Max, Q, Value, When
 from django.db.utils import OperationalError, ProgrammingError
 from django.utils import timezone
 
@@ -259,14 +259,30 @@ def _team_match_queryset(primary_team):
 
 def get_active_match(primary_team):
     qs = _team_match_queryset(primary_team)
-    if not qs.exists():
-        return None
     today = timezone.localdate()
     # Flujo operativo: home y convocatoria deben seguir el orden cronológico real
     # del calendario, sin privilegiar Liga sobre amistosos/torneos.
-    upcoming = qs.filter(date__gte=today).order_by("date", "id").first()
-    if upcoming:
-        return upcoming
+    # Una sola consulta para los partidos con fecha: primero el próximo (fecha asc) y, si no hay
+    # futuros, el último jugado (fecha desc). Sin partidos, devuelve None sin más consultas.
+    # A igual fecha, el próximo es el de menor id y el último jugado, el de mayor id.
+    dated = (
+        qs.exclude(date__isnull=True)
+        .annotate(
+            upcoming_rank=Case(When(date__gte=today, then=Value(0)), default=Value(1), output_field=IntegerField()),
+            upcoming_date=Case(When(date__gte=today, then=F("date"))),
+            upcoming_id=Case(When(date__gte=today, then=F("id"))),
+        )
+        .order_by(
+            "upcoming_rank",
+            F("upcoming_date").asc(nulls_last=True),
+            F("date").desc(),
+            F("upcoming_id").asc(nulls_last=True),
+            "-id",
+        )
+        .first()
+    )
+    if dated and dated.date >= today:
+        return dated
     undated_next = list(qs.filter(date__isnull=True))
     if undated_next:
         undated_next.sort(
@@ -277,10 +293,7 @@ def get_active_match(primary_team):
             reverse=True,
         )
         return undated_next[0]
-    latest = qs.exclude(date__isnull=True).order_by('-date').first()
-    if latest:
-        return latest
-    return qs.order_by('-id').first()
+    return dated
 
 
 def get_next_open_calendar_match(primary_team):
@@ -421,7 +434,7 @@ def is_manual_sanction_active(player, today=None):
 def get_current_convocation_record(team, match=None, fallback_to_latest=True):
     if not team:
         return None
-    qs = ConvocationRecord.objects.filter(team=team, is_current=True).prefetch_related('players')
+    qs = ConvocationRecord.current_for(team)
     if match:
         by_match = qs.filter(match=match).order_by('-created_at').first()
         if by_match:
@@ -431,11 +444,19 @@ def get_current_convocation_record(team, match=None, fallback_to_latest=True):
     return qs.order_by('-created_at').first()
 
 
+def convocation_players_by_name(record):
+    """Jugadores de la convocatoria ordenados por nombre, reutilizando los ya precargados
+    por `ConvocationRecord.current_for` en vez de lanzar otra consulta."""
+    if 'players' in getattr(record, '_prefetched_objects_cache', {}):
+        return list(record.players.all())
+    return list(record.players.order_by('name'))
+
+
 def get_current_convocation(team, match=None):
     record = get_current_convocation_record(team, match=match)
     if record:
-        return record.players.order_by('name')
-    return Player.objects.filter(team=team, is_active=True).order_by('name')
+        return convocation_players_by_name(record)
+    return list(Player.objects.filter(team=team, is_active=True).order_by('name'))
 
 
 def parse_match_date_from_ui(raw_value):
@@ -1,20 +1,27 @@
+import copy
 import csv
+import heapq
 import ipaddress
 import os
 import re
 import socket
 import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from io import BytesIO, StringIO
 from pathlib import Path
 from typing import Optional
 from urllib.parse import parse_qs, quote_plus, urljoin, urlparse
 
-from PIL import Image
+from PIL import Image, ImageOps
 import pytesseract
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 from django.conf import settings
+from django.db import transaction
 from django.template.defaultfilters import slugify
 from openpyxl import load_workbook
 from django.utils import timezone
@@ -22,10 +29,43 @@ from django.utils import timezone
 from football.competition_season_services import current_season_name
 from football.models import Competition, Group, Season, Team, TeamStanding, resolve_or_create_team
 
+# lxml es un parser en C, varias veces más rápido que html.parser en páginas con tablas
+# grandes. Si no está instalado se sigue funcionando con el de la librería estándar.
+try:  # pragma: no cover
+    import lxml.html
+    HTML_PARSER = 'lxml'
+except Exception:  # pragma: no cover
+    lxml = None
+    HTML_PARSER = 'html.parser'
 
 USER_AGENT = 'webstats-crm/1.0'
 DOWNLOAD_TEXT_PATTERN = re.compile(r'descarg', re.IGNORECASE)
 DOWNLOAD_EXTENSIONS = ('.csv', '.xls', '.xlsx', '.png')
+# Un único selector CSS (sin distinguir mayúsculas) para los enlaces a ficheros descargables.
+DOWNLOAD_LINK_SELECTOR = ', '.join(f'a[href$="{ext}" i]' for ext in DOWNLOAD_EXTENSIONS)
+# Compiladas una vez: se aplican a cada celda/cabecera de las tablas importadas.
+NON_ALNUM_PATTERN = re.compile(r'[^a-z0-9]+')
+# Se aplica con finditer sobre todo el texto del OCR: el espacio no cruza saltos de línea para
+# que cada coincidencia siga siendo una sola fila de la tabla.
+OCR_STANDING_LINE_PATTERN = re.compile(
+    r'^[^\S\n]*(\d+)[^\S\n]+(.+?)' + r'[^\S\n]+(\d+)' * 7 + r'[^\S\n]+([+-]?\d+)',
+    re.UNICODE | re.MULTILINE,
+)
+INT_CELL_SEPARATORS = str.maketrans('', '', '.,')
+# OCR de la clasificación en PNG: a este ancho el texto sigue legible y tesseract tarda una
+# fracción; psm 6 (bloque uniforme) y oem 1 (solo LSTM) se saltan el análisis de maquetación.
+OCR_MAX_WIDTH = 1800
+# Tope del fichero de clasificación descargado: se lee en streaming y se corta al pasarlo.
+OFFICIAL_DOWNLOAD_MAX_BYTES = 50 * 1024 * 1024
+OFFICIAL_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# (conexión, lectura) por intento. Con un único reintento (solo conexión o 502/503/504) el peor
+# caso con el host caído es 2 x 5 s, por debajo de los 15 s que costaba antes un solo intento.
+OFFICIAL_FETCH_TIMEOUT = (5, 15)
+OCR_TESSERACT_CONFIG = '--psm 6 --oem 1'
+# Solo se construye el trozo del árbol que se va a leer: cabecera, menús y scripts se saltan.
+LINK_STRAINER = SoupStrainer('a', href=True)
+TABLE_STRAINER = SoupStrainer('table')
+ROSTER_TABLE_STRAINER = SoupStrainer('table', id='tablePlantilla')
 PLAYER_ROSTER_PATH = Path(settings.BASE_DIR) / 'data' / 'input' / 'player-roster.html'
 MATCH_LISTS_PATH = Path(settings.BASE_DIR) / 'data' / 'excel' / 'FICHA_PARTIDO.xlsx'
 PREFERENTE_USER_AGENT = (
@@ -35,7 +75,9 @@ PREFERENTE_USER_AGENT = (
 )
 PREFERENTE_BASE_URL = 'https://www.lapreferente.com/'
 ROSTER_REFRESH_SECONDS = int(getattr(settings, 'PREFERENTE_ROSTER_REFRESH_SECONDS', 6 * 3600))
+PREFERENTE_FETCH_WORKERS = 4
 _PREFERENTE_SESSION: Optional[requests.Session] = None
+_OFFICIAL_SESSION: Optional[requests.Session] = None
 
 
 def _validate_external_fetch_url(url: str, *, allowed_hosts: Optional[set[str]] = None) -> str:
@@ -71,14 +113,16 @@ def _validate_external_fetch_url(url: str, *, allowed_hosts: Optional[set[str]]
     return raw
 
 
-def safe_external_get(url, *, timeout=6, max_redirects=3, allowed_hosts=None, headers=None, stream=False):
+def safe_external_get(url, *, timeout=6, max_redirects=3, allowed_hosts=None, headers=None, stream=False, session=None):
     """GET seguro anti-SSRF. Valida el destino (rechaza IP privada/reservada, y opcionalmente
     allowlist de hosts) en CADA salto: NO delega los redirects a `requests` (allow_redirects=False)
     sino que los sigue a mano re-validando el `Location`. Así un host público que responda
-    `302 -> http://169.254.169.254/…` (o loopback/IP interna) se corta en vez de seguirse."""
+    `302 -> http://169.254.169.254/…` (o loopback/IP interna) se corta en vez de seguirse.
+    Con `session` las peticiones reutilizan sus conexiones abiertas (keep-alive)."""
     current = _validate_external_fetch_url(url, allowed_hosts=allowed_hosts)
+    get = session.get if session is not None else requests.get
     for _ in range(max(1, int(max_redirects)) + 1):
-        resp = requests.get(current, timeout=timeout, allow_redirects=False, headers=headers, stream=stream)
+        resp = get(current, timeout=timeout, allow_redirects=False, headers=headers, stream=stream)
         if resp.status_code in (301, 302, 303, 307, 308):
             location = resp.headers.get('Location')
             if not location:
@@ -96,6 +140,32 @@ def _get_preferente_session() -> requests.Session:
     return _PREFERENTE_SESSION
 
 
+def _get_official_session() -> requests.Session:
+    """Sesión compartida para la federación: la página de clasificación y su fichero de descarga
+    suelen estar en el mismo host, y así la segunda petición no repite el handshake TCP+TLS."""
+    global _OFFICIAL_SESSION
+    if _OFFICIAL_SESSION is None:
+        session = requests.Session()
+        session.headers.update({'User-Agent': USER_AGENT})
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            # Sin reintentos de lectura: una respuesta lenta no se vuelve a pedir. Agotado el reintento
+            # se devuelve la última respuesta 5xx (raise_for_status) en vez de un RetryError.
+            max_retries=Retry(
+                total=1,
+                read=0,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                raise_on_status=False,
+            ),
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _OFFICIAL_SESSION = session
+    return _OFFICIAL_SESSION
+
+
 def normalize_header(value):
     if value is None:
         return ''
@@ -248,14 +318,14 @@ def _fetch_preferente_team_roster_via_json(team_id: str, timeout: int = 20) -> l
 def ensure_league_structure(competition_name, season_name, group_name):
     competition, _ = Competition.objects.get_or_create(
         name=competition_name,
-        defaults={'slug': slugify(competition_name), 'region': 'Andalucía', 'level': 5},
+        defaults={'slug': _slugify_cached(competition_name), 'region': 'Andalucía', 'level': 5},
     )
     season, _ = Season.objects.get_or_create(
         competition=competition,
         name=season_name,
         defaults={'is_current': True},
     )
-    group_slug = slugify(group_name)
+    group_slug = _slugify_cached(group_name)
     group = Group.objects.filter(season=season, slug=group_slug).first()
     if not group:
         group = (
@@ -268,76 +338,76 @@ def ensure_league_structure(competition_name, season_name, group_name):
     return competition, season, group
 
 
+STANDING_BULK_FIELDS = [
+    'position', 'played', 'wins', 'draws', 'losses',
+    'goals_for', 'goals_against', 'goal_difference', 'points', 'last_updated',
+]
+
+
 def update_team_standings(rows, source_label, source_url, competition_name='División de Honor Andaluza', season_name=None, group_name='Grupo 2'):
     # `None` (no la temporada del año en que se importó el módulo) para que siga la campaña vigente.
     season_name = str(season_name or '').strip() or current_season_name()
     allow_single_club_fallback = str(os.getenv('ALLOW_SINGLE_CLUB_FALLBACK', '0') or '').strip().lower() in {'1', 'true', 'yes', 'on'}
     _, season, group = ensure_league_structure(competition_name, season_name, group_name)
     updated_slugs = set()
-    for idx, row in enumerate(rows, start=1):
-        team_name = row.get('team') or row.get('equipo')
-        if not team_name:
-            continue
-        team = _resolve_team_for_standings(team_name, group)
-        updated_slugs.add(team.slug)
-        update_fields = []
-        if team.name != team_name:
-            team.name = team_name
-            update_fields.append('name')
-        if team.group != group:
-            team.group = group
-            update_fields.append('group')
-        # Legacy monoclub: auto-detectar el equipo principal por nombre.
-        # En modo comercial multi-equipo esto mezcla categorías (Senior vs Prebenjamín).
-        if allow_single_club_fallback and 'benagalbon' in _normalize_team_key(team.name):
-            if team.is_primary:
-                Team.objects.exclude(id=team.id).filter(is_primary=True).update(is_primary=False)
-            if not team.is_primary:
-                team.is_primary = True
-                update_fields.append('is_primary')
-        if update_fields:
-            team.save(update_fields=update_fields)
-
-        position_value = _int_or(row.get('position'), default=idx)
-        played_value = _int_or(row.get('played') or row.get('pj'))
-        wins_value = _int_or(row.get('wins') or row.get('pg'))
-        draws_value = _int_or(row.get('draws') or row.get('pe'))
-        losses_value = _int_or(row.get('losses') or row.get('pp'))
-        goals_for_value = _int_or(row.get('goals_for') or row.get('gf'))
-        goals_against_value = _int_or(row.get('goals_against') or row.get('gc'))
-        goal_difference_value = _int_or(row.get('goal_difference') or row.get('dg'))
-        points_value = _int_or(row.get('points') or row.get('pt') or row.get('pts'))
-        standing, _ = TeamStanding.objects.update_or_create(
-            season=season,
-            group=group,
-            team=team,
-            defaults={
-                'position': position_value,
-                'played': played_value,
-                'wins': wins_value,
-                'draws': draws_value,
-                'losses': losses_value,
-                'goals_for': goals_for_value,
-                'goals_against': goals_against_value,
-                'goal_difference': goal_difference_value,
-                'points': points_value,
-                'last_updated': timezone.now(),
-            },
-        )
-        if standing.points is None:
-            wins = standing.wins or 0
-            draws = standing.draws or 0
-            standing.points = wins * 3 + draws
-            standing.save(update_fields=['points'])
-        if standing.position is None:
-            standing.position = TeamStanding.objects.filter(group=group).count()
-            standing.save(update_fields=['position'])
-    if updated_slugs:
-        TeamStanding.objects.filter(group=group).exclude(team__slug__in=updated_slugs).delete()
+    # Perf: una consulta para las filas ya guardadas del grupo y un guardado por lotes al final,
+    # en vez de un update_or_create (SELECT + UPDATE/INSERT) por cada equipo de la tabla.
+    standings_by_team = {
+        standing.team_id: standing
+        for standing in TeamStanding.objects.filter(season=season, group=group).only('id', 'season', 'group', 'team')
+    }
+    touched = {}
+    group_team_ids = set()
+    now = timezone.now()
+    with transaction.atomic():
+        for idx, row in enumerate(rows, start=1):
+            team_name = row.get('team') or row.get('equipo')
+            if not team_name:
+                continue
+            team = _resolve_team_for_standings(team_name, group)
+            updated_slugs.add(team.slug)
+            # Cambio de grupo: se acumulan y van en un único UPDATE al final.
+            # El renombrado sí pasa por save() porque recalcula name_key y el club.
+            if team.group_id != group.id:
+                team.group = group
+                group_team_ids.add(team.id)
+            # Legacy monoclub: auto-detectar el equipo principal por nombre.
+            # En modo comercial multi-equipo esto mezcla categorías (Senior vs Prebenjamín).
+            # Se marca en el momento (como mucho una vez por importación): las filas siguientes del
+            # Benagalbón resuelven al equipo principal consultando la BD en _resolve_team_for_standings.
+            if allow_single_club_fallback and 'benagalbon' in _normalize_team_key(team_name):
+                if team.is_primary:
+                    Team.objects.exclude(id=team.id).filter(is_primary=True).update(is_primary=False)
+                else:
+                    team.is_primary = True
+                    Team.objects.filter(id=team.id).update(is_primary=True)
+            if team.name != team_name:
+                team.name = team_name
+                team.save(update_fields=['name'])
+
+            standing = standings_by_team.get(team.id) or TeamStanding(season=season, group=group, team=team)
+            standing.position = _int_or(row.get('position'), default=idx)
+            standing.played = _int_or(row.get('played') or row.get('pj'))
+            standing.wins = _int_or(row.get('wins') or row.get('pg'))
+            standing.draws = _int_or(row.get('draws') or row.get('pe'))
+            standing.losses = _int_or(row.get('losses') or row.get('pp'))
+            standing.goals_for = _int_or(row.get('goals_for') or row.get('gf'))
+            standing.goals_against = _int_or(row.get('goals_against') or row.get('gc'))
+            standing.goal_difference = _int_or(row.get('goal_difference') or row.get('dg'))
+            standing.points = _int_or(row.get('points') or row.get('pt') or row.get('pts'))
+            standing.last_updated = now
+            standings_by_team[team.id] = standing
+            touched[team.id] = standing
+        if group_team_ids:
+            Team.objects.filter(id__in=group_team_ids).update(group=group)
+        if touched:
+            TeamStanding.bulk_refresh(list(touched.values()), STANDING_BULK_FIELDS)
+        if updated_slugs:
+            TeamStanding.objects.filter(group=group).exclude(team__slug__in=updated_slugs).delete()
 
 
 def _resolve_team_for_standings(team_name: str, group: Group) -> Team:
-    team_slug = slugify(team_name)
+    team_slug = _slugify_cached(team_name)
     normalized_name = _normalize_team_key(team_name)
     allow_single_club_fallback = str(os.getenv('ALLOW_SINGLE_CLUB_FALLBACK', '0') or '').strip().lower() in {'1', 'true', 'yes', 'on'}
     if allow_single_club_fallback and 'benagalbon' in normalized_name:
@@ -356,7 +426,7 @@ def _resolve_team_for_standings(team_name: str, group: Group) -> Team:
 def _normalize_team_key(value: str) -> str:
     normalized = unicodedata.normalize('NFD', value or '')
     without_accents = ''.join(ch for ch in normalized if unicodedata.category(ch) != 'Mn')
-    return re.sub(r'[^a-z0-9]+', '', without_accents.lower())
+    return NON_ALNUM_PATTERN.sub('', without_accents.lower())
 
 
 def _parse_csv_rows(content):
@@ -366,31 +436,75 @@ def _parse_csv_rows(content):
 
 
 def _parse_excel_rows(content):
-    workbook = load_workbook(filename=BytesIO(content), data_only=True)
-    sheet = workbook.active
-    rows = list(sheet.iter_rows(values_only=True))
-    if len(rows) <= 1:
-        return []
-    header = [normalize_header(cell) for cell in rows[0]]
-    parsed = []
-    for row in rows[1:]:
-        if all(cell is None for cell in row):
-            continue
-        record = {}
-        for idx, value in enumerate(row):
-            if idx >= len(header):
-                break
-            key = header[idx]
-            if key:
-                record[key] = value
-        parsed.append(record)
-    return parsed
+    # read_only: las filas se leen en streaming, sin cargar todas las celdas en memoria.
+    workbook = load_workbook(filename=BytesIO(content), data_only=True, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header_row = next(rows, None)
+        if header_row is None:
+            return []
+        header = [normalize_header(cell) for cell in header_row]
+        parsed = []
+        for row in rows:
+            if all(cell is None for cell in row):
+                continue
+            record = {}
+            for idx, value in enumerate(row):
+                if idx >= len(header):
+                    break
+                key = header[idx]
+                if key:
+                    record[key] = value
+            parsed.append(record)
+        return parsed
+    finally:
+        workbook.close()
 
 
 def _normalize_header_text(value):
     if value is None:
         return ''
-    return re.sub(r'[^a-z0-9]+', '_', str(value).lower()).strip('_')
+    return NON_ALNUM_PATTERN.sub('_', str(value).lower()).strip('_')
+
+
+# Los mismos trozos de texto que get_text() de BeautifulSoup: itertext() también devuelve el
+# contenido de <script>, <style> y <template>, y pegaba "var a=1" al nombre del equipo.
+_LXML_CELL_TEXT = (
+    lxml.etree.XPath('.//text()[not(ancestor::script or ancestor::style or ancestor::template)]')
+    if lxml is not None
+    else None
+)
+
+
+def _parse_html_table_lxml(html):
+    # Misma lectura que _parse_html_table pero recorriendo el árbol de lxml directamente,
+    # sin construir el de BeautifulSoup: la tabla de clasificación es lo único que se lee.
+    try:
+        document = lxml.html.fromstring(html)
+    except Exception:
+        return []
+    for table in document.iter('table'):
+        table_rows = iter(table.iter('tr'))
+        header_row = next(table_rows, None)
+        if header_row is None:
+            continue
+        headers = [_normalize_header_text(''.join(_LXML_CELL_TEXT(cell))) for cell in header_row.iter('th', 'td')]
+        if not headers or not any('equipo' in h or 'team' in h for h in headers):
+            continue
+        rows = []
+        for row in table_rows:
+            record = {}
+            for idx, cell in enumerate(row.iter('td', 'th')):
+                if idx >= len(headers):
+                    break
+                key = headers[idx]
+                if key:
+                    record[key] = ''.join(text.strip() for text in _LXML_CELL_TEXT(cell))
+            if record:
+                rows.append(record)
+        if rows:
+            return rows
+    return []
 
 
 def _parse_html_table(soup):
@@ -426,73 +540,112 @@ def _parse_html_table(soup):
 
 
 def _find_download_link(soup):
-    for link in soup.find_all('a', href=True):
-        text = link.get_text(' ', strip=True)
-        href = link['href']
-        if DOWNLOAD_TEXT_PATTERN.search(text) or any(href.lower().endswith(ext) for ext in DOWNLOAD_EXTENSIONS):
-            return href
-    return None
+    # Primero un enlace directo a fichero; si no hay, el primero cuyo texto diga "descarga".
+    link = soup.select_one(DOWNLOAD_LINK_SELECTOR)
+    if link is None:
+        link = soup.find(_is_download_text_link)
+    return link['href'] if link is not None else None
+
+
+def _is_download_text_link(tag):
+    return tag.name == 'a' and tag.has_attr('href') and bool(DOWNLOAD_TEXT_PATTERN.search(tag.get_text(' ', strip=True)))
+
+
+def _prepare_ocr_image(content):
+    image = Image.open(BytesIO(content)).convert('L')
+    if image.width > OCR_MAX_WIDTH:
+        image.thumbnail((OCR_MAX_WIDTH, OCR_MAX_WIDTH * image.height // image.width), Image.Resampling.LANCZOS)
+    image = ImageOps.autocontrast(image)
+    threshold = _otsu_threshold(image.histogram())
+    return image.point(lambda value: 255 if value > threshold else 0, mode='1')
+
+
+def _otsu_threshold(histogram):
+    total = sum(histogram)
+    if not total:
+        return 127
+    sum_total = sum(level * count for level, count in enumerate(histogram))
+    sum_background = 0
+    weight_background = 0
+    best_threshold, best_variance = 127, -1.0
+    for level, count in enumerate(histogram):
+        weight_background += count
+        if not weight_background:
+            continue
+        weight_foreground = total - weight_background
+        if not weight_foreground:
+            break
+        sum_background += level * count
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_total - sum_background) / weight_foreground
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_threshold, best_variance = level, variance
+    return best_threshold
 
 
 def _parse_png_rows(content):
-    text = pytesseract.image_to_string(Image.open(BytesIO(content)), lang='spa')
-    rows = []
-    pattern = re.compile(
-        r'^\s*(\d+)\s+(.+?)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+([+-]?\d+)',
-        re.UNICODE,
-    )
-    for line in text.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        match = pattern.match(line)
-        if not match:
-            continue
-        position, team, points, played, wins, draws, losses, gf, gc, dg = match.groups()
-        rows.append(
-            {
-                'position': position,
-                'team': team,
-                'points': points,
-                'played': played,
-                'wins': wins,
-                'draws': draws,
-                'losses': losses,
-                'goals_for': gf,
-                'goals_against': gc,
-                'goal_difference': dg,
-            }
+    text = pytesseract.image_to_string(_prepare_ocr_image(content), lang='spa', config=OCR_TESSERACT_CONFIG)
+    return [
+        {
+            'position': position,
+            'team': team,
+            'points': points,
+            'played': played,
+            'wins': wins,
+            'draws': draws,
+            'losses': losses,
+            'goals_for': gf,
+            'goals_against': gc,
+            'goal_difference': dg,
+        }
+        for position, team, points, played, wins, draws, losses, gf, gc, dg in (
+            match.groups() for match in OCR_STANDING_LINE_PATTERN.finditer(text)
         )
-    return rows
+    ]
+
+
+def _read_limited_content(response, max_bytes):
+    buffer = BytesIO()
+    for chunk in response.iter_content(OFFICIAL_DOWNLOAD_CHUNK_SIZE):
+        if buffer.tell() + len(chunk) > max_bytes:
+            raise ValueError(f'El fichero descargado supera el límite de {max_bytes // (1024 * 1024)} MB.')
+        buffer.write(chunk)
+    return buffer.getvalue()
 
 
 def fetch_official_rows(url):
     url = _validate_external_fetch_url(url)
     # SSRF: safe_external_get valida el destino en cada redirect (no delega redirects a requests).
-    response = safe_external_get(url, headers={'User-Agent': USER_AGENT}, timeout=15)
+    session = _get_official_session()
+    response = safe_external_get(url, timeout=OFFICIAL_FETCH_TIMEOUT, session=session)
     response.raise_for_status()
-    soup = BeautifulSoup(response.text, 'html.parser')
-    download_href = _find_download_link(soup)
+    html = response.text
+    download_href = _find_download_link(BeautifulSoup(html, HTML_PARSER, parse_only=LINK_STRAINER))
     if download_href:
         file_url = urljoin(url, download_href)
         file_url = _validate_external_fetch_url(file_url)
-        file_response = safe_external_get(file_url, headers={'User-Agent': USER_AGENT}, timeout=15)
-        file_response.raise_for_status()
+        file_response = safe_external_get(file_url, timeout=OFFICIAL_FETCH_TIMEOUT, session=session, stream=True)
+        with file_response:
+            file_response.raise_for_status()
+            content = _read_limited_content(file_response, OFFICIAL_DOWNLOAD_MAX_BYTES)
         ext = urlparse(file_url).path.lower()
         if ext.endswith('.csv'):
-            rows = _parse_csv_rows(file_response.content)
+            rows = _parse_csv_rows(content)
             if rows:
                 return rows, f'Descarga CSV desde {file_url}'
         elif ext.endswith(('.xls', '.xlsx')):
-            rows = _parse_excel_rows(file_response.content)
+            rows = _parse_excel_rows(content)
             if rows:
                 return rows, f'Descarga Excel desde {file_url}'
         elif ext.endswith('.png'):
-            rows = _parse_png_rows(file_response.content)
+            rows = _parse_png_rows(content)
             if rows:
                 return rows, f'Descarga PNG desde {file_url}'
     # fallback: parse classification table directly if download link missing
-    html_rows = _parse_html_table(soup)
+    html_rows = _parse_html_table_lxml(html) if lxml is not None and html else []
+    if not html_rows:
+        html_rows = _parse_html_table(BeautifulSoup(html, HTML_PARSER, parse_only=TABLE_STRAINER))
     if html_rows:
         return html_rows, 'Clasificación extraída desde la tabla HTML'
     return None, None
@@ -508,12 +661,29 @@ def _int_or(value, default=0):
 def _parse_int(value):
     if value is None:
         return None
+    # openpyxl ya entrega int/float: sin pasar por str ni float en el caso habitual.
+    value_type = type(value)
+    if value_type is int:
+        return value
     try:
-        return int(float(str(value).strip()))
+        if value_type is float:
+            return int(value)
+        text = str(value).strip()
+        try:
+            return int(text)
+        except ValueError:
+            return int(float(text))
     except (TypeError, ValueError):
         return None
 
 
+@lru_cache(maxsize=4096)
+def _slugify_cached(value: str) -> str:
+    # slugify normaliza Unicode y aplica dos regex: los mismos nombres se repiten en cada importación.
+    return slugify(value)
+
+
+@lru_cache(maxsize=4096)
 def normalize_player_name(value: str) -> str:
     return slugify(value or '')
 
@@ -521,17 +691,19 @@ def normalize_player_name(value: str) -> str:
 def _normalize_table_header(value: str) -> str:
     if not value:
         return ''
-    return re.sub(r'[^a-z0-9]+', '', value.lower())
+    return NON_ALNUM_PATTERN.sub('', value.lower())
 
 
 def _parse_int_cell(value):
     if value is None:
         return 0
-    text = str(value).strip().replace('.', '').replace(',', '')
+    if type(value) is int:
+        return value
+    text = str(value).strip().translate(INT_CELL_SEPARATORS)
     if not text or text == '-':
         return 0
     try:
-        return int(float(text))
+        return int(text) if text.isdigit() else int(float(text))
     except (TypeError, ValueError):
         return 0
 
@@ -557,10 +729,22 @@ def _safe_cell(cells, idx):
     return cells[idx]
 
 
+PREFERENTE_ROSTER_STAT_COLUMNS = (
+    ('age', 'edad'),
+    ('pc', 'pc'),
+    ('pj', 'pj'),
+    ('pt', 'pt'),
+    ('minutes', 'min'),
+    ('goals', 'goles'),
+    ('yellow_cards', 'ta'),
+    ('red_cards', 'tr'),
+)
+
+
 def parse_preferente_roster(html: str) -> list[dict]:
     if not html:
         return []
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = BeautifulSoup(html, HTML_PARSER)
     tables = []
     direct = soup.find('table', id='tablePlantilla')
     if direct is not None:
@@ -584,42 +768,24 @@ def parse_preferente_roster(html: str) -> list[dict]:
             continue
         headers = [_normalize_table_header(cell.get_text(' ', strip=True)) for cell in header_row.find_all(['th', 'td'])]
         index = {key: idx for idx, key in enumerate(headers) if key}
+        # Columnas resueltas una vez por tabla, no en cada fila.
+        name_idx = index.get('jugador', 0)
+        pos_idx = index.get('demarcacion', 1)
+        stat_columns = [(field, index.get(header)) for field, header in PREFERENTE_ROSTER_STAT_COLUMNS]
         for row in table.find_all('tr')[1:]:
-            cells = row.find_all('td')
+            cells = row.find_all('td', recursive=False)
             if len(cells) < 6:
                 continue
-            name_idx = index.get('jugador', 0)
-            pos_idx = index.get('demarcacion', 1)
-            name_cell = _safe_cell(cells, name_idx) or (cells[0] if cells else None)
-            position_cell = _safe_cell(cells, pos_idx) or (cells[1] if len(cells) > 1 else None)
-            if not name_cell:
-                continue
+            name_cell = _safe_cell(cells, name_idx) or cells[0]
             name = _extract_name_cell(name_cell)
             if not name:
                 continue
-            position = position_cell.get_text(' ', strip=True) if position_cell else ''
-            age_cell = _safe_cell(cells, index.get('edad'))
-            pc_cell = _safe_cell(cells, index.get('pc'))
-            pj_cell = _safe_cell(cells, index.get('pj'))
-            pt_cell = _safe_cell(cells, index.get('pt'))
-            min_cell = _safe_cell(cells, index.get('min'))
-            goals_cell = _safe_cell(cells, index.get('goles'))
-            ta_cell = _safe_cell(cells, index.get('ta'))
-            tr_cell = _safe_cell(cells, index.get('tr'))
-            roster.append(
-                {
-                    'name': name,
-                    'position': position,
-                    'age': _parse_int_cell(age_cell.get_text(' ', strip=True) if age_cell else None),
-                    'pc': _parse_int_cell(pc_cell.get_text(' ', strip=True) if pc_cell else None),
-                    'pj': _parse_int_cell(pj_cell.get_text(' ', strip=True) if pj_cell else None),
-                    'pt': _parse_int_cell(pt_cell.get_text(' ', strip=True) if pt_cell else None),
-                    'minutes': _parse_int_cell(min_cell.get_text(' ', strip=True) if min_cell else None),
-                    'goals': _parse_int_cell(goals_cell.get_text(' ', strip=True) if goals_cell else None),
-                    'yellow_cards': _parse_int_cell(ta_cell.get_text(' ', strip=True) if ta_cell else None),
-                    'red_cards': _parse_int_cell(tr_cell.get_text(' ', strip=True) if tr_cell else None),
-                }
-            )
+            position_cell = _safe_cell(cells, pos_idx) or cells[1]
+            entry = {'name': name, 'position': position_cell.get_text(' ', strip=True)}
+            for field, idx in stat_columns:
+                cell = _safe_cell(cells, idx)
+                entry[field] = _parse_int_cell(cell.get_text(' ', strip=True) if cell else None)
+            roster.append(entry)
     return roster
 
 
@@ -721,6 +887,53 @@ def fetch_preferente_team_roster(team_url: str) -> list[dict]:
     return roster
 
 
+PREFERENTE_ROSTER_CACHE_SECONDS = 300
+PREFERENTE_ROSTER_CACHE_MAX = 64
+_PREFERENTE_ROSTER_CACHE = {}
+
+
+def fetch_preferente_team_roster_cached(team_url: str) -> list[dict]:
+    """fetch_preferente_team_roster reutilizando la descarga unos minutos por URL.
+
+    El staff suele relanzar el análisis del mismo rival varias veces seguidas y cada descarga
+    son segundos de red (y papeletas para un 403). Solo se guardan plantillas no vacías.
+    """
+    if not team_url:
+        return []
+    now = time.monotonic()
+    cached = _PREFERENTE_ROSTER_CACHE.get(team_url)
+    if cached and now - cached[0] < PREFERENTE_ROSTER_CACHE_SECONDS:
+        return copy.deepcopy(cached[1])
+    roster = fetch_preferente_team_roster(team_url)
+    if roster:
+        if len(_PREFERENTE_ROSTER_CACHE) >= PREFERENTE_ROSTER_CACHE_MAX:
+            oldest_url = min(_PREFERENTE_ROSTER_CACHE, key=lambda url: _PREFERENTE_ROSTER_CACHE[url][0])
+            _PREFERENTE_ROSTER_CACHE.pop(oldest_url, None)
+        _PREFERENTE_ROSTER_CACHE[team_url] = (now, copy.deepcopy(roster))
+    return roster
+
+
+def fetch_preferente_team_rosters(urls: list[str], max_workers: int = PREFERENTE_FETCH_WORKERS) -> dict:
+    """Descarga varias plantillas a la vez: {url: plantilla o la excepción que lanzó}.
+
+    Cada plantilla es casi todo espera de red, así que se solapan en hilos sobre la misma sesión.
+    Pocos hilos a propósito: LaPreferente responde 403 si se le aprieta. Los fallos se devuelven
+    en vez de lanzarse para que el llamante los anote equipo a equipo, como hacía en serie.
+    """
+    unique_urls = list(dict.fromkeys(url for url in urls if url))
+    if not unique_urls:
+        return {}
+
+    def _fetch(url):
+        try:
+            return url, fetch_preferente_team_roster(url)
+        except Exception as exc:
+            return url, exc
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_urls)))) as executor:
+        return dict(executor.map(_fetch, unique_urls))
+
+
 def find_preferente_team_url(team_name: str) -> str:
     """
     Intenta localizar la URL del equipo en LaPreferente a partir del nombre (búsqueda).
@@ -809,7 +1022,7 @@ def find_preferente_team_url(team_name: str) -> str:
         return out
 
     def _norm(text: str) -> str:
-        return re.sub(r'[^a-z0-9]+', '', normalize_player_name(text or ''))
+        return NON_ALNUM_PATTERN.sub('', normalize_player_name(text or ''))
 
     def _try_json_search(search_text: str) -> str:
         local_target = _norm(search_text)
@@ -873,7 +1086,7 @@ def find_preferente_team_url(team_name: str) -> str:
         return score
 
     def _extract_candidates(html: str) -> list[str]:
-        soup = BeautifulSoup(html or '', 'html.parser')
+        soup = BeautifulSoup(html or '', HTML_PARSER)
         candidates = []
         for a in soup.find_all('a', href=True):
             href = str(a.get('href') or '').strip()
@@ -947,16 +1160,21 @@ def infer_roster_role(position: str) -> str:
     return 'MID'
 
 
+def _probable_eleven_rank(player: dict) -> tuple:
+    return (player.get('minutes', 0), player.get('pt', 0), player.get('pj', 0))
+
+
 def compute_probable_eleven(players: list[dict]) -> list[dict]:
     if not players:
         return []
     eligible = [p for p in players if p.get('minutes', 0) > 0]
-    eligible.sort(key=lambda p: (p.get('minutes', 0), p.get('pt', 0), p.get('pj', 0)), reverse=True)
     gks = [p for p in eligible if infer_roster_role(p.get('position') or '') == 'GK']
     lineup = []
     if gks:
-        lineup.append(gks[0])
-    for player in eligible:
+        lineup.append(max(gks, key=_probable_eleven_rank))
+    # Filas iguales campo a campo cuentan como el mismo jugador (`in` compara los dicts); la
+    # alineación tiene como mucho 11 entradas, así que la comprobación es barata.
+    for player in _ranked_for_probable_eleven(eligible):
         if player in lineup:
             continue
         lineup.append(player)
@@ -965,6 +1183,14 @@ def compute_probable_eleven(players: list[dict]) -> list[dict]:
     return lineup[:11]
 
 
+def _ranked_for_probable_eleven(eligible: list[dict]):
+    # Con el portero fijado bastan los 11 mejores por minutos (uno puede ser ese portero). Solo si
+    # se descartan filas repetidas hace falta seguir, en el mismo orden que la ordenación completa.
+    yield from heapq.nlargest(11, eligible, key=_probable_eleven_rank)
+    if len(eligible) > 11:
+        yield from sorted(eligible, key=_probable_eleven_rank, reverse=True)[11:]
+
+
 def build_rival_insights(players: list[dict]) -> dict:
     if not players:
         return {'top_scorers': [], 'most_minutes': [], 'most_cards': [], 'role_breakdown': {'GK': 0, 'DEF': 0, 'MID': 0, 'ATT': 0}}
@@ -990,21 +1216,22 @@ def build_rival_insights(players: list[dict]) -> dict:
     if not scorer_pool:
         scorer_pool = normalized_players
 
-    top_scorers = sorted(
+    # Solo interesan los 3 primeros de cada ranking: nlargest evita ordenar la plantilla entera.
+    top_scorers = heapq.nlargest(
+        3,
         scorer_pool,
         key=lambda p: (
             p.get('goals', 0),
             (p.get('goals', 0) / max(1, p.get('pj', 0))),
             p.get('minutes', 0),
         ),
-        reverse=True,
-    )[:3]
-    most_minutes = sorted(normalized_players, key=lambda p: p.get('minutes', 0), reverse=True)[:3]
-    most_cards = sorted(
+    )
+    most_minutes = heapq.nlargest(3, normalized_players, key=lambda p: p.get('minutes', 0))
+    most_cards = heapq.nlargest(
+        3,
         normalized_players,
         key=lambda p: (p.get('red_cards', 0) * 2 + p.get('yellow_cards', 0)),
-        reverse=True,
-    )[:3]
+    )
     for row in top_scorers + most_minutes + most_cards:
         row.pop('_role', None)
     return {
@@ -1327,13 +1554,14 @@ def load_player_roster_stats() -> dict:
             html = PLAYER_ROSTER_PATH.read_text(encoding='latin-1', errors='ignore')
         except Exception:
             return {}
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=ROSTER_TABLE_STRAINER)
     table = soup.find('table', id='tablePlantilla')
     if not table:
         return {}
     roster = {}
     for row in table.find_all('tr'):
-        cells = row.find_all('td')
+        # Solo las celdas hijas de la fila: no se desciende por enlaces/escudos de cada celda.
+        cells = row.find_all('td', recursive=False)
         if len(cells) < 11:
             continue
         name_cell = cells[2]
@@ -1363,6 +1591,8 @@ def load_player_roster_stats() -> dict:
 
 _ROSTER_CACHE = None
 _ROSTER_CACHE_MTIME = None
+# Índice auxiliar de la plantilla cacheada: primer nombre -> ficha que devuelve el barrido por subcadena.
+_ROSTER_FIRST_NAME_INDEX = {}
 
 
 def refresh_primary_roster_cache(primary_team, force: bool = False):
@@ -1399,7 +1629,7 @@ def refresh_primary_roster_cache(primary_team, force: bool = False):
 
 
 def get_roster_stats_cache() -> dict:
-    global _ROSTER_CACHE, _ROSTER_CACHE_MTIME
+    global _ROSTER_CACHE, _ROSTER_CACHE_MTIME, _ROSTER_FIRST_NAME_INDEX
     try:
         current_mtime = PLAYER_ROSTER_PATH.stat().st_mtime if PLAYER_ROSTER_PATH.exists() else None
     except OSError:
@@ -1407,9 +1637,31 @@ def get_roster_stats_cache() -> dict:
     if _ROSTER_CACHE is None or _ROSTER_CACHE_MTIME != current_mtime:
         _ROSTER_CACHE = load_player_roster_stats()
         _ROSTER_CACHE_MTIME = current_mtime
+        _ROSTER_FIRST_NAME_INDEX = _build_first_name_index(_ROSTER_CACHE)
     return _ROSTER_CACHE
 
 
+def _build_first_name_index(roster: dict) -> dict:
+    # Solo se indexa un primer nombre cuando su ficha es la que devolvería el barrido por
+    # subcadena de find_roster_entry: ninguna ficha anterior lo contiene ("José Manuel ..."
+    # antes que "Manuel ...") ni está contenida en él. Si no, se deja al barrido.
+    index = {}
+    previous_names = []
+    for entry in roster.values():
+        if not isinstance(entry, dict):
+            continue
+        entry_name = str(entry.get('name') or '').lower()
+        if not entry_name:
+            continue
+        tokens = entry_name.split()
+        if tokens:
+            first = tokens[0]
+            if not any(first in name or name in first for name in previous_names):
+                index[first] = entry
+        previous_names.append(entry_name)
+    return index
+
+
 ALIAS_MAP = {
     'antonio': 'antonio-gamez-paniagua',
     'andrew': 'andrew-brayce-gonzales-ticona',
@@ -1449,6 +1701,11 @@ def find_roster_entry(player_name: str, roster: dict) -> Optional[dict]:
     target = player_name.lower().strip()
     if not target:
         return None
+    if roster is _ROSTER_CACHE and ' ' not in target:
+        # Caso habitual en las hojas de acciones: solo el nombre de pila, sin barrer la plantilla.
+        entry = _ROSTER_FIRST_NAME_INDEX.get(target)
+        if entry is not None:
+            return entry
     for entry in roster.values():
         if not isinstance(entry, dict):
             continue
@@ -1460,48 +1717,52 @@ def find_roster_entry(player_name: str, roster: dict) -> Optional[dict]:
     return None
 
 
+# (mtime, acciones, resultados) de FICHA_PARTIDO.xlsx: como la plantilla, se relee al cambiar el fichero.
 _MATCH_LIST_CACHE = None
-_MATCH_RESULT_CACHE = None
 
 
 def _read_match_list_sheet():
-    global _MATCH_LIST_CACHE, _MATCH_RESULT_CACHE
-    if _MATCH_LIST_CACHE is not None and _MATCH_RESULT_CACHE is not None:
-        return _MATCH_LIST_CACHE, _MATCH_RESULT_CACHE
+    global _MATCH_LIST_CACHE
+    try:
+        current_mtime = MATCH_LISTS_PATH.stat().st_mtime if MATCH_LISTS_PATH.exists() else None
+    except OSError:
+        current_mtime = None
+    if _MATCH_LIST_CACHE is not None and _MATCH_LIST_CACHE[0] == current_mtime:
+        return _MATCH_LIST_CACHE[1], _MATCH_LIST_CACHE[2]
     actions = []
     results = []
     seen_actions = set()
     seen_results = set()
-    if not MATCH_LISTS_PATH.exists():
-        _MATCH_LIST_CACHE = actions
-        _MATCH_RESULT_CACHE = results
+    if current_mtime is None:
+        _MATCH_LIST_CACHE = (current_mtime, actions, results)
         return actions, results
     try:
         workbook = load_workbook(filename=MATCH_LISTS_PATH, read_only=True, data_only=True)
-        if 'LISTAS' in workbook.sheetnames:
-            sheet = workbook['LISTAS']
-            for row in sheet.iter_rows(values_only=True):
-                if not row:
-                    continue
-                action_label = (row[0] or '').strip()
-                result_label = (row[1] or '').strip()
-                if action_label:
-                    key = action_label.upper()
-                    if key not in seen_actions:
-                        seen_actions.add(key)
-                        actions.append(action_label)
-                if result_label:
-                    key = result_label.upper()
-                    if key not in seen_results:
-                        seen_results.add(key)
-                        results.append(result_label)
+        try:
+            if 'LISTAS' in workbook.sheetnames:
+                sheet = workbook['LISTAS']
+                for row in sheet.iter_rows(values_only=True):
+                    if not row:
+                        continue
+                    action_label = (row[0] or '').strip()
+                    result_label = (row[1] or '').strip()
+                    if action_label:
+                        key = action_label.upper()
+                        if key not in seen_actions:
+                            seen_actions.add(key)
+                            actions.append(action_label)
+                    if result_label:
+                        key = result_label.upper()
+                        if key not in seen_results:
+                            seen_results.add(key)
+                            results.append(result_label)
+        finally:
+            workbook.close()
     except Exception:
         pass
-    _MATCH_LIST_CACHE = actions
-    _MATCH_RESULT_CACHE = results
+    _MATCH_LIST_CACHE = (current_mtime, actions, results)
     return actions, results
 
-
 DEFAULT_QUICK_ACTIONS = [
     'Disparo',
     'Pase',
@@ -16,7 +16,7 @@ from . import task_choices, workspace_context
 from .team_media_services import resolve_team_crest_url, team_fallback_crest_data_uri, team_pdf_palette
 from .drills import drill_cards, normalize_drill_ids
 from . import pdf_services, session_access_services
-from .models import SessionTask, Team, TrainingSession, TrainingSessionAttendance
+from .models import SessionTask, TrainingSession, TrainingSessionAttendance
 from .preview_render import render_task_preview_png
 from .services import _parse_int
 from .session_plan_fields import parse_session_plan_fields, serialize_session_plan_fields
@@ -659,7 +659,7 @@ def build_session_pdf_context(request, team, session, pdf_style='uefa'):
         if hasattr(request.user, 'get_full_name') and request.user.get_full_name().strip()
         else getattr(request.user, 'username', '') or 'Entrenador'
     )
-    primary_club_team = team or _get_primary_team_for_request(request) or Team.objects.filter(is_primary=True).first()
+    primary_club_team = team or _get_primary_team_for_request(request) or workspace_context.primary_club_team(request)
     club_logo_url = resolve_team_crest_url(request, primary_club_team, sync=True) if primary_club_team else ''
     # Para PDF "club" preferimos un escudo embebido (data URL) para evitar fallos de fetch/red en WeasyPrint.
     def _small_png_data_url(raw_bytes: bytes, *, max_side: int = 220) -> str:
@@ -40,18 +40,22 @@ def latest_standings_group_for_team(primary_team):
 
 def serialize_standings(group):
     standings = TeamStanding.objects.filter(group=group)
-    current_meta = standings.aggregate(total=Count('id'), latest=Max('last_updated'))
-
-    sibling_group = (
+    # Los grupos hermanos (misma temporada y nombre) incluyen el propio: una sola agregación
+    # da el resumen del grupo actual y el mejor candidato.
+    group_metas = list(
         TeamStanding.objects.filter(
-            group__season=group.season,
+            group__season_id=group.season_id,
             group__name__iexact=group.name,
         )
         .values('group_id')
         .annotate(total=Count('id'), latest=Max('last_updated'))
         .order_by('-latest', '-total')
-        .first()
     )
+    current_meta = next(
+        (meta for meta in group_metas if meta['group_id'] == group.id),
+        {'total': 0, 'latest': None},
+    )
+    sibling_group = group_metas[0] if group_metas else None
     if sibling_group:
         sibling_is_better = (
             current_meta['total'] == 0
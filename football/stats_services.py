@@ -29,6 +29,21 @@ TEAM_METRICS_CACHE_SECONDS = int(os.getenv('TEAM_METRICS_CACHE_SECONDS', '900'))
 STATS_SOURCE_MANUAL_MARK = '__manual__'   # cuenta cualquier evento manual (manual-bulk/admin-manual)
 STATS_SOURCE_NONE_MARK = '__none__'       # no cuenta ningún evento (solo resultado / sin datos)
 
+# Columnas que leen la fuente única, la firma de duplicados y los contadores de métricas.
+# Con el partido solo se usa match_id: no hace falta el JOIN ni el JSON raw_data.
+STATS_EVENT_FIELDS = (
+    'id',
+    'match',
+    'player',
+    'minute',
+    'event_type',
+    'result',
+    'zone',
+    'tercio',
+    'observation',
+    'source_file',
+)
+
 
 def preferred_event_source_by_match(primary_team, scope=None):
     """
@@ -204,21 +219,14 @@ def _apply_match_scope(qs, scope_value):
     return qs.filter(match__context=scope_value)
 
 
-def compute_team_metrics(primary_team, scope=Match.CONTEXT_LEAGUE, request=None):
-    if not primary_team:
-        return {'total_events': 0, 'top_event_types': [], 'top_results': []}
-    scope_value = _normalize_stats_scope(scope)
-    date_start, date_end, _season_id = _active_club_season_bounds_and_id(request)
-    cache_key = team_metrics_cache_key_scoped(primary_team.id, scope_value, season_id=_season_id)
-    if not date_start and not date_end:
-        cached = cache.get(cache_key)
-        if isinstance(cached, dict) and cached:
-            return cached
+def _team_stats_events(primary_team, scope_value, date_start=None, date_end=None):
+    """Eventos del equipo que cuentan para las métricas (fuente única por partido, sin duplicados)."""
     preferred_sources = preferred_event_source_by_match(primary_team, scope=scope_value)
     events_qs = (
         confirmed_events_queryset()
         .filter(player__team=primary_team)
-        .select_related('match')
+        .select_related('player')
+        .only(*STATS_EVENT_FIELDS, 'player__id', 'player__name')
         .order_by('match_id', 'minute', 'id')
     )
     events_qs = _apply_match_scope(events_qs, scope_value)
@@ -226,12 +234,49 @@ def compute_team_metrics(primary_team, scope=Match.CONTEXT_LEAGUE, request=None)
         events_qs = events_qs.filter(match__date__gte=date_start)
     if date_end:
         events_qs = events_qs.filter(match__date__lte=date_end)
-    events = filter_stats_events(events_qs, preferred_sources=preferred_sources)
-    payload = {
+    return filter_stats_events(events_qs, preferred_sources=preferred_sources)
+
+
+def _team_metrics_payload(events):
+    return {
         'total_events': len(events),
         'top_event_types': [{'event': etype, 'count': count} for etype, count in Counter(event.event_type for event in events).most_common(5)],
         'top_results': [{'result': result, 'count': count} for result, count in Counter(event.result for event in events).most_common(5)],
     }
+
+
+def _player_metrics_rows(events):
+    per_player = {}
+    for event in events:
+        player = event.player
+        if not player:
+            continue
+        item = per_player.setdefault(
+            player.id,
+            {
+                'player_id': player.id,
+                'player': player.name,
+                'actions': 0,
+                'successes': 0,
+            },
+        )
+        item['actions'] += 1
+        if result_is_success(event.result):
+            item['successes'] += 1
+    return sorted(per_player.values(), key=lambda item: (-item['actions'], item['player']))
+
+
+def compute_team_metrics(primary_team, scope=Match.CONTEXT_LEAGUE, request=None):
+    if not primary_team:
+        return {'total_events': 0, 'top_event_types': [], 'top_results': []}
+    scope_value = _normalize_stats_scope(scope)
+    date_start, date_end, _season_id = _active_club_season_bounds_and_id(request)
+    cache_key = team_metrics_cache_key_scoped(primary_team.id, scope_value, season_id=_season_id)
+    if not date_start and not date_end:
+        cached = cache.get(cache_key)
+        if isinstance(cached, dict) and cached:
+            return cached
+    payload = _team_metrics_payload(_team_stats_events(primary_team, scope_value, date_start, date_end))
     if not date_start and not date_end:
         cache.set(cache_key, payload, TEAM_METRICS_CACHE_SECONDS)
     return payload
@@ -244,7 +289,7 @@ def compute_team_metrics_for_match(match, primary_team=None):
         events_qs = events_qs.filter(player__team=primary_team)
         preferred_sources = preferred_event_source_by_match(primary_team)
     events = filter_stats_events(
-        events_qs.select_related('player', 'match').order_by('minute', 'id'),
+        events_qs.only(*STATS_EVENT_FIELDS).order_by('minute', 'id'),
         preferred_sources=preferred_sources,
     )
     return {
@@ -264,42 +309,45 @@ def compute_player_metrics(primary_team, scope=Match.CONTEXT_LEAGUE, request=Non
         cached = cache.get(cache_key)
         if isinstance(cached, list) and cached:
             return cached
-    preferred_sources = preferred_event_source_by_match(primary_team, scope=scope_value)
-    events_qs = (
-        confirmed_events_queryset()
-        .filter(player__team=primary_team)
-        .select_related('player', 'match')
-        .order_by('match_id', 'minute', 'id')
-    )
-    events_qs = _apply_match_scope(events_qs, scope_value)
-    if date_start:
-        events_qs = events_qs.filter(match__date__gte=date_start)
-    if date_end:
-        events_qs = events_qs.filter(match__date__lte=date_end)
-    events = filter_stats_events(events_qs, preferred_sources=preferred_sources)
-    per_player = {}
-    for event in events:
-        player = event.player
-        if not player:
-            continue
-        item = per_player.setdefault(
-            player.id,
-            {
-                'player_id': player.id,
-                'player': player.name,
-                'actions': 0,
-                'successes': 0,
-            },
-        )
-        item['actions'] += 1
-        if result_is_success(event.result):
-            item['successes'] += 1
-    result = sorted(per_player.values(), key=lambda item: (-item['actions'], item['player']))
+    result = _player_metrics_rows(_team_stats_events(primary_team, scope_value, date_start, date_end))
     if not date_start and not date_end:
         cache.set(cache_key, result, PLAYER_METRICS_CACHE_SECONDS)
     return result
 
 
+def compute_team_and_player_metrics(primary_team, scope=Match.CONTEXT_LEAGUE, request=None):
+    """Métricas de equipo y de jugadores de la portada con una sola carga de eventos.
+
+    Mismo resultado (y mismas claves de caché) que compute_team_metrics + compute_player_metrics,
+    pero la fuente preferida por partido y los eventos se consultan una vez para ambos."""
+    if not primary_team:
+        return {'total_events': 0, 'top_event_types': [], 'top_results': []}, []
+    scope_value = _normalize_stats_scope(scope)
+    date_start, date_end, _season_id = _active_club_season_bounds_and_id(request)
+    use_cache = not date_start and not date_end
+    team_key = team_metrics_cache_key_scoped(primary_team.id, scope_value, season_id=_season_id)
+    player_key = player_metrics_cache_key_scoped(primary_team.id, scope_value, season_id=_season_id)
+    team_metrics = player_metrics = None
+    if use_cache:
+        cached = cache.get_many([team_key, player_key])
+        if isinstance(cached.get(team_key), dict) and cached[team_key]:
+            team_metrics = cached[team_key]
+        if isinstance(cached.get(player_key), list) and cached[player_key]:
+            player_metrics = cached[player_key]
+    if team_metrics is not None and player_metrics is not None:
+        return team_metrics, player_metrics
+    events = _team_stats_events(primary_team, scope_value, date_start, date_end)
+    if team_metrics is None:
+        team_metrics = _team_metrics_payload(events)
+        if use_cache:
+            cache.set(team_key, team_metrics, TEAM_METRICS_CACHE_SECONDS)
+    if player_metrics is None:
+        player_metrics = _player_metrics_rows(events)
+        if use_cache:
+            cache.set(player_key, player_metrics, PLAYER_METRICS_CACHE_SECONDS)
+    return team_metrics, player_metrics
+
+
 def compute_player_cards_for_match(match, primary_team, source_file=None):
     events = confirmed_events_queryset().filter(match=match, player__team=primary_team)
     if source_file:
@@ -7689,7 +7689,7 @@ def _execute_create_convocation_action(question: str, *, workspace=None, page_co
                 goalkeeper = player
                 break
     with transaction.atomic():
-        ConvocationRecord.objects.filter(team=team, is_current=True).update(is_current=False)
+        ConvocationRecord.retire_current([team.id])
         record = ConvocationRecord.objects.filter(team=team, match=match).order_by("-id").first()
         created = record is None
         if created:
@@ -0,0 +1,84 @@
+import tempfile
+from datetime import date
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from openpyxl import Workbook
+
+from football.models import Match, MatchEvent, Player
+
+
+HEADERS = ['PartidoID', 'Rival', 'Jornada', 'Fecha', 'Campo', 'Jugador', 'Minuto', 'Evento', 'REsultadoAccion', 'Zona']
+
+
+def _write_workbook(path, rows):
+    workbook = Workbook()
+    workbook.active.title = 'PORTADA'
+    sheet = workbook.create_sheet('BD_EVENTOS')
+    sheet.append(HEADERS)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+
+class ImportBenagalbonExcelTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / 'eventos.xlsx'
+        _write_workbook(
+            self.path,
+            [
+                [1, 'Rival Uno', 'J1', date(2025, 9, 14), 'Campo Uno', 'Pepe', 12, 'Pase', 'OK', 'Centro'],
+                [1, 'Rival Uno', 'J1', date(2025, 9, 14), 'Campo Uno', 'Juan', 250, 'Tiro', 'Gol', 'Área'],
+                [None, None, None, None, None, None, None, None, None, None],
+                [2, 'Rival Dos', 'J2', '21/09/2025', 'Campo Dos', 'Pepe', '30', 'Duelo', 'KO', 'Banda'],
+            ],
+        )
+
+    def _run(self):
+        call_command('import_benagalbon_excel', files=[self.path], stdout=StringIO(), stderr=StringIO())
+
+    def test_imports_events_per_match(self):
+        self._run()
+
+        self.assertEqual(Match.objects.count(), 2)
+        self.assertEqual(MatchEvent.objects.count(), 3)
+        self.assertEqual(Player.objects.filter(name__in=['Pepe', 'Juan']).count(), 2)
+        second = Match.objects.get(round='J2')
+        self.assertEqual(second.date, date(2025, 9, 21))
+        shot = MatchEvent.objects.get(event_type='Tiro')
+        self.assertEqual(shot.minute, 200)
+        self.assertEqual(shot.player.name, 'Juan')
+        self.assertEqual(shot.source_file, 'eventos.xlsx')
+        self.assertEqual(shot.raw_data, {'partidoid': 1})
+
+    def test_reimport_replaces_previous_events(self):
+        self._run()
+        self._run()
+
+        self.assertEqual(Match.objects.count(), 2)
+        self.assertEqual(MatchEvent.objects.count(), 3)
+
+    def test_reimport_in_small_batches_keeps_every_event(self):
+        with patch('football.management.commands.import_benagalbon_excel.EVENT_BATCH_SIZE', 1):
+            self._run()
+            self._run()
+
+        self.assertEqual(MatchEvent.objects.count(), 3)
+        self.assertEqual(MatchEvent.objects.filter(match__round='J1').count(), 2)
+
+    def test_reimport_deletes_previous_events_in_one_statement(self):
+        self._run()
+        with patch('football.management.commands.import_benagalbon_excel.EVENT_BATCH_SIZE', 1):
+            with CaptureQueriesContext(connection) as ctx:
+                self._run()
+
+        deletes = [q for q in ctx.captured_queries if q['sql'].startswith('DELETE FROM "football_matchevent"')]
+        self.assertEqual(len(deletes), 1)
+        self.assertEqual(MatchEvent.objects.count(), 3)
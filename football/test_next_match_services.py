@@ -193,6 +193,35 @@ class NextMatchServicesTests(TestCase):
 
         self.assertIsNone(payload)
 
+    def test_load_cached_next_match_parses_file_once_until_it_changes(self):
+        def write(round_name):
+            cache_path.write_text(
+                json.dumps(
+                    {
+                        'round': round_name,
+                        'date': (timezone.localdate() + timedelta(days=3)).isoformat(),
+                        'opponent': {'name': 'Rival Next'},
+                        'status': 'next',
+                    }
+                ),
+                encoding='utf-8',
+            )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = Path(tmpdir) / 'next.json'
+            write('J1')
+            with patch('football.next_match_services.json.load', wraps=json.load) as load_mock:
+                first = next_match_services.load_cached_next_match(cache_path)
+                first['round'] = 'modificado'
+                second = next_match_services.load_cached_next_match(cache_path)
+                self.assertEqual(load_mock.call_count, 1)
+                self.assertEqual(second['round'], 'J1')
+
+                write('J10')
+                third = next_match_services.load_cached_next_match(cache_path)
+                self.assertEqual(load_mock.call_count, 2)
+                self.assertEqual(third['round'], 'J10')
+
     def test_load_preferred_next_match_payload_uses_provider_first(self):
         workspace = Workspace.objects.create(
             name='Cliente Preferred',
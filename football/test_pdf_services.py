@@ -1,7 +1,9 @@
+import tempfile
+from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
-from django.test import RequestFactory, SimpleTestCase
+from django.test import RequestFactory, SimpleTestCase, override_settings
 
 from football import healthchecks, pdf_services
 
@@ -56,6 +58,34 @@ class PdfServicesTests(SimpleTestCase):
         self.assertEqual(response['Content-Disposition'], 'inline; filename="demo.pdf"')
 
 
+class PdfUrlFetcherTests(SimpleTestCase):
+    def test_own_static_and_media_are_read_from_disk(self):
+        default_fetcher = MagicMock()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / 'crest.png').write_bytes(b'png-bytes')
+            with override_settings(MEDIA_ROOT=tmpdir, MEDIA_URL='/media/'):
+                with patch.object(pdf_services, 'weasyprint', SimpleNamespace(default_url_fetcher=default_fetcher)):
+                    media = pdf_services._safe_url_fetcher('https://testserver/media/crest.png', local_host='testserver')
+                    static = pdf_services._safe_url_fetcher(
+                        'https://testserver/static/football/images/2j-icon.png', local_host='testserver'
+                    )
+
+        self.assertEqual(media, {'string': b'png-bytes', 'mime_type': 'image/png'})
+        self.assertEqual(static['mime_type'], 'image/png')
+        self.assertTrue(static['string'])
+        default_fetcher.assert_not_called()
+
+    def test_other_hosts_and_paths_outside_media_use_default_fetcher(self):
+        default_fetcher = MagicMock(return_value={'string': b'remote', 'mime_type': 'image/png'})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with override_settings(MEDIA_ROOT=str(Path(tmpdir) / 'media'), MEDIA_URL='/media/'):
+                with patch.object(pdf_services, 'weasyprint', SimpleNamespace(default_url_fetcher=default_fetcher)):
+                    pdf_services._safe_url_fetcher('https://cdn.example.com/media/crest.png', local_host='testserver')
+                    pdf_services._safe_url_fetcher('https://testserver/media/../settings.py', local_host='testserver')
+
+        self.assertEqual(default_fetcher.call_count, 2)
+
+
 class HealthcheckPdfDependencyTests(SimpleTestCase):
     def test_weasyprint_status_reports_pydyf_incompatibility(self):
         with patch.object(healthchecks.pdf_services, 'weasyprint', SimpleNamespace()):
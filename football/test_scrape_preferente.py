@@ -0,0 +1,65 @@
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from football.models import Team, TeamStanding
+
+
+STANDINGS_HTML = """
+<html><body>
+<table><tr><td>Menú</td><td>Inicio</td></tr></table>
+<table>
+<tr><th>Pos</th><th>Equipo</th><th>PJ</th><th>PG</th><th>PE</th><th>PP</th><th>GF</th><th>GC</th><th>Pts</th></tr>
+<tr><td>1</td><td>CD Benagalbon</td><td>10</td><td>7</td><td>2</td><td>1</td><td>20</td><td>8</td><td>23</td></tr>
+<tr><td>2</td><td>Rival Scrape</td><td>10</td><td>6</td><td>1</td><td>3</td><td>15</td><td>11</td><td></td></tr>
+<tr><td>3</td></tr>
+</table>
+</body></html>
+"""
+
+
+def _fake_session(html):
+    response = MagicMock()
+    response.content = html.encode('utf-8')
+    response.text = html
+    response.raise_for_status.return_value = None
+    session = MagicMock()
+    session.get.return_value = response
+    return session
+
+
+class ScrapePreferenteCommandTests(TestCase):
+    def _run(self, html=STANDINGS_HTML):
+        session = _fake_session(html)
+        with patch('football.management.commands.scrape_preferente._get_session', return_value=session):
+            call_command('scrape_preferente', url='https://example.com/clasificacion', stdout=StringIO())
+        return session
+
+    def test_creates_standings_from_table(self):
+        self._run()
+
+        self.assertEqual(TeamStanding.objects.count(), 2)
+        leader = TeamStanding.objects.get(position=1)
+        self.assertEqual(leader.team.name, 'CD Benagalbon')
+        self.assertTrue(leader.team.is_primary)
+        self.assertEqual(leader.points, 23)
+        self.assertEqual(leader.goal_difference, 12)
+        second = TeamStanding.objects.get(position=2)
+        self.assertFalse(second.team.is_primary)
+        # Sin columna de puntos rellena: se deducen de victorias y empates.
+        self.assertEqual(second.points, 19)
+
+    def test_rerun_updates_existing_rows(self):
+        self._run()
+        self._run(STANDINGS_HTML.replace('<td>23</td>', '<td>26</td>'))
+
+        self.assertEqual(TeamStanding.objects.count(), 2)
+        self.assertEqual(Team.objects.filter(name='Rival Scrape').count(), 1)
+        self.assertEqual(TeamStanding.objects.get(position=1).points, 26)
+
+    def test_missing_table_raises(self):
+        with self.assertRaises(CommandError):
+            self._run('<html><body><p>Sin tabla</p></body></html>')
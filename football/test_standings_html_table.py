@@ -0,0 +1,28 @@
+from unittest import skipIf
+
+from bs4 import BeautifulSoup
+from django.test import SimpleTestCase
+
+from football.services import HTML_PARSER, TABLE_STRAINER, _parse_html_table, _parse_html_table_lxml, lxml
+
+
+HTML = '''<html><head><style>td { color: red; }</style></head><body>
+<table><tr><td>Menú</td></tr></table>
+<table>
+  <tr><th>Pos</th><th>Equipo<script>sort()</script></th><th>PJ</th><th>Pts</th></tr>
+  <tr><td> 1 </td><td><span>CD</span><script>var a=1</script><!-- fila --><b>Rincón</b></td><td>10</td><td>23</td></tr>
+  <tr><td>2</td><td>Atlético<style>.x{}</style> Benagalbón</td><td>10<template>t</template></td><td>19</td></tr>
+  <tr></tr>
+</table>
+</body></html>'''
+
+
+@skipIf(lxml is None, 'lxml no instalado')
+class ParseHtmlTableTests(SimpleTestCase):
+    def test_lxml_path_returns_same_rows_as_beautifulsoup(self):
+        expected = _parse_html_table(BeautifulSoup(HTML, HTML_PARSER, parse_only=TABLE_STRAINER))
+
+        self.assertEqual(_parse_html_table_lxml(HTML), expected)
+        self.assertEqual(expected[0]['equipo'], 'CDRincón')
+        self.assertEqual(expected[1]['equipo'], 'AtléticoBenagalbón')
+        self.assertEqual(len(expected), 2)
@@ -145,6 +145,22 @@ class StandingsServicesTests(TestCase):
             'serialize_standings escala el nº de queries con el nº de equipos (N+1)',
         )
 
+    def test_serialize_standings_prefers_fresher_sibling_group(self):
+        sibling = Group.objects.create(season=self.season, name='grupo standings', slug='grupo-standings-2')
+        TeamStanding.objects.create(
+            season=self.season,
+            group=self.group,
+            team=self.team,
+            position=1,
+            points=3,
+            last_updated=timezone.now() - timedelta(days=2),
+        )
+        TeamStanding.objects.create(season=self.season, group=sibling, team=self.rival, position=1, points=9)
+
+        rows = standings_services.serialize_standings(self.group)
+
+        self.assertEqual([(row['team'], row['points']) for row in rows], [('RIVAL STANDINGS', 9)])
+
     def test_universo_snapshot_support_requires_legacy_primary_match(self):
         snapshot = {'standings': [{'team': 'Equipo Standings'}]}
 
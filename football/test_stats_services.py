@@ -1,6 +1,8 @@
 from unittest.mock import patch
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from football import stats_services
 from football.dashboard_services import (
@@ -83,6 +85,23 @@ class ManualEventAggregationTests(TestCase):
         self.assertEqual(metrics[0]['actions'], 2)
         self.assertEqual(metrics[0]['successes'], 2)
 
+    def test_team_and_player_metrics_match_separate_helpers_with_one_event_load(self):
+        with patch('football.stats_services.filter_stats_events', wraps=stats_services.filter_stats_events) as filter_mock:
+            team_metrics, player_metrics = stats_services.compute_team_and_player_metrics(self.team)
+
+        self.assertEqual(filter_mock.call_count, 1)
+        self.assertEqual(team_metrics, stats_services.compute_team_metrics(self.team))
+        self.assertEqual(player_metrics, compute_player_metrics(self.team))
+
+    def test_player_metrics_read_events_without_extra_queries_per_row(self):
+        with CaptureQueriesContext(connection) as ctx:
+            compute_player_metrics(self.team)
+        event_loads = [q for q in ctx.captured_queries if q['sql'].startswith('SELECT "football_matchevent"."id"')]
+
+        self.assertEqual(len(event_loads), 1)
+        self.assertNotIn('raw_data', event_loads[0]['sql'])
+        self.assertNotIn('"football_match"."date"', event_loads[0]['sql'])
+
     def test_team_metrics_for_match_keep_manual_events_without_duplicate_sources(self):
         metrics = compute_team_metrics_for_match(self.match, primary_team=self.team)
 
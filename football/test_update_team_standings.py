@@ -0,0 +1,73 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from football.models import Team, TeamStanding
+from football.services import update_team_standings
+
+
+ROWS = [
+    {'position': '1', 'team': 'Rival Alfa', 'played': '10', 'wins': '7', 'draws': '2', 'losses': '1',
+     'goals_for': '20', 'goals_against': '8', 'goal_difference': '12', 'points': '23'},
+    {'position': '2', 'team': 'Rival Beta', 'pj': '10', 'pg': '6', 'pe': '1', 'pp': '3',
+     'gf': '15', 'gc': '11', 'dg': '4', 'pts': '19'},
+    {'equipo': 'Rival Gamma'},
+]
+
+
+class UpdateTeamStandingsTests(TestCase):
+    def _run(self, rows=ROWS):
+        update_team_standings(rows, 'Test', 'https://example.com', season_name='2025/2026', group_name='Grupo 2')
+
+    def test_creates_one_standing_per_row(self):
+        self._run()
+
+        self.assertEqual(TeamStanding.objects.count(), 3)
+        alfa = TeamStanding.objects.get(team__name='Rival Alfa')
+        self.assertEqual((alfa.position, alfa.points, alfa.goal_difference), (1, 23, 12))
+        beta = TeamStanding.objects.get(team__name='Rival Beta')
+        self.assertEqual((beta.played, beta.wins, beta.goals_against, beta.points), (10, 6, 11, 19))
+        gamma = TeamStanding.objects.get(team__name='Rival Gamma')
+        # Sin posición en la fila: se usa el orden de llegada.
+        self.assertEqual((gamma.position, gamma.points), (3, 0))
+        self.assertEqual(set(Team.objects.filter(name__startswith='Rival ').values_list('group_id', flat=True)), {alfa.group_id})
+
+    def test_rerun_updates_and_drops_teams_no_longer_listed(self):
+        self._run()
+        self._run([dict(ROWS[0], points='26'), ROWS[1]])
+
+        self.assertEqual(TeamStanding.objects.count(), 2)
+        self.assertEqual(TeamStanding.objects.get(team__name='Rival Alfa').points, 26)
+        self.assertFalse(TeamStanding.objects.filter(team__name='Rival Gamma').exists())
+
+    def test_rerun_query_count_does_not_grow_with_rows(self):
+        self._run()
+        with CaptureQueriesContext(connection) as ctx:
+            self._run()
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "football_teamstanding"')]
+        self.assertEqual(len(updates), 1)
+
+    def test_moves_existing_teams_to_group_in_one_update(self):
+        self._run()
+        Team.objects.filter(name__startswith='Rival ').update(group=None)
+        with CaptureQueriesContext(connection) as ctx:
+            self._run()
+        team_updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "football_team"')]
+        self.assertEqual(len(team_updates), 1)
+        self.assertFalse(Team.objects.filter(name__startswith='Rival ', group__isnull=True).exists())
+
+    def test_single_club_fallback_marks_one_primary_for_repeated_rows(self):
+        rows = [
+            {'position': '1', 'team': 'CD Benagalbón', 'points': '23'},
+            {'position': '2', 'team': 'Benagalbón B', 'points': '19'},
+        ]
+        with patch.dict('os.environ', {'ALLOW_SINGLE_CLUB_FALLBACK': '1'}):
+            self._run(rows)
+
+        # La segunda fila resuelve al principal que acaba de marcar la primera.
+        primary = Team.objects.get(is_primary=True)
+        self.assertEqual(TeamStanding.objects.count(), 1)
+        self.assertEqual(TeamStanding.objects.get().team_id, primary.id)
+        self.assertEqual(TeamStanding.objects.get().points, 19)
@@ -8,6 +8,7 @@ from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
 
+from football import workspace_context
 from football.models import AppUserRole, Competition, Group, Season, StaffMember, Team, UserInvitation, Workspace, WorkspaceMembership, WorkspaceSeason, WorkspaceTeam
 
 
@@ -70,6 +71,14 @@ class WorkspaceActiveSelectionTests(TestCase):
         mock_sync.assert_called_once()
         self.assertEqual(mock_sync.call_args.kwargs.get('primary_team'), team)
 
+    def test_primary_club_team_is_queried_once_per_request(self):
+        team = Team.objects.create(name='Equipo principal', slug='equipo-principal', is_primary=True)
+        request = SimpleNamespace()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(workspace_context.primary_club_team(request), team)
+            self.assertEqual(workspace_context.primary_club_team(request), team)
+
 
 class PlatformWorkspaceTeamDetailTests(TestCase):
     def test_team_detail_hides_google_urls_from_stadium_fields(self):
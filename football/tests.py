@@ -13,6 +13,7 @@ from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 import requests
+from openpyxl import Workbook
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -20,8 +21,10 @@ from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.management import call_command
+from django.db import connection
 from django.http import HttpResponse
 from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -30,13 +33,16 @@ from football import dashboard_services, local_llm, next_match_services, preview
 from football import views as football_views
 from football.bootstrap import ensure_bootstrap_admin_from_env
 from football.dashboard_services import SCRAPE_LOCK_KEY, compute_player_cards_for_match, compute_player_dashboard, compute_player_metrics, compute_team_metrics_for_match
+from football import event_taxonomy
 from football.event_taxonomy import (
     PASS_KEYWORDS,
     calculate_importance_score,
     calculate_influence_score,
     build_smart_kpis,
     classify_duel_event,
+    classify_substitution,
     contains_keyword,
+    is_assist_event,
     is_shot_attempt_event,
     is_shot_on_target_event,
     map_zone_label,
@@ -103,7 +109,7 @@ from football.query_helpers import (
     is_injury_record_active,
     is_manual_sanction_active,
 )
-from football.services import find_roster_entry
+from football.services import _build_first_name_index, find_roster_entry, load_match_results
 from football.session_plan_fields import parse_session_plan_fields, serialize_session_plan_fields
 from football.staff_briefing import build_weekly_staff_brief
 from football.stats_audit import run_stats_audit
@@ -139,6 +145,22 @@ class WriteEndpointAuthTests(TestCase):
         self.assertEqual(response.status_code, 429)
         cache.delete(SCRAPE_LOCK_KEY)
 
+    def test_repeated_refresh_reuses_recent_success(self):
+        self.user.is_staff = True
+        self.user.save(update_fields=['is_staff'])
+        self.client.force_login(self.user)
+        self.addCleanup(cache.clear)
+        with patch('football.views._refresh_rfaf_standings_inline', return_value=(True, 'Clasificación actualizada.', None)) as refresh_mock:
+            first = self.client.post(reverse('dashboard-refresh'))
+            second = self.client.post(reverse('dashboard-refresh'))
+
+        self.assertEqual(refresh_mock.call_count, 1)
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn('cached', first.json())
+        self.assertTrue(second.json()['cached'])
+        self.assertEqual(second.json()['message'], first.json()['message'])
+        self.assertIsNone(cache.get(SCRAPE_LOCK_KEY))
+
 
 class TeamMediaServicesTests(TestCase):
     def test_benagalbon_detection_does_not_use_primary_flag(self):
@@ -5101,6 +5123,21 @@ class PreferenteRosterJsonFallbackTests(SimpleTestCase):
             rows = football_services._fetch_preferente_team_roster_via_json('123')
             self.assertEqual(rows, [])
 
+    def test_cached_roster_fetch_reuses_recent_download(self):
+        from football import services as football_services
+
+        url = 'https://www.lapreferente.com/E1/equipo-cache.html'
+        self.addCleanup(football_services._PREFERENTE_ROSTER_CACHE.clear)
+        with patch.object(
+            football_services, 'fetch_preferente_team_roster', return_value=[{'name': 'Pepe', 'minutes': 90}]
+        ) as mocked_fetch:
+            first = football_services.fetch_preferente_team_roster_cached(url)
+            first[0]['name'] = 'modificado'
+            second = football_services.fetch_preferente_team_roster_cached(url)
+
+        mocked_fetch.assert_called_once_with(url)
+        self.assertEqual(second, [{'name': 'Pepe', 'minutes': 90}])
+
 
 class UniversoEnvNamingTests(SimpleTestCase):
     def test_universo_login_reads_universo_env_names(self):
@@ -9323,6 +9360,30 @@ class PlatformWorkspaceTests(TestCase):
         self.assertEqual(response.json()['team']['name'], self.alt_team.name)
         self.assertEqual(response.json()['team']['crest_url'], 'https://example.com/cliente-alternativo.png')
 
+    def test_dashboard_data_keeps_player_metrics_when_team_metrics_fail(self):
+        workspace = Workspace.objects.create(
+            name='Cliente métricas parciales',
+            slug='cliente-metricas-parciales',
+            kind=Workspace.KIND_CLUB,
+            primary_team=self.alt_team,
+        )
+        football_views._invalidate_team_dashboard_caches(self.alt_team)
+        self.client.force_login(self.admin_user)
+        session = self.client.session
+        session['active_workspace_id'] = workspace.id
+        session.save()
+        player_rows = [{'player_id': 99, 'name': 'Jugador Parcial', 'total_actions': 3}]
+
+        with patch.object(football_views, 'compute_team_and_player_metrics', side_effect=RuntimeError('boom')), \
+                patch.object(football_views, 'compute_team_metrics', side_effect=RuntimeError('boom')), \
+                patch.object(football_views, 'compute_player_metrics', return_value=player_rows):
+            response = self.client.get(reverse('dashboard-data'), {'full': 1, 'fresh': 1})
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload['team_metrics']['total_events'], 0)
+        self.assertEqual(payload['player_metrics'], player_rows)
+
     def test_dashboard_data_uses_active_club_season_for_home_metrics(self):
         workspace = Workspace.objects.create(
             name='Cliente temporada home',
@@ -10551,6 +10612,31 @@ class QueryHelperTests(TestCase):
 
         self.assertEqual(resolved.id, friendly.id)
 
+    def test_get_active_match_without_upcoming_takes_latest_of_same_day_matches(self):
+        self.match.date = date(2026, 1, 10)
+        self.match.save(update_fields=['date'])
+        played_on = date(2026, 2, 1)
+        matches = [
+            Match.objects.create(
+                season=self.team.group.season,
+                group=self.team.group,
+                home_team=self.team,
+                away_team=self.rival,
+                round=f"J{number}",
+                date=played_on,
+            )
+            for number in (5, 6)
+        ]
+
+        with patch('football.query_helpers.timezone.localdate', return_value=date(2026, 3, 1)):
+            resolved = get_active_match(self.team)
+        # Con los dos aún por jugar, el próximo sigue siendo el de menor id.
+        with patch('football.query_helpers.timezone.localdate', return_value=date(2026, 1, 20)):
+            upcoming = get_active_match(self.team)
+
+        self.assertEqual(resolved.id, matches[1].id)
+        self.assertEqual(upcoming.id, matches[0].id)
+
     def test_get_next_open_calendar_match_ignores_closed_matches(self):
         Match.objects.create(
             season=self.team.group.season,
@@ -11751,6 +11837,35 @@ class RosterLookupTests(TestCase):
             {'name': 'Jugador Uno', 'pj': 5},
         )
 
+    def test_first_name_lookup_keeps_substring_scan_precedence(self):
+        roster = {
+            'jose-manuel-ruiz': {'name': 'José Manuel Ruiz'},
+            'manuel-torres': {'name': 'Manuel Torres'},
+            'luis-gomez': {'name': 'Luis Gómez'},
+        }
+        with patch('football.services._ROSTER_CACHE', roster), patch(
+            'football.services._ROSTER_FIRST_NAME_INDEX', _build_first_name_index(roster)
+        ):
+            # Como el barrido: la primera ficha que contiene "manuel", no la que empieza por él.
+            self.assertIs(find_roster_entry('Manuel', roster), roster['jose-manuel-ruiz'])
+            self.assertIs(find_roster_entry('Luis', roster), roster['luis-gomez'])
+
+    def test_match_list_sheet_is_reloaded_when_workbook_changes(self):
+        def write(result_label, mtime):
+            workbook = Workbook()
+            workbook.active.title = 'LISTAS'
+            workbook.active.append(['Pase', result_label])
+            workbook.save(path)
+            os.utime(path, (mtime, mtime))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / 'FICHA_PARTIDO.xlsx'
+            with patch('football.services.MATCH_LISTS_PATH', path), patch('football.services._MATCH_LIST_CACHE', None):
+                write('Bloqueado', 1_700_000_000)
+                self.assertEqual(load_match_results()[0], 'Bloqueado')
+                write('Despejado', 1_700_000_100)
+                self.assertEqual(load_match_results()[0], 'Despejado')
+
 
 class PlayerDetailStatsFallbackTests(TestCase):
     def setUp(self):
@@ -12760,10 +12875,35 @@ class TaxonomyBehaviorTests(TestCase):
         self.assertTrue(contains_keyword('PASE A LA ESPALDA', PASS_KEYWORDS))
         self.assertTrue(contains_keyword('Cambio de orientación', PASS_KEYWORDS))
 
+    def test_keyword_patterns_match_every_keyword_of_their_set(self):
+        pairs = (
+            (event_taxonomy.GOAL_KEYWORDS, event_taxonomy._GOAL_RE),
+            (event_taxonomy.PASS_KEYWORDS, event_taxonomy._PASS_RE),
+            (event_taxonomy.DRIBBLE_KEYWORDS, event_taxonomy._DRIBBLE_RE),
+            (event_taxonomy.SUBSTITUTION_KEYWORDS, event_taxonomy._SUBSTITUTION_RE),
+            (event_taxonomy.DUEL_AERIAL_KEYWORDS, event_taxonomy._DUEL_AERIAL_RE),
+        )
+        for keywords, pattern in pairs:
+            for keyword in keywords:
+                with self.subTest(keyword=keyword):
+                    text = f'Acción {keyword}'
+                    self.assertTrue(event_taxonomy._has_keyword(event_taxonomy.normalize_label(text), pattern))
+                    self.assertTrue(contains_keyword(text, keywords))
+
     def test_goal_event_counts_as_shot_attempt_and_on_target(self):
         self.assertTrue(is_shot_attempt_event('Gol', result='Gol'))
         self.assertTrue(is_shot_on_target_event('Gol', result='Gol'))
 
+    def test_keywords_do_not_match_across_event_fields(self):
+        # "pase gol" es asistencia, pero no si "pase" y "gol" vienen de campos distintos.
+        self.assertFalse(is_assist_event('Pase', result='Gol'))
+        self.assertTrue(is_assist_event('Pase gol', result='OK'))
+
+    def test_substitution_direction_needs_a_substitution_event(self):
+        self.assertEqual(classify_substitution('Cambio', result='Entrada'), (True, False))
+        self.assertEqual(classify_substitution('Sustitución', zone='Salida'), (False, True))
+        self.assertEqual(classify_substitution('Pase', result='Entrada'), (False, False))
+
     def test_field_zone_aliases_map_mid_wide_and_interior_lanes(self):
         self.assertEqual(map_zone_label('MEDIO IZQUIERDA'), 'Medio Izquierda')
         self.assertEqual(map_zone_label('MEDIO DERECHA'), 'Medio Derecha')
@@ -13066,6 +13206,34 @@ class MatchActionWorkflowTests(TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertTrue(MatchEvent.objects.filter(id=final_event.id).exists())
 
+    def test_delete_endpoint_removes_pending_live_event_with_one_delete(self):
+        pending_event = MatchEvent.objects.create(
+            match=self.match,
+            player=self.player,
+            event_type='Pase',
+            result='OK',
+            minute=14,
+            period=1,
+            system='touch-field',
+            source_file='registro-acciones',
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                reverse('match-action-delete'),
+                {
+                    'match_id': self.match.id,
+                    'event_id': pending_event.id,
+                },
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(MatchEvent.objects.filter(id=pending_event.id).exists())
+        # Ni lectura previa de la fila ni borrado por instancia: un único DELETE filtrado.
+        event_queries = [q['sql'] for q in ctx.captured_queries if '"football_matchevent"' in q['sql']]
+        self.assertEqual(len(event_queries), 1)
+        self.assertTrue(event_queries[0].startswith('DELETE FROM "football_matchevent"'))
+
     def test_update_match_action_allows_fast_correction(self):
         create = self.client.post(
             reverse('match-action-record'),
@@ -17716,3 +17884,33 @@ class AiTrainerLibraryTests(TestCase):
         self.assertContains(response, 'id="global-guard-widget-shell"')
         self.assertContains(response, 'id="global-guard-widget-toggle"')
         self.assertContains(response, 'library_repo=ai_trainer')
+
+
+class GatherTeamFieldsTests(TestCase):
+    def setUp(self):
+        competition = Competition.objects.create(name='Liga Campos', slug='liga-campos')
+        self.season = Season.objects.create(competition=competition, name='2025/2026')
+        self.group = Group.objects.create(season=self.season, name='Grupo Campos', slug='grupo-campos')
+
+    def test_uses_latest_match_location_per_home_team_in_one_query(self):
+        home = Team.objects.create(name='Alfa Campos', slug='alfa-campos', group=self.group)
+        other = Team.objects.create(name='Beta Campos', slug='beta-campos', group=self.group)
+        with_stadium = Team.objects.create(
+            name='Gamma Campos', slug='gamma-campos', group=self.group, home_stadium='Estadio Gamma'
+        )
+        Match.objects.create(season=self.season, group=self.group, home_team=home, away_team=other, date=date(2025, 9, 1), location='Campo Viejo')
+        Match.objects.create(season=self.season, group=self.group, home_team=home, away_team=other, date=date(2025, 10, 1), location=' Campo Nuevo ')
+        Match.objects.create(season=self.season, group=self.group, home_team=other, away_team=home, date=date(2025, 10, 8), location='')
+        Match.objects.create(season=self.season, group=self.group, home_team=with_stadium, away_team=home, date=date(2025, 11, 1), location='Otro')
+
+        with CaptureQueriesContext(connection) as ctx:
+            fields = football_views.gather_team_fields_for_group(self.group)
+
+        self.assertEqual(
+            fields,
+            [
+                {'team_slug': 'gamma-campos', 'team_name': 'Gamma Campos', 'location': 'Estadio Gamma'},
+                {'team_slug': 'alfa-campos', 'team_name': 'Alfa Campos', 'location': 'Campo Nuevo'},
+            ],
+        )
+        self.assertEqual(len(ctx.captured_queries), 2)
@@ -46,7 +46,8 @@ from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.files.base import ContentFile
 from django.core.files.storage import FileSystemStorage, default_storage, storages
 from django.db import IntegrityError, connections, transaction
-from django.db.models import BooleanField, Case, Count, Exists, F, Max, OuterRef, Q, Sum, Value, When
+from django.db.models import BooleanField, Case, Count, Exists, F, Max, OuterRef, Q, Sum, Value, When, Window
+from django.db.models.functions import RowNumber
 from django.db.utils import OperationalError, ProgrammingError
 from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
@@ -316,8 +317,6 @@ except Exception:  # pragma: no cover
 from football.cycle_templates import cycle_templates_catalog
 from football.event_taxonomy import (
     CANONICAL_EVENT_KINDS,
-    DRIBBLE_KEYWORDS,
-    GOAL_KEYWORDS,
     FIELD_ZONE_KEYS,
     FIELD_ZONES,
     PASS_KEYWORDS,
@@ -329,6 +328,8 @@ from football.event_taxonomy import (
     canonical_event_kind,
     categorize_position,
     classify_duel_event,
+    classify_event_text,
+    classify_substitution,
     contains_keyword,
     extract_round_number,
     event_result_is_success,
@@ -339,9 +340,7 @@ from football.event_taxonomy import (
     is_red_card_event,
     is_shot_attempt_event,
     is_shot_on_target_event,
-    is_substitution_entry,
     is_substitution_event,
-    is_substitution_exit,
     is_yellow_card_event,
     map_tercio,
     map_zone_label,
@@ -413,7 +412,6 @@ from football.models import (
     RivalConvocationRecord,
     RivalPlayer,
     RivalVideo,
-    ScrapeSource,
     Season,
     SessionTask,
     SessionTaskBookmark,
@@ -478,6 +476,7 @@ from football.query_helpers import (
     _normalize_team_lookup_key,
     _team_match_queryset,
     confirmed_events_queryset,
+    convocation_players_by_name,
     get_active_injury_player_ids,
     get_active_match,
     get_current_convocation,
@@ -520,6 +519,7 @@ from football.services import (
     compute_formation,
     compute_probable_eleven,
     fetch_preferente_team_roster,
+    fetch_preferente_team_roster_cached,
     find_preferente_team_url,
     find_roster_entry,
     get_roster_stats_cache,
@@ -564,7 +564,7 @@ def _refresh_rfaf_standings_inline(*, allow_fallback=False):
     except Exception as exc:
         return False, f"No se pudo cargar el módulo RFAF: {exc}", None
     try:
-        rows, html = import_from_rfef.parse_table(allow_fallback=bool(allow_fallback))
+        rows, html, soup = import_from_rfef.parse_classification(allow_fallback=bool(allow_fallback))
         # Guardia de cordura: el parseo POSICIONAL de la RFAF sale revuelto si la maqueta cambia
         # (PJ=puntos, PTS=0...). Si hay partidos jugados pero NADIE tiene puntos, o los PJ son
         # imposibles, NO escribimos: mejor conservar la clasificación previa que meter basura.
@@ -583,9 +583,9 @@ def _refresh_rfaf_standings_inline(*, allow_fallback=False):
                 f"Clasificación RFAF descartada por incoherente (parseo revuelto): PJ máx={_max_played}, Pts máx={_max_points}.",
                 None,
             )
-        next_match = import_from_rfef.extract_next_match_from_classification(html)
+        next_match = import_from_rfef.extract_next_match_from_classification(html, soup=soup)
         if not next_match:
-            next_match = import_from_rfef.fetch_next_match_from_classification(html)
+            next_match = import_from_rfef.fetch_next_match_from_classification(html, soup=soup)
         if next_match and next_match.get("status") != "next":
             next_match = None
         try:
@@ -2720,6 +2720,9 @@ TASK_RESOURCE_LIBRARY_BASE_GROUPS = [
 ]
 SCRAPE_LOCK_KEY = "football:refresh_scraping_running"
 SCRAPE_LOCK_TIMEOUT_SECONDS = 900
+# Tras un refresco correcto, los clics repetidos en este margen devuelven el mismo resultado sin volver a scrapear.
+SCRAPE_LAST_SUCCESS_KEY_PREFIX = "football:refresh_scraping_last"
+SCRAPE_RECENT_SUCCESS_SECONDS = int(os.getenv("SCRAPE_RECENT_SUCCESS_SECONDS", "60"))
 DASHBOARD_CACHE_KEY_PREFIX = "football:dashboard_payload"
 DASHBOARD_CACHE_SECONDS = int(os.getenv("DASHBOARD_CACHE_SECONDS", "600"))
 PLAYER_DASHBOARD_CACHE_KEY_PREFIX = "football:player_dashboard"
@@ -9006,6 +9009,9 @@ def _paywall_response(request, *, workspace=None):
 _get_active_workspace = workspace_context.get_active_workspace
 
 
+_primary_club_team = workspace_context.primary_club_team
+
+
 _workspace_team_links = workspace_context.workspace_team_links
 
 
@@ -14431,13 +14437,24 @@ def _dashboard_data_impl(request, *, _json):
         player_metrics = []
         player_cards = []
     else:
+        # Equipo y jugadores salen de los mismos eventos: una sola carga para ambos. Si falla,
+        # cada uno se recalcula por su lado, para que un error en uno no deje vacío el otro.
+        team_metrics = player_metrics = None
         try:
-            team_metrics = compute_team_metrics(primary_team, scope=Match.CONTEXT_LEAGUE, request=request)
+            team_metrics, player_metrics = compute_team_and_player_metrics(
+                primary_team, scope=Match.CONTEXT_LEAGUE, request=request
+            )
         except Exception:
-            logger.exception("dashboard_data: compute_team_metrics falló")
-            team_metrics = {"total_events": 0, "top_event_types": [], "top_results": []}
+            logger.exception("dashboard_data: compute_team_and_player_metrics falló")
+        if team_metrics is None:
+            try:
+                team_metrics = compute_team_metrics(primary_team, scope=Match.CONTEXT_LEAGUE, request=request)
+            except Exception:
+                logger.exception("dashboard_data: compute_team_metrics falló")
+                team_metrics = {"total_events": 0, "top_event_types": [], "top_results": []}
         try:
-            player_metrics = compute_player_metrics(primary_team, scope=Match.CONTEXT_LEAGUE, request=request)
+            if player_metrics is None:
+                player_metrics = compute_player_metrics(primary_team, scope=Match.CONTEXT_LEAGUE, request=request)
             current_roster_season = None
             try:
                 current_roster_season = selected_club_season_for_request(request, workspace=workspace)
@@ -14974,7 +14991,6 @@ def dashboard_page(request):
         if target_path != request.path:
             return redirect(target_url)
 
-    sources = list(ScrapeSource.objects.filter(is_active=True))
     # Dashboard (app autenticada): por defecto NO usamos el carrusel comercial como "portada del equipo".
     # Si no hay `cover_image` en el equipo seleccionado, la UI aplicará su fallback (imágenes genéricas).
     hero_image_candidates = []
@@ -16125,12 +16141,18 @@ def club_onboarding_page(request):
                     from openpyxl import load_workbook
                 except Exception as exc:
                     raise ValueError("No se pudo cargar openpyxl para leer el Excel.") from exc
-                workbook = load_workbook(filename=io.BytesIO(raw), data_only=True)
-                sheet = workbook.active
-                rows = list(sheet.iter_rows(values_only=True))
-                if not rows:
+                workbook = load_workbook(filename=io.BytesIO(raw), data_only=True, read_only=True)
+                try:
+                    return _roster_rows_from_sheet(workbook.active)
+                finally:
+                    workbook.close()
+
+            def _roster_rows_from_sheet(sheet) -> list[dict]:
+                rows = sheet.iter_rows(values_only=True)
+                header_row = next(rows, None)
+                if header_row is None:
                     return []
-                header = [str(cell or "").strip().lower() for cell in rows[0]]
+                header = [str(cell or "").strip().lower() for cell in header_row]
                 header_map = {}
                 for idx, key in enumerate(header):
                     normalized = re.sub(r"[^a-z0-9]+", "_", key).strip("_")
@@ -16149,10 +16171,10 @@ def club_onboarding_page(request):
                 if idx_name is None:
                     raise ValueError("El Excel debe tener una columna de nombre (name/nombre/jugador).")
                 parsed_rows: list[dict] = []
-                for row in rows[1:]:
+                for row in rows:
                     if not row or all(cell is None or str(cell).strip() == "" for cell in row):
                         continue
-                    name = str(row[idx_name] or "").strip()
+                    name = str(row[idx_name] or "").strip() if idx_name < len(row) else ""
                     if not name:
                         continue
                     number_val = row[idx_number] if idx_number is not None and idx_number < len(row) else None
@@ -16416,7 +16438,7 @@ def _platform_overview_post(request, *, active_tab, users_subtab, workspace_form
     user_error = ""
     invitation_links = []
     carousel_message = ""
-    primary_team = Team.objects.filter(is_primary=True).first()
+    primary_team = _primary_club_team(request)
 
     form_action = (request.POST.get("form_action") or "workspace_create").strip().lower()
     if form_action == "workspace_create":
@@ -16892,7 +16914,7 @@ def platform_overview_page(request):
     invitation_links = []
     carousel_message = ""
     active_workspace = _build_active_workspace_badge(request)
-    primary_team = Team.objects.filter(is_primary=True).first()
+    primary_team = _primary_club_team(request)
     workspace_form = {
         "workspace_name": "",
         "workspace_kind": Workspace.KIND_CLUB,
@@ -20827,7 +20849,7 @@ def admin_page(request):
                                 system="touch-field-final",
                             )
                         )
-                    MatchEvent.objects.bulk_create(events, batch_size=200)
+                    MatchEvent.bulk_ingest(events)
                     actions_message = (
                         f"Se añadieron {quantity} acciones a {player_obj.name} " f"en partido ID {match_obj.id}."
                     )
@@ -27425,7 +27447,7 @@ def _ensure_matchday_convocation_record(primary_team, *, match=None, request=Non
         # Sin jugadores no se guarda nada: las convocatorias vacías eran la mitad del ruido.
         if not players:
             return None
-        ConvocationRecord.objects.filter(team=primary_team, is_current=True).update(is_current=False)
+        ConvocationRecord.retire_current([primary_team.id])
         record = ConvocationRecord.objects.create(
             team=primary_team,
             match=match,
@@ -27467,6 +27489,22 @@ def _get_convocation_record_for_match(primary_team, match):
         return None
 
 
+# Lo que pinta el historial de acciones (plantilla + contadores iniciales).
+MATCH_ACTION_RECENT_EVENT_FIELDS = (
+    "match",
+    "minute",
+    "event_type",
+    "result",
+    "zone",
+    "observation",
+    "system",
+    "source_file",
+    "raw_data",
+    "player__name",
+    "player__number",
+)
+
+
 @login_required
 def match_action_page(request):
     if not _can_edit_match_actions(request.user):
@@ -27515,8 +27553,7 @@ def match_action_page(request):
                 convocation_record = None
         except Exception:
             pass
-    convocation_players = convocation_record.players.order_by("name") if convocation_record else Player.objects.none()
-    convocation_players = list(convocation_players)
+    convocation_players = convocation_players_by_name(convocation_record) if convocation_record else []
     for player in convocation_players:
         player.photo_url = resolve_player_photo_url(request, player)
     match_staff_captain_id = ""
@@ -27578,6 +27615,7 @@ def match_action_page(request):
                 | Q(source_file="manual-recovery", system="touch-field-final")
             )
             .select_related("player")
+            .only(*MATCH_ACTION_RECENT_EVENT_FIELDS)
             .order_by("-created_at", "-id")[:120]
         )
     else:
@@ -27589,6 +27627,7 @@ def match_action_page(request):
         recent_events = (
             MatchEvent.objects.filter(match_id__in=recent_match_ids)
             .select_related("player")
+            .only(*MATCH_ACTION_RECENT_EVENT_FIELDS)
             .order_by("-created_at", "-id")[:20]
         )
     actions_total_count = 0
@@ -27699,11 +27738,7 @@ def match_action_page(request):
         )
         substitution_events = pending_subs if just_finalized_active_match else (list(confirmed_subs) + pending_subs)
         for event in substitution_events:
-            if not (
-                is_substitution_event(event.event_type, event.zone)
-                or is_substitution_entry(event.event_type, event.result, event.zone)
-                or is_substitution_exit(event.event_type, event.result, event.zone)
-            ):
+            if not is_substitution_event(event.event_type, event.zone):
                 continue
             minute_label = f"{event.minute}'" if event.minute is not None else "--'"
             result_label = (event.result or "").strip() or (event.zone or "").strip() or "Sustitución"
@@ -27855,9 +27890,10 @@ def match_action_page(request):
                 initial_quick_counts["assist"] += 1
 
             # Sustituciones: aproximamos "realizadas" como max(entradas + otras, salidas).
-            if is_substitution_exit(event_type, result, zone) or str(result).strip().lower().startswith("sal"):
+            sub_entry, sub_exit = classify_substitution(event_type, result, zone)
+            if sub_exit or str(result).strip().lower().startswith("sal"):
                 subs_out += 1
-            elif is_substitution_entry(event_type, result, zone) or str(result).strip().lower().startswith("ent"):
+            elif sub_entry or str(result).strip().lower().startswith("ent"):
                 subs_in += 1
             elif is_substitution_event(event_type, zone):
                 subs_other += 1
@@ -28245,7 +28281,7 @@ def match_action_capture_page(request):
     if active_match and not convocation_record:
         convocation_record = _ensure_matchday_convocation_record(primary_team, match=active_match, request=request)
 
-    convocation_players = list(convocation_record.players.order_by("name")) if convocation_record else []
+    convocation_players = convocation_players_by_name(convocation_record) if convocation_record else []
 
     lineup = {"starters": [], "bench": []}
     if convocation_players:
@@ -28873,7 +28909,7 @@ def bulk_add_match_actions(request):
                 ),
             )
         )
-    MatchEvent.objects.bulk_create(events, batch_size=250)
+    MatchEvent.bulk_ingest(events)
     # Si el partido ya tiene captura en vivo, la recuperación la complementa y no sustituye
     # esa fuente. En un partido sin captura, la recuperación sí pasa a ser la fuente manual.
     recovery_stats_source = (
@@ -29319,11 +29355,12 @@ def delete_match_action(request):
     )
     if requested_match:
         candidate_events = candidate_events.filter(match=requested_match)
-    try:
-        event = candidate_events.get(id=event_id)
-    except MatchEvent.DoesNotExist:
+    # Un solo DELETE filtrado (MatchEvent no tiene dependientes ni señales): sin leer antes la fila.
+    deleted = 0
+    if _parse_int(event_id):
+        deleted, _ = candidate_events.filter(id=_parse_int(event_id)).delete()
+    if not deleted:
         return JsonResponse({"error": "Evento no encontrado"}, status=404)
-    event.delete()
     _invalidate_team_dashboard_caches(primary_team)
     return JsonResponse({"deleted": event_id})
 
@@ -30100,18 +30137,13 @@ def match_report_pdf(request):
 
     subs_by_minute = defaultdict(lambda: {"out": [], "in": []})
     for event in events:
-        if not (
-            is_substitution_event(event.event_type, event.zone)
-            or is_substitution_entry(event.event_type, event.result, event.zone)
-            or is_substitution_exit(event.event_type, event.result, event.zone)
-        ):
+        if not is_substitution_event(event.event_type, event.zone):
             continue
         minute_key = event.minute if event.minute is not None else -1
-        if is_substitution_exit(event.event_type, event.result, event.zone) or str(
-            event.result or ""
-        ).strip().lower().startswith("sal"):
+        sub_entry, sub_exit = classify_substitution(event.event_type, event.result, event.zone)
+        if sub_exit or str(event.result or "").strip().lower().startswith("sal"):
             subs_by_minute[minute_key]["out"].append(_player_label(event.player).upper() if event.player else "-")
-        elif is_substitution_entry(event.event_type, event.result, event.zone) or str(
+        elif sub_entry or str(
             event.result or ""
         ).strip().lower().startswith("ent"):
             subs_by_minute[minute_key]["in"].append(_player_label(event.player).upper() if event.player else "-")
@@ -32549,11 +32581,7 @@ def _match_staff_report_context(request, *, match, primary_team):
 
     substitution_rows = defaultdict(lambda: {"out": [], "in": []})
     for event in events:
-        if not (
-            is_substitution_event(event.event_type, event.zone)
-            or is_substitution_entry(event.event_type, event.result, event.zone)
-            or is_substitution_exit(event.event_type, event.result, event.zone)
-        ):
+        if not is_substitution_event(event.event_type, event.zone):
             continue
         player = event.player
         player_row = {
@@ -32566,9 +32594,10 @@ def _match_staff_report_context(request, *, match, primary_team):
         minute_key = event.minute if event.minute is not None else -1
         result_label = str(event.result or "").strip().lower()
         zone_label = str(event.zone or "").strip().lower()
-        if is_substitution_exit(event.event_type, event.result, event.zone) or result_label.startswith("sal"):
+        sub_entry, sub_exit = classify_substitution(event.event_type, event.result, event.zone)
+        if sub_exit or result_label.startswith("sal"):
             substitution_rows[minute_key]["out"].append(player_row)
-        elif is_substitution_entry(event.event_type, event.result, event.zone) or result_label.startswith("ent"):
+        elif sub_entry or result_label.startswith("ent"):
             substitution_rows[minute_key]["in"].append(player_row)
         elif "sal" in zone_label:
             substitution_rows[minute_key]["out"].append(player_row)
@@ -35670,7 +35699,9 @@ def save_convocation(request):
             players = players.exclude(id__in=list(blocked_sanction_ids))
     except Exception:
         logger.debug("No se pudo aplicar el bloqueo de sancionados en save_convocation", exc_info=True)
-    allowed_player_ids = set(players.values_list("id", flat=True))
+    # La lista ya filtrada se lee una vez: de aquí salen ids, avisos de lesión, M2M y recuento.
+    convoked_players = list(players)
+    allowed_player_ids = {player.id for player in convoked_players}
     # El servidor tiene la última palabra sobre quién puede jugar, y hasta ahora se la quedaba
     # para él: la lista llegaba con 18 y guardaba 17 sin decir a quién habia quitado ni por qué.
     # El contador de la pantalla seguia diciendo 18. Aquí se devuelve la baja con nombre y motivo.
@@ -35696,7 +35727,7 @@ def save_convocation(request):
                 }
             )
     has_match_context = any([round_value, location_value, opponent_value, date_value_raw, time_value_raw])
-    if not players.exists() and not has_match_context:
+    if not convoked_players and not has_match_context:
         return JsonResponse(
             {"error": "Indica al menos los datos del próximo partido o una lista de jugadores."}, status=400
         )
@@ -35805,11 +35836,11 @@ def save_convocation(request):
             },
         )
 
-    active_injury_ids = get_active_injury_player_ids(players.values_list("id", flat=True))
-    injured_players = [player.name for player in players if player.id in active_injury_ids]
+    active_injury_ids = get_active_injury_player_ids(allowed_player_ids)
+    injured_players = [player.name for player in convoked_players if player.id in active_injury_ids]
 
     with transaction.atomic():
-        ConvocationRecord.objects.filter(team=primary_team, is_current=True).update(is_current=False)
+        ConvocationRecord.retire_current([primary_team.id])
         # Un partido tiene UNA convocatoria. Antes cada pulsación de "Guardar" creaba otra: el
         # partido del 8 de agosto acabó con tres listas (18, 17 y 17 jugadores) y cualquier
         # recuento posterior tenía que adivinar cuál era la buena.
@@ -35845,15 +35876,15 @@ def save_convocation(request):
         record.captain_id = captain_id if captain_id in allowed_player_ids else None
         record.goalkeeper_id = goalkeeper_id if goalkeeper_id in allowed_player_ids else None
         record.save()
-        record.players.set(players.distinct())
+        record.players.set(allowed_player_ids)
     _invalidate_team_dashboard_caches(primary_team)
     _notify_convoked_players(record, target_match, request.user, workspace=_conv_workspace)
-    pending = players.count() == 0
+    pending = not convoked_players
     whatsapp_text = _build_convocation_whatsapp_text(record, primary_team)
     return JsonResponse(
         {
             "saved": True,
-            "count": players.count(),
+            "count": len(convoked_players),
             "pending_convocation": pending,
             "match_id": target_match.id if target_match else None,
             "injury_warning_count": len(injured_players),
@@ -37648,7 +37679,7 @@ def _build_task_pdf_context(
         if hasattr(request.user, "get_full_name") and request.user.get_full_name().strip()
         else getattr(request.user, "username", "") or "Entrenador"
     )
-    primary_club_team = team or _get_primary_team_for_request(request) or Team.objects.filter(is_primary=True).first()
+    primary_club_team = team or _get_primary_team_for_request(request) or _primary_club_team(request)
 
     def _pdf_static_asset_url(static_path: str, mime_type: str = "") -> str:
         data_url = _static_data_url(static_path, mime_type) if mime_type else ""
@@ -40927,7 +40958,7 @@ def coach_role_trainer_page(request):
         passes_completed = 0
         yellow_local = 0
         red_local = 0
-        zone_counts_local = {key: 0 for key in FIELD_ZONE_KEYS}
+        zone_counts_local = dict.fromkeys(FIELD_ZONE_KEYS, 0)
         for event in event_list:
             if is_yellow_card_event(event.event_type, event.result, event.zone):
                 yellow_local += 1
@@ -41590,7 +41621,7 @@ def coach_role_trainer_page(request):
     coach_player_match_options = []
     coach_player_view = None
     if selected_player and selected_player_stats:
-        player_communications = list(selected_player.communications.select_related("match").all()[:5])
+        player_communications = list(selected_player.communications.select_related("match__home_team", "match__away_team").all()[:5])
         player_fines = list(selected_player.fines.all()[:5])
         player_has_manual_sanction = is_manual_sanction_active(selected_player)
         fines_total_amount = sum(int(fine.amount or 0) for fine in player_fines)
@@ -68328,7 +68359,7 @@ def analysis_page(request):
                                     candidate_url = ""
                             if candidate_url:
                                 try:
-                                    roster = fetch_preferente_team_roster(candidate_url)
+                                    roster = fetch_preferente_team_roster_cached(candidate_url)
                                     if roster:
                                         team_url = candidate_url
                                         roster_source = "lapreferente:live"
@@ -68356,7 +68387,7 @@ def analysis_page(request):
                             team.preferente_url = team_url
                             team.save(update_fields=["preferente_url"])
                         if team_url:
-                            roster = fetch_preferente_team_roster(team_url)
+                            roster = fetch_preferente_team_roster_cached(team_url)
                             if roster:
                                 roster_source = "lapreferente:live"
 
@@ -68473,7 +68504,7 @@ def analysis_page(request):
                         pass
             if team_url and not roster:
                 try:
-                    roster = fetch_preferente_team_roster(team_url)
+                    roster = fetch_preferente_team_roster_cached(team_url)
                     probable_eleven = compute_probable_eleven(roster)
                     insights = build_rival_insights(roster)
                     formation = compute_formation(probable_eleven)
@@ -90339,7 +90370,7 @@ def match_editor_page(request, match_id):
                             raw_data={"editor": "match-editor", "bulk": True, "bulk_quantity": int(quantity)},
                         )
                     )
-                MatchEvent.objects.bulk_create(events, batch_size=250)
+                MatchEvent.bulk_ingest(events)
                 # Añadir acciones desde la ficha declara la fuente del partido como "manual".
                 _set_match_stats_source(match, Match.STATS_SOURCE_MANUAL)
                 _invalidate_team_dashboard_caches(primary_team)
@@ -90690,11 +90721,30 @@ def match_editor_page(request, match_id):
     )
 
 
+# Columnas que leen el informe, la deduplicación (event_signature) y el impacto (raw_data).
+# Partido y jugador ya vienen como argumentos: no se cargan sus filas.
+PLAYER_MATCH_STATS_EVENT_FIELDS = (
+    "match",
+    "player",
+    "minute",
+    "event_type",
+    "result",
+    "zone",
+    "tercio",
+    "observation",
+    "source_file",
+    "raw_data",
+)
+
+
 def _build_player_match_stats_payload(primary_team, player, match):
     opponent = match.away_team if match.home_team == primary_team else match.home_team
     preferred_sources = preferred_event_source_by_match(primary_team)
     events = _filter_stats_events(
-        confirmed_events_queryset().filter(match=match, player=player).select_related("match").order_by("minute", "id"),
+        confirmed_events_queryset()
+        .filter(match=match, player=player)
+        .only(*PLAYER_MATCH_STATS_EVENT_FIELDS)
+        .order_by("minute", "id"),
         preferred_sources=preferred_sources,
     )
     match_zone_profiles, player_zone_profiles = _build_zone_inference_profiles(events)
@@ -90709,9 +90759,9 @@ def _build_player_match_stats_payload(primary_team, player, match):
         "assists": 0,
         "yellow_cards": 0,
         "red_cards": 0,
-        "zone_counts": {key: 0 for key in FIELD_ZONE_KEYS},
-        "tercio_counts": {label: 0 for label in STANDARD_TERCIO_LABELS},
-        "tercio_totals": {label: 0 for label in STANDARD_TERCIO_LABELS},
+        "zone_counts": dict.fromkeys(FIELD_ZONE_KEYS, 0),
+        "tercio_counts": dict.fromkeys(STANDARD_TERCIO_LABELS, 0),
+        "tercio_totals": dict.fromkeys(STANDARD_TERCIO_LABELS, 0),
         "duels_total": 0,
         "duels_won": 0,
         "explicit_duels_total": 0,
@@ -90749,19 +90799,15 @@ def _build_player_match_stats_payload(primary_team, player, match):
         "contextual_impact": 0.0,
         "impact_events": [],
     }
+    zone_labels = []
+    tercio_labels = []
+    action_texts = Counter()
     for event in events:
-        event_label = normalize_label(event.event_type)
-        is_forced_turnover = "perdida forzada" in event_label or "error forzado" in event_label
-        is_unforced_turnover = "perdida no forzada" in event_label or "error no forzado" in event_label
-        # Algunos registros históricos guardaron errores con resultado GANADO. Un error
-        # nunca puede elevar aciertos ni transformarse en un duelo ganado por esa etiqueta.
-        event_success = event_result_is_success(event.event_type, event.result)
-        # "EN CONTRA" a secas NO es un gol encajado: una falta cometida, un córner en contra o
-        # un duelo perdido también se guardan así. Contarlos como gol le quitaba 0,30 de nota a
-        # cualquiera que hiciera una falta (Reno perdía 0,90 por tres faltas).
-        is_conceded_goal = "gol encajado" in event_label or (
-            contains_keyword(event.event_type, GOAL_KEYWORDS) and normalize_label(event.result) == "en contra"
-        )
+        # Lo que solo depende del texto de la acción se clasifica una vez por combinación
+        # distinta (un partido repite muchas veces "Pase / OK"); el impacto y la zona sí van por evento.
+        action_text = (event.event_type, event.result, event.observation, event.zone)
+        action_texts[action_text] += 1
+        goal_candidate = classify_event_text(*action_text, detailed=True)[2]
         impact = match_event_impact(event)
         if impact:
             stats["contextual_impact"] += float(impact["rating_delta"])
@@ -90773,118 +90819,35 @@ def _build_player_match_stats_payload(primary_team, player, match):
                     "action": event.event_type,
                 }
             )
-        stats["total_actions"] += 1
-        if event_success:
-            stats["successes"] += 1
-        if (
-            is_goal_event(event.event_type, event.result, event.observation)
-            and not is_conceded_goal
-            and (impact or {}).get("code") != "goal_conceded"
-        ):
+        if goal_candidate and (impact or {}).get("code") != "goal_conceded":
             stats["goals"] += 1
-        if is_assist_event(event.event_type, event.result, event.observation):
-            stats["assists"] += 1
-        if is_yellow_card_event(event.event_type, event.result, event.zone):
-            stats["yellow_cards"] += 1
-        if is_red_card_event(event.event_type, event.result, event.zone):
-            stats["red_cards"] += 1
-
-        duel_event = classify_duel_event(event.event_type, event.result, event.observation, event.zone)
-        if duel_event.get("counted"):
-            stats["duels_total"] += 1
-            if duel_event.get("won"):
-                stats["duels_won"] += 1
-            if event_label == "duelo" or event_label.startswith("duelo "):
-                stats["explicit_duels_total"] += 1
-                if duel_event.get("won"):
-                    stats["explicit_duels_won"] += 1
-            if duel_event.get("aerial"):
-                stats["aerial_duels_total"] += 1
-                if duel_event.get("won"):
-                    stats["aerial_duels_won"] += 1
 
         zone_label = _resolve_zone_label(event, match_zone_profiles, player_zone_profiles)
         if zone_label:
-            stats["zone_counts"][zone_label] = int(stats["zone_counts"].get(zone_label, 0) or 0) + 1
+            zone_labels.append(zone_label)
 
         tercio_raw = (event.tercio or "").strip()
         if tercio_raw:
             mapped = map_tercio(tercio_raw)
             if mapped:
-                stats["tercio_counts"][mapped] = int(stats["tercio_counts"].get(mapped, 0) or 0) + 1
-                stats["tercio_totals"][mapped] = int(stats["tercio_totals"].get(mapped, 0) or 0) + 1
-
-        shot_event = is_shot_attempt_event(event.event_type, event.result, event.observation) and not is_conceded_goal
-        if shot_event:
-            stats["shot_attempts"] += 1
-            if is_shot_on_target_event(event.event_type, event.result, event.observation):
-                stats["shots_on_target"] += 1
-
-        if is_goalkeeper_save_event(event.event_type, event.result, event.observation):
-            stats["goalkeeper_saves"] += 1
-        if is_conceded_goal:
-            stats["goals_conceded"] += 1
-        if event_label.startswith("robo") or "recuperacion" in event_label:
-            if event_success:
-                stats["recoveries"] += 1
-        if is_forced_turnover:
-            stats["forced_turnovers"] += 1
-        if is_unforced_turnover:
-            stats["unforced_turnovers"] += 1
-        if contains_keyword(event.event_type, DRIBBLE_KEYWORDS) or contains_keyword(
-            event.observation, DRIBBLE_KEYWORDS
-        ):
-            stats["dribbles_attempted"] += 1
-            if event_success:
-                stats["dribbles_completed"] += 1
-        if event_label == "centro" or event_label.startswith("centro "):
-            stats["crosses_attempted"] += 1
-            if event_success:
-                stats["crosses_completed"] += 1
-        if "pase en largo" in event_label:
-            stats["long_passes_attempted"] += 1
-            if event_success:
-                stats["long_passes_completed"] += 1
-        if event_label == "caida" or event_label.startswith("caida "):
-            if event_success:
-                stats["retentions_won"] += 1
-            else:
-                stats["retentions_lost"] += 1
-        # La falta se registra como acción "Falta" con el sentido en el resultado (así sale de la
-        # captura). Buscando sólo el texto "falta cometida" no se contaba ninguna.
-        if "presion" in event_label:
-            stats["high_press_total"] += 1
-            stats["high_press_won"] += int(event_success)
-        if "juego de espaldas" in event_label:
-            stats["back_to_goal_total"] += 1
-            stats["back_to_goal_won"] += int(event_success)
-        if "desmarque" in event_label and event_success:
-            stats["off_ball_runs"] += 1
-        if ("saque de esquina" in event_label or "falta lanzada" in event_label
-                or "penalti" in event_label or "saque de banda" in event_label):
-            stats["set_pieces_taken"] += 1
-            stats["set_pieces_ok"] += int(event_success)
-        if "falta" in event_label:
-            resultado = normalize_label(event.result)
-            if "falta cometida" in event_label or resultado in {"en contra", "cometida"}:
-                stats["fouls_committed"] += 1
-            elif "falta recibida" in event_label or resultado in {"a favor", "recibida"}:
-                stats["fouls_received"] += 1
-
-        is_pass_event = (
-            contains_keyword(event.event_type, PASS_KEYWORDS)
-            or contains_keyword(event.observation, PASS_KEYWORDS)
-            or is_assist_event(event.event_type, event.result, event.observation)
-        )
-        if is_pass_event:
-            stats["pass_attempts"] += 1
-            is_completed_pass = event_success or is_assist_event(
-                event.event_type, event.result, event.observation
-            )
-            if is_completed_pass:
-                stats["passes_completed"] += 1
-                if is_key_pass_event(event.event_type, event.result, event.observation):
-                    stats["key_passes_completed"] += 1
+                tercio_labels.append(mapped)
+    # Los contadores de texto se suman por combinación distinta multiplicados por sus repeticiones.
+    for action_text, repeats in action_texts.items():
+        counters, is_success, _goal, is_assist, is_yellow, is_red = classify_event_text(
+            *action_text, detailed=True
+        )
+        stats["total_actions"] += repeats
+        stats["successes"] += int(is_success) * repeats
+        stats["assists"] += int(is_assist) * repeats
+        stats["yellow_cards"] += int(is_yellow) * repeats
+        stats["red_cards"] += int(is_red) * repeats
+        for key, amount in counters:
+            stats[key] += amount * repeats
+    # Conteo de una vez al final (Counter cuenta en C) en lugar de un get/set de dict por evento.
+    stats["zone_counts"].update(Counter(zone_labels))
+    tercio_counts = Counter(tercio_labels)
+    stats["tercio_counts"].update(tercio_counts)
+    stats["tercio_totals"].update(tercio_counts)
     stats["contextual_impact"] = round(float(stats["contextual_impact"]), 2)
     total_tercios = sum(stats["tercio_totals"].values())
     stats["success_rate"] = (
@@ -91457,10 +91420,20 @@ def refresh_scraping(request):
         )
     forbidden = _forbid_if_workspace_module_disabled(request, "dashboard", label="dashboard")
     if forbidden:
+        cache.delete(SCRAPE_LOCK_KEY)
         return JsonResponse(
             {"status": "error", "message": "El dashboard no está activo en el workspace actual."}, status=403
         )
     primary_team = _get_primary_team_for_request(request)
+    last_success_key = (
+        f"{SCRAPE_LAST_SUCCESS_KEY_PREFIX}:{getattr(workspace, 'id', None) or 0}:{getattr(primary_team, 'id', None) or 0}"
+    )
+    last_success = cache.get(last_success_key) if SCRAPE_RECENT_SUCCESS_SECONDS > 0 else None
+    if isinstance(last_success, dict):
+        cache.delete(SCRAPE_LOCK_KEY)
+        response = JsonResponse({**last_success, "cached": True})
+        response["Cache-Control"] = "no-store"
+        return response
     context = (
         _bootstrap_workspace_competition_context(workspace, primary_team=primary_team)
         if workspace and primary_team
@@ -91565,13 +91538,14 @@ def refresh_scraping(request):
                 latest_updated = snapshot.updated_at
         except Exception:
             pass
-    response = JsonResponse(
-        {
-            "status": "success",
-            "message": f"{refresh_message} {roster_status}.",
-            "standings_last_updated": latest_updated.isoformat() if latest_updated else "",
-        }
-    )
+    payload = {
+        "status": "success",
+        "message": f"{refresh_message} {roster_status}.",
+        "standings_last_updated": latest_updated.isoformat() if latest_updated else "",
+    }
+    if SCRAPE_RECENT_SUCCESS_SECONDS > 0:
+        cache.set(last_success_key, payload, timeout=SCRAPE_RECENT_SUCCESS_SECONDS)
+    response = JsonResponse(payload)
     response["Cache-Control"] = "no-store"
     return response
 
@@ -91672,21 +91646,15 @@ def get_next_match(primary_team, group, *, allow_external_fetch=None):
     # Partido local futuro. El gate de standings solo aplica a LIGA; torneo/amistoso pasan siempre.
     # Y si tras el gate no queda ninguno, caemos al más próximo SIN filtrar: un partido futuro
     # creado a mano nunca debe quedar oculto por el gate.
-    upcoming = None
-    for candidate in scoped_qs.filter(date__gte=today).order_by("date", "id")[:10]:
-        if _opponent_in_group_standings(candidate):
-            upcoming = candidate
-            break
+    # Los candidatos se leen una vez: el fallback sin gate es el primero de esas mismas listas.
+    scoped_upcoming = list(scoped_qs.filter(date__gte=today).order_by("date", "id")[:10])
+    upcoming = next((candidate for candidate in scoped_upcoming if _opponent_in_group_standings(candidate)), None)
+    all_upcoming = []
+    if not upcoming and group:
+        all_upcoming = list(all_team_matches_qs.filter(date__gte=today).order_by("date", "id")[:10])
+        upcoming = next((candidate for candidate in all_upcoming if _opponent_in_group_standings(candidate)), None)
     if not upcoming:
-        for candidate in all_team_matches_qs.filter(date__gte=today).order_by("date", "id")[:10]:
-            if _opponent_in_group_standings(candidate):
-                upcoming = candidate
-                break
-    if not upcoming:
-        upcoming = (
-            scoped_qs.filter(date__gte=today).order_by("date", "id").first()
-            or all_team_matches_qs.filter(date__gte=today).order_by("date", "id").first()
-        )
+        upcoming = (scoped_upcoming or all_upcoming or [None])[0]
 
     # Entre la fuente externa (Universo, cache) y el partido local futuro, gana el MÁS PRÓXIMO por
     # fecha. Antes Universo se devolvía siempre primero y podía "pisar" un partido manual más cercano.
@@ -92285,8 +92253,13 @@ def _sync_match_score_from_events(match, primary_team):
     """
     if not match or not primary_team:
         return
-    goals_for = _infer_team_goals_from_events(match, primary_team)
-    goals_against = _infer_team_goals_against_from_events(match, primary_team)
+    if match.home_team_id == primary_team.id:
+        own_score, rival_score = match.home_score, match.away_score
+    else:
+        own_score, rival_score = match.away_score, match.home_score
+    # Cada inferencia recorre los eventos del partido: sólo se calcula el lado que falta.
+    goals_for = _infer_team_goals_from_events(match, primary_team) if own_score is None else 0
+    goals_against = _infer_team_goals_against_from_events(match, primary_team) if rival_score is None else 0
     changed_fields = []
     if match.home_team_id == primary_team.id:
         if match.home_score is None:
@@ -92319,38 +92292,47 @@ def gather_team_fields_for_group(group):
         return []
     seen = set()
     fields = []
+    # Sólo columnas: con decenas de partidos por grupo no hace falta instanciar Team/Match.
     try:
-        teams = Team.objects.filter(group=group).exclude(home_stadium__exact="").order_by("name")
-        for team in teams:
-            if not team or team.id in seen:
+        teams = (
+            Team.objects.filter(group=group)
+            .exclude(home_stadium__exact="")
+            .order_by("name")
+            .values_list("id", "slug", "name", "home_stadium")
+        )
+        for team_id, slug, name, home_stadium in teams:
+            if team_id in seen:
                 continue
-            seen.add(team.id)
+            seen.add(team_id)
             fields.append(
                 {
-                    "team_slug": team.slug,
-                    "team_name": team.name,
-                    "location": str(team.home_stadium or "").strip(),
+                    "team_slug": slug,
+                    "team_name": name,
+                    "location": str(home_stadium or "").strip(),
                 }
             )
     except Exception:
         pass
+    # Solo el partido más reciente por equipo local: la BD numera por equipo y devuelve una fila
+    # por campo, en lugar de traer todos los partidos del grupo y descartar en Python.
     matches = (
         Match.objects.filter(group=group, home_team__isnull=False)
         .exclude(location__isnull=True)
         .exclude(location__exact="")
-        .select_related("home_team")
-        .order_by("home_team__name", "-date")
+        .exclude(home_team_id__in=seen)
+        .annotate(
+            home_rank=Window(RowNumber(), partition_by=[F("home_team_id")], order_by=[F("date").desc(), F("id").desc()])
+        )
+        .filter(home_rank=1)
+        .order_by("home_team__name")
+        .values_list("home_team__slug", "home_team__name", "location")
     )
-    for match in matches:
-        team = match.home_team
-        if not team or team.id in seen:
-            continue
-        seen.add(team.id)
+    for slug, name, location in matches:
         fields.append(
             {
-                "team_slug": team.slug,
-                "team_name": team.name,
-                "location": match.location.strip(),
+                "team_slug": slug,
+                "team_name": name,
+                "location": location.strip(),
             }
         )
     return fields
@@ -92413,7 +92395,12 @@ def _resolve_zone_label(event, match_profiles=None, player_profiles=None):
 def _normalize_excel_header(value):
     if not value:
         return ""
-    return "".join(ch.lower() for ch in str(value).strip() if ch.isalnum())
+    return _normalize_excel_header_text(str(value))
+
+
+@lru_cache(maxsize=4096)
+def _normalize_excel_header_text(text):
+    return "".join(ch.lower() for ch in text.strip() if ch.isalnum())
 
 
 _active_club_season_date_bounds_from_request = stats_services.active_club_season_date_bounds_from_request
@@ -92452,6 +92439,9 @@ compute_player_cards_for_match = stats_services.compute_player_cards_for_match
 compute_player_metrics = stats_services.compute_player_metrics
 
 
+compute_team_and_player_metrics = stats_services.compute_team_and_player_metrics
+
+
 compute_player_cards = stats_services.compute_player_cards
 
 
@@ -92662,6 +92652,21 @@ def _player_evaluation_chart_context(evaluations):
     return {"trend_rows": trend_rows, "area_rows": area_rows, "radar": radar, "evolution": evolution}
 
 
+# compute_player_dashboard: columnas de MatchEvent que el bucle de acciones nunca lee y las
+# únicas que necesita el de minutos/PJ.
+PLAYER_DASHBOARD_UNUSED_EVENT_FIELDS = ("period", "kind", "system", "raw_data", "created_at")
+PLAYER_DASHBOARD_LIVE_EVENT_FIELDS = (
+    "id",
+    "match_id",
+    "player_id",
+    "minute",
+    "event_type",
+    "result",
+    "zone",
+    "source_file",
+)
+
+
 def compute_player_dashboard(
     primary_team,
     force_refresh=False,
@@ -93082,6 +93087,7 @@ def compute_player_dashboard(
         stats_events = stats_events.filter(match__date__lte=date_end)
     events = (
         stats_events.select_related("player", "match", "match__home_team", "match__away_team")
+        .defer(*PLAYER_DASHBOARD_UNUSED_EVENT_FIELDS)
         # Rendimiento: ordenar por `player__name`/`match__date` fuerza un sort grande con JOINs
         # (muy caro en producción). Para KPIs/dedupe/timeline no necesitamos ese orden.
         .order_by("id")
@@ -93375,18 +93381,23 @@ def compute_player_dashboard(
     if date_end:
         live_events = live_events.filter(match__date__lte=date_end)
     live_events = (
-        live_events.select_related("player", "match", "match__home_team", "match__away_team")
+        # Para minutos/PJ solo hacen falta ids, minuto y texto de la acción: sin JOINs ni el JSON
+        # `raw_data`, y como tuplas con nombre en lugar de instancias de MatchEvent.
         # Rendimiento: evita sort por campos de JOIN (player.name / match.date).
-        .order_by("id")
+        live_events.order_by("id")
+        .values_list(*PLAYER_DASHBOARD_LIVE_EVENT_FIELDS, named=True)
     )
     seen_signatures = set()
+    # Zonas, tercios y posiciones se cuentan por (jugador, etiqueta) y se vuelcan al final.
+    zone_labels_by_player = Counter()
+    tercio_labels_by_player = Counter()
+    position_labels_by_player = Counter()
     for event in events:
         player = event.player
         if not player:
             continue
         if dashboard_roster_season and player.id not in roster_player_ids:
             continue
-        resolved_photo_url = player_photo_url_by_id.get(player.id, "")
         match = event.match
         # Fuente única por partido (Match.stats_source): evita el doble conteo entre el registro en
         # vivo y la edición manual de la ficha. Antes un bypass dejaba pasar SIEMPRE los manuales.
@@ -93396,109 +93407,112 @@ def compute_player_dashboard(
         if signature in seen_signatures:
             continue
         seen_signatures.add(signature)
-        roster_entry = roster_entry_by_player_id.get(player.id, {})
-        manual_entry = manual_entry_by_player_id.get(player.id, {})
-        universo_entry = universo_entry_by_player_id.get(player.id, {})
-        base_pj = (
-            manual_entry.get("pj")
-            if manual_entry.get("pj") is not None
-            else (
-                _parse_int(universo_entry.get("pj"))
-                if universo_entry.get("pj") not in (None, "")
-                else roster_entry.get("pj", 0)
+        stats = player_stats.get(player.id)
+        if stats is None:
+            # Bases de temporada y esqueleto de la fila: solo con el primer evento de cada jugador,
+            # no en cada evento (setdefault construía el dict y las bases para tirarlos).
+            resolved_photo_url = player_photo_url_by_id.get(player.id, "")
+            roster_entry = roster_entry_by_player_id.get(player.id, {})
+            manual_entry = manual_entry_by_player_id.get(player.id, {})
+            universo_entry = universo_entry_by_player_id.get(player.id, {})
+            base_pj = (
+                manual_entry.get("pj")
+                if manual_entry.get("pj") is not None
+                else (
+                    _parse_int(universo_entry.get("pj"))
+                    if universo_entry.get("pj") not in (None, "")
+                    else roster_entry.get("pj", 0)
+                )
             )
-        )
-        base_pt = (
-            manual_entry.get("pt")
-            if manual_entry.get("pt") is not None
-            else (
-                _parse_int(universo_entry.get("pt"))
-                if universo_entry.get("pt") not in (None, "")
-                else roster_entry.get("pt", 0)
+            base_pt = (
+                manual_entry.get("pt")
+                if manual_entry.get("pt") is not None
+                else (
+                    _parse_int(universo_entry.get("pt"))
+                    if universo_entry.get("pt") not in (None, "")
+                    else roster_entry.get("pt", 0)
+                )
             )
-        )
-        base_minutes = (
-            manual_entry.get("minutes")
-            if manual_entry.get("minutes") is not None
-            else (
-                _parse_int(universo_entry.get("minutes"))
-                if universo_entry.get("minutes") not in (None, "")
-                else roster_entry.get("minutes", 0)
-            )
-        )
-        # P2-5: blindar valores no numéricos del snapshot (p.ej. "-" -> _parse_int devuelve None).
-        # Sin esto, `max(pc, base_pj)` y las sumas posteriores petan con `None > int`.
-        base_pj = int(base_pj or 0)
-        base_pt = int(base_pt or 0)
-        base_minutes = int(base_minutes or 0)
-        base_pc = max(int(roster_entry.get("pc", 0) or 0), base_pj)
-        base_goals = (
-            manual_entry.get("goals")
-            if manual_entry.get("goals") is not None
-            else (
-                _parse_int(universo_entry.get("goals"))
-                if universo_entry.get("goals") not in (None, "")
-                else roster_entry.get("goals", 0)
+            base_minutes = (
+                manual_entry.get("minutes")
+                if manual_entry.get("minutes") is not None
+                else (
+                    _parse_int(universo_entry.get("minutes"))
+                    if universo_entry.get("minutes") not in (None, "")
+                    else roster_entry.get("minutes", 0)
+                )
             )
-        )
-        base_yellow = (
-            manual_entry.get("yellow_cards")
-            if manual_entry.get("yellow_cards") is not None
-            else (
-                _parse_int(universo_entry.get("yellow_cards"))
-                if universo_entry.get("yellow_cards") not in (None, "")
-                else roster_entry.get("yellow_cards", 0)
+            # P2-5: blindar valores no numéricos del snapshot (p.ej. "-" -> _parse_int devuelve None).
+            # Sin esto, `max(pc, base_pj)` y las sumas posteriores petan con `None > int`.
+            base_pj = int(base_pj or 0)
+            base_pt = int(base_pt or 0)
+            base_minutes = int(base_minutes or 0)
+            base_pc = max(int(roster_entry.get("pc", 0) or 0), base_pj)
+            base_goals = (
+                manual_entry.get("goals")
+                if manual_entry.get("goals") is not None
+                else (
+                    _parse_int(universo_entry.get("goals"))
+                    if universo_entry.get("goals") not in (None, "")
+                    else roster_entry.get("goals", 0)
+                )
             )
-        )
-        base_red = (
-            manual_entry.get("red_cards")
-            if manual_entry.get("red_cards") is not None
-            else (
-                _parse_int(universo_entry.get("red_cards"))
-                if universo_entry.get("red_cards") not in (None, "")
-                else roster_entry.get("red_cards", 0)
+            base_yellow = (
+                manual_entry.get("yellow_cards")
+                if manual_entry.get("yellow_cards") is not None
+                else (
+                    _parse_int(universo_entry.get("yellow_cards"))
+                    if universo_entry.get("yellow_cards") not in (None, "")
+                    else roster_entry.get("yellow_cards", 0)
+                )
             )
-        )
-        base_assists = (
-            manual_entry.get("assists")
-            if manual_entry.get("assists") is not None
-            else (
-                _parse_int(universo_entry.get("assists"))
-                if universo_entry.get("assists") not in (None, "")
-                else roster_entry.get("assists", 0)
-            )
-        )
-        # P2-5: blindar el resto de valores base (mismo motivo que arriba).
-        base_goals = int(base_goals or 0)
-        base_yellow = int(base_yellow or 0)
-        base_red = int(base_red or 0)
-        base_assists = int(base_assists or 0)
-        # Manual-base: bloquear solo cuando el override aporta un valor no-cero.
-        # (Evita el caso típico: el usuario guarda el formulario en blanco y se crean overrides=0
-        # que impiden sumar los eventos reales de partido.)
-        # P0-2 (doble conteo): cuando la base viene del SNAPSHOT EXTERNO (Universo/La Preferente),
-        # esos totales YA son el total oficial de liga; los eventos locales son ESOS MISMOS partidos.
-        # Sumar ambos inflaba PJ/min/goles. Por eso, si el snapshot aporta un valor no-cero para una
-        # métrica, la bloqueamos igual que un override manual (una sola fuente por métrica).
-        _ext = bool(use_external_base_stats)
-        assists_locked = (("assists" in manual_entry) and int(manual_entry.get("assists") or 0) != 0) or (
-            _ext and base_assists > 0
-        )
-        goals_locked = (("goals" in manual_entry) and int(manual_entry.get("goals") or 0) != 0) or (
-            _ext and base_goals > 0
-        )
-        yellow_cards_locked = (
-            ("yellow_cards" in manual_entry) and int(manual_entry.get("yellow_cards") or 0) != 0
-        ) or (_ext and base_yellow > 0)
-        red_cards_locked = (("red_cards" in manual_entry) and int(manual_entry.get("red_cards") or 0) != 0) or (
-            _ext and base_red > 0
-        )
-        totals_locked = any(
-            int(manual_entry.get(key) or 0) != 0 for key in ("pj", "pt", "minutes") if key in manual_entry
-        ) or (_ext and base_pj > 0)
-        stats = player_stats.setdefault(
-            player.id,
-            {
+            base_red = (
+                manual_entry.get("red_cards")
+                if manual_entry.get("red_cards") is not None
+                else (
+                    _parse_int(universo_entry.get("red_cards"))
+                    if universo_entry.get("red_cards") not in (None, "")
+                    else roster_entry.get("red_cards", 0)
+                )
+            )
+            base_assists = (
+                manual_entry.get("assists")
+                if manual_entry.get("assists") is not None
+                else (
+                    _parse_int(universo_entry.get("assists"))
+                    if universo_entry.get("assists") not in (None, "")
+                    else roster_entry.get("assists", 0)
+                )
+            )
+            # P2-5: blindar el resto de valores base (mismo motivo que arriba).
+            base_goals = int(base_goals or 0)
+            base_yellow = int(base_yellow or 0)
+            base_red = int(base_red or 0)
+            base_assists = int(base_assists or 0)
+            # Manual-base: bloquear solo cuando el override aporta un valor no-cero.
+            # (Evita el caso típico: el usuario guarda el formulario en blanco y se crean overrides=0
+            # que impiden sumar los eventos reales de partido.)
+            # P0-2 (doble conteo): cuando la base viene del SNAPSHOT EXTERNO (Universo/La Preferente),
+            # esos totales YA son el total oficial de liga; los eventos locales son ESOS MISMOS partidos.
+            # Sumar ambos inflaba PJ/min/goles. Por eso, si el snapshot aporta un valor no-cero para una
+            # métrica, la bloqueamos igual que un override manual (una sola fuente por métrica).
+            _ext = bool(use_external_base_stats)
+            assists_locked = (("assists" in manual_entry) and int(manual_entry.get("assists") or 0) != 0) or (
+                _ext and base_assists > 0
+            )
+            goals_locked = (("goals" in manual_entry) and int(manual_entry.get("goals") or 0) != 0) or (
+                _ext and base_goals > 0
+            )
+            yellow_cards_locked = (
+                ("yellow_cards" in manual_entry) and int(manual_entry.get("yellow_cards") or 0) != 0
+            ) or (_ext and base_yellow > 0)
+            red_cards_locked = (("red_cards" in manual_entry) and int(manual_entry.get("red_cards") or 0) != 0) or (
+                _ext and base_red > 0
+            )
+            totals_locked = any(
+                int(manual_entry.get(key) or 0) != 0 for key in ("pj", "pt", "minutes") if key in manual_entry
+            ) or (_ext and base_pj > 0)
+            stats = player_stats[player.id] = {
                 "player_id": player.id,
                 "name": player.name,
                 "nickname": str(getattr(player, "nickname", "") or "").strip(),
@@ -93522,10 +93536,10 @@ def compute_player_dashboard(
                 # Locks only PJ/PT/minutes aggregation (others have their own lock flags).
                 "totals_locked": totals_locked,
                 "matches": {},
-                "zone_counts": {key: 0 for key in FIELD_ZONE_KEYS},
-                "position_counts": {key: 0 for key in FIELD_ZONE_KEYS},
-                "tercio_counts": {label: 0 for label in STANDARD_TERCIO_LABELS},
-                "tercio_totals": {label: 0 for label in STANDARD_TERCIO_LABELS},
+                "zone_counts": dict.fromkeys(FIELD_ZONE_KEYS, 0),
+                "position_counts": dict.fromkeys(FIELD_ZONE_KEYS, 0),
+                "tercio_counts": dict.fromkeys(STANDARD_TERCIO_LABELS, 0),
+                "tercio_totals": dict.fromkeys(STANDARD_TERCIO_LABELS, 0),
                 "duels_total": 0,
                 "duels_won": 0,
                 "aerial_duels_total": 0,
@@ -93540,71 +93554,37 @@ def compute_player_dashboard(
                 "dribbles_completed": 0,
                 "age": _parse_int(universo_entry.get("age")) or roster_entry.get("age"),
                 "has_events": False,
-            },
+            }
+            if base_pj > 0:
+                stats["has_events"] = True
+        # Clasificación por texto memorizada: un dashboard repite miles de veces "Pase / OK".
+        counters, is_success, is_goal, is_assist, is_yellow, is_red = classify_event_text(
+            event.event_type, event.result, event.observation, event.zone
         )
-        if base_pj > 0:
-            stats["has_events"] = True
         stats["total_actions"] += 1
-        if result_is_success(event.result):
+        if is_success:
             stats["successes"] += 1
-        is_goal = is_goal_event(event.event_type, event.result, event.observation)
-        is_assist = is_assist_event(event.event_type, event.result, event.observation)
         if (not stats.get("goals_locked")) and is_goal:
             stats["goals"] += 1
         if (not stats.get("assists_locked")) and is_assist:
             stats["assists"] += 1
-        if (not stats.get("yellow_cards_locked")) and is_yellow_card_event(event.event_type, event.result, event.zone):
+        if (not stats.get("yellow_cards_locked")) and is_yellow:
             stats["yellow_cards"] += 1
-        if (not stats.get("red_cards_locked")) and is_red_card_event(event.event_type, event.result, event.zone):
+        if (not stats.get("red_cards_locked")) and is_red:
             stats["red_cards"] += 1
-        duel_event = classify_duel_event(event.event_type, event.result, event.observation, event.zone)
-        if duel_event.get("counted"):
-            stats["duels_total"] += 1
-            if duel_event.get("won"):
-                stats["duels_won"] += 1
-            if duel_event.get("aerial"):
-                stats["aerial_duels_total"] += 1
-                if duel_event.get("won"):
-                    stats["aerial_duels_won"] += 1
+        for key, amount in counters:
+            stats[key] += amount
         zone_label = _resolve_zone_label(event, match_zone_profiles, player_zone_profiles)
         if zone_label:
-            stats["zone_counts"][zone_label] = int(stats["zone_counts"].get(zone_label, 0) or 0) + 1
+            zone_labels_by_player[(player.id, zone_label)] += 1
         tercio = (event.tercio or "").strip()
         if tercio:
             mapped = map_tercio(tercio)
             if mapped:
-                stats["tercio_counts"][mapped] = int(stats["tercio_counts"].get(mapped, 0) or 0) + 1
-                stats["tercio_totals"][mapped] = int(stats["tercio_totals"].get(mapped, 0) or 0) + 1
+                tercio_labels_by_player[(player.id, mapped)] += 1
         position_label = categorize_position(player.position, event.zone)
         if position_label:
-            stats["position_counts"][position_label] = int(stats["position_counts"].get(position_label, 0) or 0) + 1
-        shot_event = is_shot_attempt_event(event.event_type, event.result, event.observation)
-        if shot_event:
-            stats["shot_attempts"] += 1
-            if is_shot_on_target_event(event.event_type, event.result, event.observation):
-                stats["shots_on_target"] += 1
-        if is_goalkeeper_save_event(event.event_type, event.result, event.observation):
-            stats["goalkeeper_saves"] += 1
-        is_pass_event = (
-            contains_keyword(event.event_type, PASS_KEYWORDS)
-            or contains_keyword(event.observation, PASS_KEYWORDS)
-            or is_assist_event(event.event_type, event.result, event.observation)
-        )
-        if is_pass_event:
-            stats["pass_attempts"] += 1
-            is_completed_pass = result_is_success(event.result) or is_assist_event(
-                event.event_type, event.result, event.observation
-            )
-            if is_completed_pass:
-                stats["passes_completed"] += 1
-                if is_key_pass_event(event.event_type, event.result, event.observation):
-                    stats["key_passes_completed"] += 1
-        if contains_keyword(event.event_type, DRIBBLE_KEYWORDS) or contains_keyword(
-            event.observation, DRIBBLE_KEYWORDS
-        ):
-            stats["dribbles_attempted"] += 1
-            if result_is_success(event.result):
-                stats["dribbles_completed"] += 1
+            position_labels_by_player[(player.id, position_label)] += 1
         if not match:
             continue
         match_key = _canonical_match_id(match.id)
@@ -93649,7 +93629,7 @@ def compute_player_dashboard(
         )
         match_entry["played"] = True
         match_entry["actions"] += 1
-        if result_is_success(event.result):
+        if is_success:
             match_entry["successes"] += 1
         if (not stats.get("goals_locked")) and is_goal:
             match_entry["goals"] += 1
@@ -93658,6 +93638,15 @@ def compute_player_dashboard(
         match_entry["success_rate"] = (
             round((match_entry["successes"] / match_entry["actions"]) * 100) if match_entry["actions"] else 0
         )
+    for counts_key, labels_by_player in (
+        ("zone_counts", zone_labels_by_player),
+        ("tercio_counts", tercio_labels_by_player),
+        ("tercio_totals", tercio_labels_by_player),
+        ("position_counts", position_labels_by_player),
+    ):
+        for (player_id, label), count in labels_by_player.items():
+            counts = player_stats[player_id][counts_key]
+            counts[label] = int(counts.get(label, 0) or 0) + count
     # Asegurar que aparezcan partidos de titulares aunque no haya acciones registradas.
     starter_match_by_id = {}
     if starter_match_ids:
@@ -93709,13 +93698,13 @@ def compute_player_dashboard(
                     "success_rate": 0,
                 }
     for event in live_events:
-        match = event.match
-        if match:
+        event_match_id = event.match_id
+        if event_match_id:
             # Misma fuente única por partido que el conteo de acciones/goles (coherencia minutos↔acciones).
             if not _event_matches_stats_source(event, preferred_sources):
                 continue
-        if match and event.minute is not None:
-            match_id = _canonical_match_id(match.id)
+        if event_match_id and event.minute is not None:
+            match_id = _canonical_match_id(event_match_id)
             match_end_minutes[match_id] = max(match_end_minutes.get(match_id, 0), event.minute)
             normalized_type = normalize_label(event.event_type)
             # Si existe un marcador explícito de fin de partido, respétalo incluso si es < reglamentario
@@ -93726,19 +93715,20 @@ def compute_player_dashboard(
                     match_end_marker_minutes.get(match_id, 0),
                     int(event.minute or 0),
                 )
-        player = event.player
-        if not player:
+        event_player_id = event.player_id
+        if not event_player_id:
             continue
-        if match:
-            match_id = _canonical_match_id(match.id)
-            timeline = player_match_timeline.setdefault(player.id, {}).setdefault(
+        if event_match_id:
+            match_id = _canonical_match_id(event_match_id)
+            timeline = player_match_timeline.setdefault(event_player_id, {}).setdefault(
                 match_id,
                 {"entry": None, "exit": None, "has_event": False},
             )
             timeline["has_event"] = True
-            if is_substitution_entry(event.event_type, event.result, event.zone):
+            sub_entry, sub_exit = classify_substitution(event.event_type, event.result, event.zone)
+            if sub_entry:
                 timeline["entry"] = min_or_none(timeline["entry"], event.minute or 0)
-            if is_substitution_exit(event.event_type, event.result, event.zone):
+            if sub_exit:
                 timeline["exit"] = min_or_none(timeline["exit"], event.minute or 0)
     processed_lineup_matches = defaultdict(set)
     for player_id, matches in player_match_timeline.items():
@@ -93872,7 +93862,8 @@ def compute_player_dashboard(
             normalized = normalize_player_name(player.name)
             roster_entry = roster_cache.get(normalized, {})
             manual_entry = manual_overrides.get(player.id, {})
-            universo_entry = _find_universo_entry(player) or {}
+            # Ya resuelto para toda la plantilla antes del bucle de eventos (búsqueda difusa por nombre).
+            universo_entry = universo_entry_by_player_id.get(player.id, {})
             base_pj = (
                 manual_entry.get("pj")
                 if manual_entry.get("pj") is not None
@@ -93960,10 +93951,10 @@ def compute_player_dashboard(
                 "red_cards_locked": red_cards_locked,
                 "totals_locked": totals_locked,
                 "matches": {},
-                "zone_counts": {key: 0 for key in FIELD_ZONE_KEYS},
-                "position_counts": {key: 0 for key in FIELD_ZONE_KEYS},
-                "tercio_counts": {label: 0 for label in STANDARD_TERCIO_LABELS},
-                "tercio_totals": {label: 0 for label in STANDARD_TERCIO_LABELS},
+                "zone_counts": dict.fromkeys(FIELD_ZONE_KEYS, 0),
+                "position_counts": dict.fromkeys(FIELD_ZONE_KEYS, 0),
+                "tercio_counts": dict.fromkeys(STANDARD_TERCIO_LABELS, 0),
+                "tercio_totals": dict.fromkeys(STANDARD_TERCIO_LABELS, 0),
                 "duels_total": 0,
                 "duels_won": 0,
                 "shot_attempts": 0,
@@ -94515,7 +94506,12 @@ def compute_player_dashboard(
                 entry["date"] or "",
             ),
         )
-        roster_entry = find_roster_entry(stats["name"], roster_cache)
+        # La entrada de plantilla ya se resolvió por jugador antes del bucle de eventos.
+        roster_entry = (
+            roster_entry_by_player_id[pid]
+            if pid in roster_entry_by_player_id
+            else find_roster_entry(stats["name"], roster_cache)
+        )
         total_tercios = sum(stats["tercio_totals"].values())
         position_list = sorted(
             stats["position_counts"].items(),
@@ -42,6 +42,14 @@ def _cache_active_team(request, team):
     return _request_cache_set(request, "_cached_active_team", team)
 
 
+def primary_club_team(request=None):
+    """Equipo marcado como principal; se consulta una sola vez por request."""
+    cached = _request_cache_get(request, "_cached_primary_club_team")
+    if cached is not _REQUEST_CACHE_MISSING:
+        return cached
+    return _request_cache_set(request, "_cached_primary_club_team", Team.objects.filter(is_primary=True).first())
+
+
 def get_user_role(user):
     if not user or not user.is_authenticated:
         return None
@@ -611,10 +619,9 @@ def get_active_team_for_request(request):
                         logger.debug('No se pudo guardar fallback active_team_id %s en sesion', getattr(team, 'id', None), exc_info=True)
                     return _cache_active_team(request, team)
         if single_club_fallback_enabled():
-            team = Team.objects.filter(is_primary=True).first()
-            return _cache_active_team(request, team)
+            return _cache_active_team(request, primary_club_team(request))
         return None
-    team = Team.objects.filter(is_primary=True).first() if single_club_fallback_enabled() else None
+    team = primary_club_team(request) if single_club_fallback_enabled() else None
     return _cache_active_team(request, team)
 
 
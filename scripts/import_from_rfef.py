@@ -4,13 +4,24 @@ import os
 import re
 import subprocess
 import sys
+import threading
 import unicodedata
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+# Mismo criterio que football.services: lxml es bastante más rápido que html.parser con las
+# páginas de clasificación/jornada; si no está instalado se sigue con el de la librería estándar.
+try:  # pragma: no cover
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except Exception:  # pragma: no cover
+    HTML_PARSER = "html.parser"
 
 URL = (
     "https://www.rfaf.es/pnfg/NPcd/NFG_VisClasificacion?cod_primaria=1000120&"
@@ -26,6 +37,21 @@ NEXT_MATCH_FILE = BASE_DIR / "data" / "input" / "rfaf-next-match.json"
 FALLBACK_HTML = Path(
     os.getenv("RFAF_FALLBACK_HTML", str(BASE_DIR / "data" / "input" / "rfaf-fallback.html"))
 )
+# Patrones compilados una vez: se aplican por celda/fila/cabecera en cada importación.
+HAS_DIGIT_PATTERN = re.compile(r"\d")
+# Resultado típico: "2-1" (sin texto adicional). Evitamos falsos positivos con fechas tipo "29-03-2026".
+RESULT_PATTERN = re.compile(r"^\s*\d{1,2}\s*-\s*\d{1,2}\s*$")
+TIME_PATTERN = re.compile(r"\b(\d{1,2}:\d{2})\b")
+ROUND_PATTERN = re.compile(r"Jornada\s*(\d+)", re.IGNORECASE)
+HEADING_DATE_PATTERN = re.compile(r"\((\d{2}[/-]\d{2}[/-]\d{4})\)")
+SCHEDULE_HEADING_DATE_PATTERN = re.compile(r"\((\d{2}-\d{2}-\d{4})\)")
+CELL_DATE_PATTERN = re.compile(r"\b(\d{2}[/-]\d{2}[/-]\d{4})\b")
+GOTO_ROUND_PATTERN = re.compile(r"IrA\((\d+)\)")
+COD_JORNADA_PATTERN = re.compile(r"CodJornada=(\d+)")
+POSTPONED_PATTERN = re.compile(r"(suspendid|aplazad|pendient)")
+H3_TAG_PATTERN = re.compile(r"<h3\b", re.IGNORECASE)
+CHARSET_PATTERN = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+
 HEADERS = [
     "position",
     "team",
@@ -40,6 +66,7 @@ HEADERS = [
 ]
 
 USER_AGENT = "webstats-crm/1.0"
+IMPORT_TIMEOUT_SECONDS = 120
 ALLOW_FALLBACK_HTML = str(os.getenv("RFAF_ALLOW_FALLBACK_HTML", "0")).strip().lower() in {
     "1",
     "true",
@@ -89,15 +116,25 @@ def _infer_schedule_template(html: str) -> Optional[str]:
     )
 
 
+class _IntCharsTable(dict):
+    """Tabla para str.translate: conserva dígitos ASCII y signos y borra cualquier otro carácter
+    (lo mismo que re.sub(r"[^0-9+-]", "", ...)). Cada carácter nuevo se memoriza al verlo."""
+
+    def __missing__(self, key):
+        self[key] = None
+        return None
+
+
+INT_CHARS_TABLE = _IntCharsTable((ord(char), ord(char)) for char in "0123456789+-")
+
+
 def _parse_int(value: str) -> int:
     if not value:
         return 0
-    cleaned = re.sub(r"[^0-9+-]", "", value)
-    if not cleaned:
-        return 0
     try:
-        return int(cleaned)
+        return int(value.translate(INT_CHARS_TABLE))
     except ValueError:
+        # Vacío tras limpiar, un signo suelto o signos en medio ("1-2").
         return 0
 
 
@@ -108,26 +145,70 @@ def _team_text(cell) -> str:
     return cell.get_text(" ", strip=True)
 
 
+class _StripMarksTable(dict):
+    """Tabla para str.translate que borra las marcas diacríticas (categoría Mn) que deja NFD.
+    Las del bloque de diacríticos combinables van precargadas; cualquier otro carácter se
+    clasifica la primera vez que aparece y queda memorizado."""
+
+    def __missing__(self, key):
+        value = None if unicodedata.category(chr(key)) == "Mn" else key
+        self[key] = value
+        return value
+
+
+STRIP_MARKS_TABLE = _StripMarksTable(
+    (code, None) for code in range(0x300, 0x370) if unicodedata.category(chr(code)) == "Mn"
+)
+
+
+# Los mismos nombres de equipo se normalizan en cada fila de clasificación y de jornada
+# (y dos veces por fila al buscar "benagalbon"), así que se memoriza el resultado.
+@lru_cache(maxsize=512)
 def normalize_text(value: str) -> str:
     if not value:
         return ""
-    normalized = unicodedata.normalize("NFD", value)
-    normalized = "".join(ch for ch in normalized if unicodedata.category(ch) != "Mn")
-    return normalized.lower().strip()
+    return unicodedata.normalize("NFD", value).translate(STRIP_MARKS_TABLE).lower().strip()
+
+
+_SESSION: Optional[requests.Session] = None
+
+
+def _get_session() -> requests.Session:
+    """Sesión compartida con la federación: clasificación y jornada van al mismo host, así la
+    segunda petición (y los refrescos siguientes del mismo proceso) no repiten el handshake TCP+TLS."""
+    global _SESSION
+    if _SESSION is None:
+        session = requests.Session()
+        session.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "es-ES,es;q=0.9"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+def _decode_body(response: requests.Response) -> str:
+    """La federación sirve UTF-8: decodificamos directamente en vez de pasar por response.text, que
+    sin charset en la cabecera cae en ISO-8859-1 o en la detección de codificación sobre todo el cuerpo.
+    Si la cabecera declara un charset, se respeta."""
+    match = CHARSET_PATTERN.search(response.headers.get("Content-Type") or "")
+    encoding = match.group(1) if match else "utf-8"
+    try:
+        return response.content.decode(encoding, errors="replace")
+    except LookupError:
+        return response.content.decode("utf-8", errors="replace")
 
 
 def fetch_html(*, allow_fallback: bool = False) -> str:
     headers = {
-        "User-Agent": USER_AGENT,
-        "Accept-Language": "es-ES,es;q=0.9",
         "Referer": (
             "https://www.rfaf.es/pnfg/NPcd/NFG_VisGrupos_Vis?cod_primaria=1000123&codgrupo=45030656"
         ),
     }
     try:
-        response = requests.get(URL, headers=headers, timeout=30)
+        response = _get_session().get(URL, headers=headers, timeout=30)
         response.raise_for_status()
-        return response.text
+        return _decode_body(response)
     except requests.RequestException:
         if allow_fallback and FALLBACK_HTML.exists():
             return FALLBACK_HTML.read_text(encoding="utf-8")
@@ -135,8 +216,16 @@ def fetch_html(*, allow_fallback: bool = False) -> str:
 
 
 def parse_table(*, allow_fallback: bool = False) -> (List[dict], str):
+    records, html, _soup = parse_classification(allow_fallback=allow_fallback)
+    return records, html
+
+
+def parse_classification(*, allow_fallback: bool = False) -> (List[dict], str, BeautifulSoup):
+    """Como parse_table, pero devuelve también el árbol ya parseado para pasárselo a
+    extract_next_match_from_classification / fetch_next_match_from_classification (soup=...)
+    y no volver a parsear la misma página."""
     html = fetch_html(allow_fallback=allow_fallback)
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     table = soup.select_one("#CL_Detalle table.table.table-striped")
     if not table:
         table = soup.select_one("#CL_Detalle table")
@@ -154,23 +243,26 @@ def parse_table(*, allow_fallback: bool = False) -> (List[dict], str):
         if len(cells) < 14:
             continue
         position_text = cells[1].get_text(strip=True)
-        if not position_text or not re.search(r"\d", position_text):
+        if not position_text or not HAS_DIGIT_PATTERN.search(position_text):
             continue
         team_name = _team_text(cells[2])
         cleaned_team = normalize_text(team_name)
         if not cleaned_team or cleaned_team in {"pts", "pt"}:
             continue
-        points_text = cells[3].get_text(strip=True)
-        home_j = _parse_int(cells[4].get_text(strip=True))
-        home_w = _parse_int(cells[5].get_text(strip=True))
-        home_d = _parse_int(cells[6].get_text(strip=True))
-        home_l = _parse_int(cells[7].get_text(strip=True))
-        away_j = _parse_int(cells[8].get_text(strip=True))
-        away_w = _parse_int(cells[9].get_text(strip=True))
-        away_d = _parse_int(cells[10].get_text(strip=True))
-        away_l = _parse_int(cells[11].get_text(strip=True))
-        goals_for = _parse_int(cells[12].get_text(strip=True))
-        goals_against = _parse_int(cells[13].get_text(strip=True))
+        # Puntos y las diez columnas numéricas (casa J/G/E/P, fuera J/G/E/P, GF, GC) en una pasada.
+        points_text, *numeric_texts = [cell.get_text(strip=True) for cell in cells[3:14]]
+        (
+            home_j,
+            home_w,
+            home_d,
+            home_l,
+            away_j,
+            away_w,
+            away_d,
+            away_l,
+            goals_for,
+            goals_against,
+        ) = [_parse_int(text) for text in numeric_texts]
         total_matches = home_j + away_j
         total_wins = home_w + away_w
         total_draws = home_d + away_d
@@ -192,21 +284,25 @@ def parse_table(*, allow_fallback: bool = False) -> (List[dict], str):
     if not records:
         Path("/tmp/rfaf_page.html").write_text(html, encoding="utf-8")
         raise SystemExit("No se pudieron extraer filas válidas de la tabla.")
-    return records, html
+    return records, html, soup
 
 
-def extract_next_match_from_classification(html: str) -> Optional[Dict[str, str]]:
-    soup = BeautifulSoup(html, "html.parser")
+def extract_next_match_from_classification(
+    html: str, soup: Optional[BeautifulSoup] = None
+) -> Optional[Dict[str, str]]:
+    # Los partidos solo se leen de las tablas que siguen a un <h3>; muchas páginas de
+    # clasificación no traen ninguno y así ni se recorre el árbol.
+    if not html or not H3_TAG_PATTERN.search(html):
+        return None
+    if soup is None:
+        soup = BeautifulSoup(html, HTML_PARSER)
     blocks = soup.select("h3")
     today = datetime.now().date()
     candidates: List[Dict[str, str]] = []
-    # Resultado típico: "2-1" (sin texto adicional). Evitamos falsos positivos con fechas tipo "29-03-2026".
-    result_pattern = re.compile(r"^\s*\d{1,2}\s*-\s*\d{1,2}\s*$")
-    time_pattern = re.compile(r"\b\d{1,2}:\d{2}\b")
     for heading in blocks:
         text = heading.get_text(strip=True)
-        round_match = re.search(r"Jornada\s*(\d+)", text, re.IGNORECASE)
-        date_match = re.search(r"\((\d{2}[/-]\d{2}[/-]\d{4})\)", text)
+        round_match = ROUND_PATTERN.search(text)
+        date_match = HEADING_DATE_PATTERN.search(text)
         round_number = round_match.group(1) if round_match else None
         date_iso = None
         if date_match:
@@ -222,31 +318,36 @@ def extract_next_match_from_classification(html: str) -> Optional[Dict[str, str]
             cells = row.find_all("td")
             if len(cells) < 3:
                 continue
+            # Primero los equipos: el marcador solo hace falta en la fila del Benagalbón.
             home_name = cells[0].get_text(" ", strip=True)
-            score_text = cells[1].get_text(" ", strip=True)
             away_name = cells[2].get_text(" ", strip=True)
             home_norm = normalize_text(home_name)
             away_norm = normalize_text(away_name)
-            # En RFAF el "marcador" para partidos futuros suele ser la hora (p.e. 18:00),
-            # que contiene dígitos pero NO es un resultado. Detectamos resultados explícitos "1-0".
-            is_future = not bool(result_pattern.match(score_text or ""))
             if "benagalbon" not in home_norm and "benagalbon" not in away_norm:
                 continue
-            is_home = "benagalbon" in home_norm
-            opponent = away_name if is_home else home_name
-            status = "next" if is_future else "latest"
-            payload = {
-                "round": round_number or "",
-                "date": date_iso,
-                "time": (time_pattern.search(score_text).group(0) if time_pattern.search(score_text) else ""),
-                "location": "",
-                "opponent": {"name": opponent.title()},
-                "home": is_home,
-                "status": status,
-                "source": "rfaf",
-            }
-            if status == "next":
-                candidates.append(payload)
+            score_text = cells[1].get_text(" ", strip=True)
+            # En RFAF el "marcador" para partidos futuros suele ser la hora (p.e. 18:00),
+            # que contiene dígitos pero NO es un resultado. Detectamos resultados explícitos "1-0".
+            is_future = not bool(RESULT_PATTERN.match(score_text or ""))
+            # Solo hay un partido del Benagalbón por jornada: con esta fila ya está decidida la
+            # jornada y los resultados ya jugados no son candidatos, así que no se sigue leyendo.
+            if is_future:
+                is_home = "benagalbon" in home_norm
+                opponent = away_name if is_home else home_name
+                time_match = TIME_PATTERN.search(score_text)
+                candidates.append(
+                    {
+                        "round": round_number or "",
+                        "date": date_iso,
+                        "time": time_match.group(0) if time_match else "",
+                        "location": "",
+                        "opponent": {"name": opponent.title()},
+                        "home": is_home,
+                        "status": "next",
+                        "source": "rfaf",
+                    }
+                )
+            break
     if not candidates:
         return None
 
@@ -301,7 +402,9 @@ def _extract_schedule_template(html: str):
     return template, current_round
 
 
-def fetch_next_match_from_classification(html: str, *, max_checks: int = 8) -> Optional[dict]:
+def fetch_next_match_from_classification(
+    html: str, *, max_checks: int = 8, soup: Optional[BeautifulSoup] = None
+) -> Optional[dict]:
     """
     Fallback robusto: si la página de clasificación no trae el cuadro de partidos,
     buscamos el próximo partido iterando jornadas (NFG_CmpJornada) a partir de la actual.
@@ -310,7 +413,7 @@ def fetch_next_match_from_classification(html: str, *, max_checks: int = 8) -> O
     # Incluimos la jornada actual: puede haber partidos "Suspendidos/Aplazados" aún pendientes.
     start_round = current_round if isinstance(current_round, int) else None
     if not start_round:
-        start_round = extract_next_jornada(html) if html else None
+        start_round = extract_next_jornada(html, soup=soup) if html else None
     if not start_round:
         return None
     undated_candidate = None
@@ -335,10 +438,11 @@ def fetch_next_match_from_classification(html: str, *, max_checks: int = 8) -> O
     return undated_candidate
 
 
-def extract_next_jornada(html: str) -> Optional[int]:
+def extract_next_jornada(html: str, soup: Optional[BeautifulSoup] = None) -> Optional[int]:
     # Intentar inferir la próxima jornada desde la tabla (PJ del Benagalbón + 1).
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        if soup is None:
+            soup = BeautifulSoup(html, HTML_PARSER)
         table = (
             soup.select_one("#CL_Detalle table.table.table-striped")
             or soup.select_one("#CL_Detalle table")
@@ -359,10 +463,10 @@ def extract_next_jornada(html: str) -> Optional[int]:
                     return played + 1
     except Exception:
         pass
-    match = re.search(r"IrA\((\d+)\)", html)
+    match = GOTO_ROUND_PATTERN.search(html)
     if match:
         return int(match.group(1))
-    match = re.search(r"CodJornada=(\d+)", html)
+    match = COD_JORNADA_PATTERN.search(html)
     if match:
         return int(match.group(1))
     return None
@@ -374,21 +478,17 @@ def fetch_schedule(jornada: int, template: Optional[str] = None) -> Optional[dic
     url = (template or SCHEDULE_TEMPLATE).format(jornada=jornada)
     if url.startswith("/"):
         url = f"{BASE_ORIGIN}{url}"
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept-Language": "es-ES,es;q=0.9",
-    }
-    response = requests.get(url, headers=headers, timeout=30)
+    response = _get_session().get(url, timeout=30)
     response.raise_for_status()
-    return parse_schedule(response.text, jornada)
+    return parse_schedule(_decode_body(response), jornada)
 
 
 def parse_schedule(html: str, jornada: int) -> Optional[dict]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     heading = soup.find("h3")
     date_iso = None
     if heading:
-        date_match = re.search(r"\((\d{2}-\d{2}-\d{4})\)", heading.text)
+        date_match = SCHEDULE_HEADING_DATE_PATTERN.search(heading.text)
         if date_match:
             try:
                 date_iso = datetime.strptime(date_match.group(1), "%d-%m-%Y").date().isoformat()
@@ -397,10 +497,6 @@ def parse_schedule(html: str, jornada: int) -> Optional[dict]:
     table = soup.select_one("table")
     if not table:
         return None
-    # Resultado típico: "2-1" (sin texto adicional). Evitamos falsos positivos con fechas.
-    result_pattern = re.compile(r"^\s*\d{1,2}\s*-\s*\d{1,2}\s*$")
-    date_in_cell = re.compile(r"\b(\d{2}[/-]\d{2}[/-]\d{4})\b")
-    time_in_cell = re.compile(r"\b(\d{1,2}:\d{2})\b")
     today = datetime.now().date()
     for row in table.select("tr"):
         cells = row.find_all("td")
@@ -428,15 +524,15 @@ def parse_schedule(html: str, jornada: int) -> Optional[dict]:
             continue
         is_home = "benagalbon" in home_norm
         opponent = away_name if is_home else home_name
-        status = "latest" if result_pattern.match(middle_text or "") else "next"
+        status = "latest" if RESULT_PATTERN.match(middle_text or "") else "next"
         time_label = ""
-        time_match = time_in_cell.search(middle_text or "")
+        time_match = TIME_PATTERN.search(middle_text or "")
         if time_match:
             time_label = time_match.group(1)
         # Preferimos la fecha del encabezado; si no existe, intentamos extraerla de la celda central.
         final_date_iso = date_iso
         if not final_date_iso:
-            date_match = date_in_cell.search(middle_text or "")
+            date_match = CELL_DATE_PATTERN.search(middle_text or "")
             if date_match:
                 raw = date_match.group(1).replace("/", "-")
                 try:
@@ -449,7 +545,7 @@ def parse_schedule(html: str, jornada: int) -> Optional[dict]:
                 parsed_date = datetime.strptime(final_date_iso, "%Y-%m-%d").date()
             except ValueError:
                 parsed_date = None
-            if parsed_date and parsed_date < today and re.search(r"(suspendid|aplazad|pendient)", middle_text.lower()):
+            if parsed_date and parsed_date < today and POSTPONED_PATTERN.search(middle_text.lower()):
                 final_date_iso = None
         return {
             "round": f"{jornada}",
@@ -469,9 +565,16 @@ def save_next_match_cache(payload: Optional[Dict[str, str]]):
         if NEXT_MATCH_FILE.exists():
             NEXT_MATCH_FILE.unlink()
         return
+    content = json.dumps(payload)
+    # Entre jornadas el próximo partido no cambia: sin reescribir, el mtime se conserva y
+    # la caché de next_match_services no vuelve a leer el fichero.
+    try:
+        if NEXT_MATCH_FILE.read_text(encoding="utf-8") == content:
+            return
+    except (OSError, UnicodeDecodeError):
+        pass
     NEXT_MATCH_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with NEXT_MATCH_FILE.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle)
+    NEXT_MATCH_FILE.write_text(content, encoding="utf-8")
 
 
 def write_csv(rows: List[dict]):
@@ -483,20 +586,53 @@ def write_csv(rows: List[dict]):
 
 
 def import_csv():
-    subprocess.run(
-        [sys.executable, "manage.py", "import_standings", str(OUTPUT)],
-        cwd=str(BASE_DIR),
-        check=True,
-        timeout=120,
-    )
+    """Importa OUTPUT con import_standings en este mismo proceso y con el límite de siempre.
+
+    Nos ahorramos arrancar otro intérprete y volver a cargar Django; si ya venimos de Django
+    (vista/comando), no se reinicia. El comando corre en un hilo y, si no acaba en
+    IMPORT_TIMEOUT_SECONDS, se lanza TimeoutExpired como hacía subprocess.run: un import
+    atascado no bloquea el scraper. Un hilo no se puede matar; al terminar el script el proceso
+    sale igualmente (hilo daemon) y la transacción a medias se pierde, como al matar el hijo."""
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "webstats.settings")
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    from django.core.management import call_command
+    from django.db import connections
+
+    cmd = [sys.executable, "manage.py", "import_standings", str(OUTPUT)]
+    failure = []
+
+    def run_import():
+        try:
+            call_command("import_standings", str(OUTPUT))
+        except Exception as exc:
+            failure.append(exc)
+        finally:
+            # Cada hilo abre su propia conexión: se cierra aquí para no dejarla colgada.
+            connections.close_all()
+
+    worker = threading.Thread(target=run_import, name="import-standings", daemon=True)
+    worker.start()
+    worker.join(IMPORT_TIMEOUT_SECONDS)
+    if worker.is_alive():
+        raise subprocess.TimeoutExpired(cmd, IMPORT_TIMEOUT_SECONDS)
+    if failure:
+        # Mismo contrato que con "manage.py import_standings" y check=True: quien llama ve un
+        # CalledProcessError, no la excepción interna del comando o de la BD.
+        raise subprocess.CalledProcessError(1, cmd, output=str(failure[0])) from failure[0]
 
 
 def main():
     print("Descargando tabla oficial desde la RFAF…")
-    rows, html = parse_table(allow_fallback=ALLOW_FALLBACK_HTML)
-    next_match = extract_next_match_from_classification(html)
+    rows, html, soup = parse_classification(allow_fallback=ALLOW_FALLBACK_HTML)
+    next_match = extract_next_match_from_classification(html, soup=soup)
     if not next_match:
-        next_match = fetch_next_match_from_classification(html)
+        next_match = fetch_next_match_from_classification(html, soup=soup)
     if next_match and next_match.get("status") != "next":
         next_match = None
     save_next_match_cache(next_match)
@@ -377,6 +377,9 @@ if DATABASE_URL:
         'default': dj_database_url.parse(
             DATABASE_URL,
             conn_max_age=_env_int('DB_CONN_MAX_AGE', 600),
+            # Conexiones persistentes: se comprueban antes de reutilizarlas para no fallar la
+            # primera consulta tras un corte del servidor o del pooler.
+            conn_health_checks=_env_bool('DB_CONN_HEALTH_CHECKS', True),
             ssl_require=_env_bool('DB_SSL_REQUIRE', (not DEBUG)),
         )
     }